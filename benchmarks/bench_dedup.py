@@ -0,0 +1,77 @@
+"""
+Micro-benchmark: near-duplicate lookups in DuplicateIndex (MinHash LSH) against a linear scan.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_dedup [--history 10000 100000] [--lookups 2000]
+"""
+import argparse, random, time
+from dedup import DuplicateIndex, fingerprint, _tokens, DEDUP_SIMILARITY
+
+SENIORITY = ["", "Junior", "Senior", "Lead", "Principal", "Staff"]
+ROLES = ["Backend Developer", ".NET Developer", "Software Engineer", "Data Analyst", "Marketing Specialist",
+         "Accountant", "Sales Executive", "DevOps Engineer", "Frontend Developer", "QA Engineer",
+         "Product Manager", "HR Generalist", "Graphic Designer", "Customer Service Agent"]
+SUFFIXES = ["", "Ltd", "LLC", "Egypt", "Group", "Inc"]
+
+
+def make_jobs(count, seed):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        company = f"Company {rng.randrange(count // 3 + 1)} {rng.choice(SUFFIXES)}".strip()
+        title = f"{rng.choice(SENIORITY)} {rng.choice(ROLES)} {rng.choice(['', '- Cairo', '(Remote)', 'II'])}".strip()
+        jobs.append((f"https://www.linkedin.com/jobs/view/{seed * 10_000_000 + i}/", company, title))
+    return jobs
+
+
+def linear_find(history, company, title, similarity):
+    """What finding a near duplicate costs without an index: compare against every posted job."""
+    tokens = _tokens(fingerprint(company, title))
+    for link, other in history:
+        if tokens and other and len(tokens & other) / len(tokens | other) >= similarity:
+            return link
+    return None
+
+
+def run(history_size, num_lookups):
+    history = make_jobs(history_size, seed=1)
+    # Half the lookups are reposts of posted jobs under a Wuzzuf link, half are unrelated jobs
+    rng = random.Random(2)
+    reposts = [(f"https://wuzzuf.net/jobs/p/{i}", company, title) for i, (_, company, title) in enumerate(rng.sample(history, num_lookups // 2))]
+    lookups = reposts + make_jobs(num_lookups - len(reposts), seed=3)
+
+    start = time.perf_counter()
+    index = DuplicateIndex()
+    for link, company, title in history:
+        index.add(link, company, title)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_hits = sum(1 for job in lookups if index.find(*job))
+    index_time = (time.perf_counter() - start) / len(lookups)
+
+    scanned = [(link, _tokens(fingerprint(company, title))) for link, company, title in history]
+    sample = lookups[:: max(1, len(lookups) // 200)]  # the scan is slow, so time a sample
+    start = time.perf_counter()
+    scan_hits = sum(1 for _, company, title in sample if linear_find(scanned, company, title, DEDUP_SIMILARITY))
+    scan_time = (time.perf_counter() - start) / len(sample)
+    sample_index_hits = sum(1 for job in sample if index.find(*job))
+
+    print(f"{history_size} posted jobs, {len(lookups)} lookups ({len(reposts)} cross-site reposts)")
+    print(f"  index build      : {build_time * 1000:9.1f} ms ({build_time / history_size * 1e6:.1f} µs/job)")
+    print(f"  linear scan      : {scan_time * 1000:9.3f} ms/lookup")
+    print(f"  DuplicateIndex   : {index_time * 1000:9.3f} ms/lookup ({scan_time / index_time:.0f}x)")
+    print(f"  duplicates found : {index_hits}/{len(lookups)} (scan {scan_hits}/{len(sample)} vs index {sample_index_hits}/{len(sample)} on the sample)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--history", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    for history_size in args.history:
+        run(history_size, args.lookups)
+
+
+if __name__ == '__main__':
+    main()
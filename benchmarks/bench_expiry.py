@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: pruning posted-link history with ExpiringLinkSet against the old config.json prune.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_expiry [--links 100000 500000] [--hours 24] [--cycles 10]
+"""
+import argparse, datetime, json, time
+from expiry_index import ExpiringLinkSet
+from state_store import StateStore
+
+CYCLE_SECONDS = 20 * 60  # the bot's loop interval
+
+
+def old_prune(posted, cutoff):
+    """The previous implementation: parse every timestamp, rebuild the dict and re-serialize the config."""
+    cutoff_dt = datetime.datetime.fromtimestamp(cutoff)
+    recent = {}
+    for link, timestamp_str in posted.items():
+        if datetime.datetime.fromisoformat(timestamp_str) > cutoff_dt:
+            recent[link] = timestamp_str
+    json.dumps({"posted": recent}, indent=4)  # what save_config() wrote to disk every cycle
+    return recent
+
+
+def make_history(num_links, hours, now):
+    """`num_links` links posted evenly over the last `hours` hours plus one cycle, oldest first."""
+    span = hours * 3600 + CYCLE_SECONDS
+    return [(f"https://www.linkedin.com/jobs/view/{i}/", now - span + span * i / num_links) for i in range(num_links)]
+
+
+def run(num_links, hours, cycles):
+    now = time.time()
+    history = make_history(num_links, hours, now)
+    cutoffs = [now - hours * 3600 - CYCLE_SECONDS + CYCLE_SECONDS * (c + 1) / cycles for c in range(cycles)]
+
+    posted = {link: datetime.datetime.fromtimestamp(ts).isoformat() for link, ts in history}
+    start = time.perf_counter()
+    for cutoff in cutoffs:
+        posted = old_prune(posted, cutoff)
+    old_time = (time.perf_counter() - start) / cycles
+
+    index = ExpiringLinkSet()
+    for link, ts in history:
+        index.add(link, ts)
+    start = time.perf_counter()
+    index_expired = sum(len(index.expire(cutoff)) for cutoff in cutoffs)
+    index_time = (time.perf_counter() - start) / cycles
+
+    store = StateStore(":memory:")
+    for link, ts in history:
+        store.posted.add(link, ts)
+    store.db.executemany("INSERT INTO posted (link, posted_at) VALUES (?, ?)", history)
+    start = time.perf_counter()
+    store_expired = sum(store.delete_posted_older_than(cutoff) for cutoff in cutoffs)
+    store_time = (time.perf_counter() - start) / cycles
+
+    lookups = [link for link, _ in history[::max(1, num_links // 10000)]]
+    start = time.perf_counter()
+    for link in lookups:
+        link in index
+    lookup_time = (time.perf_counter() - start) / len(lookups)
+
+    print(f"{num_links} links over {hours}h, {cycles} prune cycles of {CYCLE_SECONDS // 60} min "
+          f"(~{index_expired // cycles} links expire per cycle)")
+    print(f"  old config.json prune : {old_time * 1000:9.2f} ms/cycle")
+    print(f"  ExpiringLinkSet       : {index_time * 1000:9.2f} ms/cycle ({old_time / index_time:.0f}x)")
+    print(f"  StateStore (SQLite)   : {store_time * 1000:9.2f} ms/cycle ({old_time / store_time:.0f}x)")
+    print(f"  membership lookup     : {lookup_time * 1e9:9.0f} ns")
+    print(f"  expired counts match  : {index_expired == store_expired == num_links - len(posted)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--links", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--cycles", type=int, default=10)
+    args = parser.parse_args()
+    for num_links in args.links:
+        run(num_links, args.hours, args.cycles)
+
+
+if __name__ == '__main__':
+    main()
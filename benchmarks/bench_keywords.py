@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: the shared KeywordMatcher against the old per-keyword substring scan.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_keywords [--keywords 500] [--cards 5000]
+"""
+import argparse, random, string, time
+from keyword_matcher import KeywordMatcher
+
+
+def old_check_keywords_in_text(text, job_keywords, excluded_keywords):
+    """The previous implementation: lower() every keyword and scan the text once per keyword."""
+    if not text:
+        return False
+    text_lower = text.lower()
+    if any(keyword.lower() in text_lower for keyword in excluded_keywords):
+        return False
+    return any(keyword.lower() in text_lower for keyword in job_keywords)
+
+
+def make_corpus(num_keywords, num_cards, seed=7):
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(5000)]
+    vocabulary += [".net", "c#", "asp.net core", "entity framework", "java", "javascript", "senior", "intern"]
+
+    keywords = set()
+    while len(keywords) < num_keywords:
+        keywords.add(" ".join(rng.sample(vocabulary, rng.randint(1, 2))))
+    keywords = sorted(keywords)
+    excluded = keywords[: num_keywords // 10]
+    included = keywords[num_keywords // 10:]
+
+    # Roughly what a card's title + company + insight text looks like
+    cards = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 30))).title() for _ in range(num_cards)]
+    return included, excluded, cards
+
+
+def timed(function, cards):
+    start = time.perf_counter()
+    results = [function(card) for card in cards]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keywords", type=int, default=500)
+    parser.add_argument("--cards", type=int, default=5000)
+    args = parser.parse_args()
+
+    included, excluded, cards = make_corpus(args.keywords, args.cards)
+
+    build_start = time.perf_counter()
+    matcher = KeywordMatcher(included, excluded)
+    build_time = time.perf_counter() - build_start
+
+    old_time, old_results = timed(lambda card: old_check_keywords_in_text(card, included, excluded), cards)
+    new_time, new_results = timed(matcher.check, cards)
+
+    mismatches = sum(1 for old, new in zip(old_results, new_results) if old != new)
+    print(f"{len(included)} include + {len(excluded)} exclude keywords, {len(cards)} cards")
+    print(f"  old substring scan : {old_time * 1000:8.1f} ms ({old_time / len(cards) * 1e6:.1f} µs/card)")
+    print(f"  KeywordMatcher     : {new_time * 1000:8.1f} ms ({new_time / len(cards) * 1e6:.1f} µs/card), built in {build_time * 1000:.1f} ms")
+    print(f"  speed-up           : {old_time / new_time:.1f}x")
+    print(f"  decisions matched  : {len(cards) - mismatches}/{len(cards)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,448 @@
+"""
+Offline benchmark: the LinkedIn and Wuzzuf scrapers and the bot's posting path against recorded pages.
+
+Search result pages recorded in benchmarks/fixtures are served from a local HTTP server, and
+scrape_url / scrape_wuzzuf run against it exactly as they would against the live sites. The
+LinkedIn pages keep LinkedIn's lazy loading: only a few cards are painted at load, the rest are
+occluded placeholders filled in as they scroll into view, and the last cards of a page arrive
+after the list is scrolled down. The roles found then go through the bot's processing path
+(NewJobFilter, job_embed, PostingQueue) with a channel that discards the messages.
+
+Modes:
+    parse    parse the recorded pages directly, no server (selectors and card processing only);
+             LinkedIn's scrolled card list is simulated in Python (rendered_linkedin_snapshot),
+             not taken by the scraper's snapshot script
+    http     LINKEDIN_FETCH_MODE=http and WUZZUF_FETCH_MODE=http against the local server
+    browser  both scrapers in headless Chrome against the local server (needs Chrome)
+    lean     the same with BROWSER_LEAN_MODE=True; run together with `browser` to get the
+             seconds and KB saved per page
+    prefetch `browser` with LINKEDIN_PREFETCH_PAGES=9; with --latency-ms and --linkedin-pages 10,
+             compare its LinkedIn crawl time with `browser`
+
+Each mode runs in its own process so its peak RSS (including Chrome's processes) is its own.
+Results are compared with benchmarks/scrapers_baseline.json: a different number of cards or
+pages means the selectors or paging broke, and s/page or peak RSS more than --tolerance above
+the baseline is reported as a slowdown. The exit status is 1 if anything regressed. The committed
+baseline covers `parse` and `http` only; `browser`, `lean` and `prefetch` need Chrome and are
+reported without a check until a baseline is saved for them.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_scrapers [--mode parse http] [--runs 3] [--save-baseline]
+    python -m benchmarks.bench_scrapers --mode browser prefetch --latency-ms 500 --linkedin-pages 10
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import argparse, asyncio, contextlib, io, json, os, shutil, subprocess, sys, tempfile, threading, time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrapers_baseline.json")
+RESULT_MARKER = "BENCH_RESULT "
+# Slowdowns smaller than this per page are timer noise, whatever the percentage
+MIN_SLOWDOWN_S_PER_PAGE = 0.01
+
+MODES = ["parse", "http", "browser", "lean", "prefetch"]
+LINKEDIN_PAGE_STARTS = [0, 25, 50]  # `start` of each recorded LinkedIn page
+WUZZUF_PAGES = 3
+# Fixed keywords, so a changed .env doesn't change what the benchmark measures
+BENCH_JOB_KEYWORDS = ".net\nc#\nasp.net\nbackend"
+BENCH_EXCLUDED_KEYWORDS = "junior"
+# A 1x1 PNG for every company logo
+LOGO_PNG = bytes.fromhex("89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+                         "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082")
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the recorded pages under the paths the scrapers request from the real sites."""
+    latency = 0.0
+    linkedin_pages = len(LINKEDIN_PAGE_STARTS)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        start = int(parse_qs(parsed.query).get("start", ["0"])[0])
+        if parsed.path.startswith("/media/"):
+            return self.reply(LOGO_PNG, "image/png")
+        if parsed.path.startswith("/jobs/search"):
+            # Browser LinkedIn search; the scraper pages with start=(page-1)*25
+            # Longer crawls repeat the two full pages before the last, shorter one
+            page = start // 25 + 1
+            if page > self.linkedin_pages:
+                return self.reply_fixture(None)
+            return self.reply_fixture("linkedin_search_3.html" if page == self.linkedin_pages else f"linkedin_search_{2 - page % 2}.html")
+        if parsed.path.startswith("/jobs-guest/"):
+            # Driverless LinkedIn search; start is the number of cards served so far
+            page = LINKEDIN_PAGE_STARTS.index(start) + 1 if start in LINKEDIN_PAGE_STARTS else None
+            return self.reply_fixture(f"linkedin_guest_{page}.html" if page else None)
+        if parsed.path.startswith("/search/jobs"):
+            # Wuzzuf search; start is the zero-based page index
+            return self.reply_fixture(f"wuzzuf_search_{start + 1}.html" if start < WUZZUF_PAGES else None)
+        self.send_error(404)
+
+    def reply_fixture(self, name):
+        # Past the last recorded page the sites answer with a page without results
+        self.reply(read_fixture(name).encode() if name else b"", "text/html; charset=utf-8")
+
+    def reply(self, body, content_type):
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture_server(latency=0.0, linkedin_pages=len(LINKEDIN_PAGE_STARTS)):
+    FixtureHandler.latency = latency
+    FixtureHandler.linkedin_pages = linkedin_pages
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class PeakRSS:
+    """Samples the RSS of this process and its children (Chrome, chromedriver) and keeps the peak."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        try:
+            import psutil
+            self._process = psutil.Process()
+        except ImportError:
+            self._process = None  # fall back to the kernel's own high-water mark
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            try:
+                processes = [self._process] + self._process.children(recursive=True)
+                self.peak = max(self.peak, sum(p.memory_info().rss for p in processes if p.is_running()))
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if self._process:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._process:
+            self._thread.join()
+        else:
+            import resource  # POSIX only; ru_maxrss is in KB on Linux
+            self.peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss +
+                         resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * 1024
+
+    @property
+    def peak_mb(self):
+        return round(self.peak / 2**20, 1)
+
+
+def rendered_linkedin_snapshot(html):
+    """
+    The card list as scraper.snapshot_job_cards sees it after scrolling: every card, occluded
+    and lazy-loaded ones included, with its content filled in.
+    """
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(html)
+    occluded = json.loads(tree.css_first("#occluded-cards").text())
+    lazy = json.loads(tree.css_first("#lazy-cards").text())
+    cards = []
+    for card in tree.css("li.occludable-update"):
+        job_id = card.attributes["data-occludable-job-id"]
+        cards.append(card.html if job_id not in occluded else f'<li class="occludable-update">{occluded[job_id]}</li>')
+    cards += [f'<li class="occludable-update">{occluded[job_id]}</li>' for job_id in lazy]
+    return "<ul>" + "".join(cards) + "</ul>"
+
+
+class NullChannel:
+    """Stands in for the #new-postings channel; every message is accepted and dropped."""
+    name = "benchmark"
+
+    async def send(self, content=None, embed=None, embeds=None):
+        return None
+
+
+def run_posting(roles, runs_dir):
+    """The bot's processing path for one cycle's roles, on a fresh state store. Returns roles posted."""
+    from state_store import StateStore
+    from posting_queue import PostingQueue, NewJobFilter, job_embed
+    store = StateStore(os.path.join(tempfile.mkdtemp(dir=runs_dir), "state.db"))
+    queue = PostingQueue(store)
+    new_jobs = NewJobFilter(store)
+    for role in roles:
+        if new_jobs.skip_reason(role) is None:
+            queue.enqueue(role, job_embed(role))
+    return len(asyncio.run(queue.flush(NullChannel())))
+
+
+def scenario_result(seconds, cards, pages, roles, page_bytes=None):
+    result = {"cards": cards, "pages": pages, "roles": roles, "seconds": round(seconds, 4),
+              "cards_per_s": round(cards / seconds, 1) if seconds else None,
+              "s_per_page": round(seconds / pages, 4) if pages else None}
+    if page_bytes is not None:
+        result["kb_per_page"] = round(page_bytes / 1024 / pages, 1) if pages else None
+    return result
+
+
+def run_parse_mode(runs):
+    """Selectors and card processing on the recorded pages, without a server or browser."""
+    import scraper, wuzzuf_scraper, html_parsers
+    from early_stop import EarlyStop
+    linkedin_pages = [rendered_linkedin_snapshot(read_fixture(f"linkedin_search_{p}.html")) for p in range(1, 4)]
+    guest_pages = [read_fixture(f"linkedin_guest_{p}.html") for p in range(1, 4)]
+    wuzzuf_pages = [read_fixture(f"wuzzuf_search_{p}.html") for p in range(1, WUZZUF_PAGES + 1)]
+
+    def linkedin(pages, parse):
+        roles, cards = [], 0
+        early_stop = EarlyStop([])
+        for page_number, html in enumerate(pages, 1):
+            page_cards = parse(html)
+            cards += len(page_cards)
+            roles += scraper.process_job_cards(page_cards, False, False, early_stop, page_number)[0]
+        return roles, cards
+
+    def wuzzuf():
+        roles, cards, seen = [], 0, set()
+        early_stop = EarlyStop([])
+        for page_number, html in enumerate(wuzzuf_pages, 1):
+            page_roles = html_parsers.parse_wuzzuf_html(html)
+            cards += len(page_roles)
+            page_roles, _ = wuzzuf_scraper.take_new_roles(page_roles, early_stop, page_number, seen, False)
+            roles += wuzzuf_scraper.filter_roles(page_roles, True, False)
+        return roles, cards
+
+    scenarios = {
+        "linkedin_browser_cards": (lambda: linkedin(linkedin_pages, html_parsers.parse_linkedin_cards), len(linkedin_pages)),
+        "linkedin_guest_cards": (lambda: linkedin(guest_pages, html_parsers.parse_linkedin_guest_cards), len(guest_pages)),
+        "wuzzuf_cards": (wuzzuf, len(wuzzuf_pages)),
+    }
+    results = {}
+    for name, (function, pages) in scenarios.items():
+        start = time.perf_counter()
+        for _ in range(runs):
+            roles, cards = function()
+        results[name] = scenario_result((time.perf_counter() - start) / runs, cards, pages, len(roles))
+    return results
+
+
+def run_scrape_mode(mode, base_url, runs):
+    """scrape_url and scrape_wuzzuf against the fixture server, then the posting path on their roles."""
+    import scraper, wuzzuf_scraper
+    from driver_pool import DriverPool
+    from metrics import METRICS
+
+    pool = None
+    browser = mode in ("browser", "lean", "prefetch")
+    if browser:
+        pool = DriverPool({"linkedin": scraper.init_driver, "wuzzuf": wuzzuf_scraper.init_wuzzuf_driver})
+    searches = {
+        "linkedin": (scraper.scrape_url, f"{base_url}/jobs/search/?keywords=.net&location=Egypt&f_TPR=r86400", False),
+        "wuzzuf": (wuzzuf_scraper.scrape_wuzzuf, f"{base_url}/search/jobs/?q=.net&a=navbl", True),
+    }
+    results, totals = {}, {name: [0.0, 0, 0, 0, 0] for name in searches}
+    all_roles = []
+    runs_dir = tempfile.mkdtemp(prefix="bench-runs-")
+    try:
+        for run in range(runs):
+            all_roles = []
+            for name, (scrape, url, check_keywords) in searches.items():
+                pages_before = METRICS.counter_total("pages_scraped_total")
+                cards_before = METRICS.counter_total("cards_parsed_total")
+                bytes_before = METRICS.counter_total("page_bytes_total")
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    roles, _ = scrape(url, check_keywords=check_keywords, pool=pool)
+                total = totals[name]
+                total[0] += time.perf_counter() - start
+                total[1] += METRICS.counter_total("cards_parsed_total") - cards_before
+                total[2] += METRICS.counter_total("pages_scraped_total") - pages_before
+                total[3] += len(roles)
+                total[4] += METRICS.counter_total("page_bytes_total") - bytes_before
+                all_roles += roles
+
+        for name, (seconds, cards, pages, roles, page_bytes) in totals.items():
+            results[f"{name}_scrape"] = scenario_result(seconds / runs, cards // runs, pages // runs, roles // runs,
+                                                        page_bytes // runs if browser else None)
+        if browser:
+            results["driver_start"] = {"seconds": round(METRICS.totals("driver_start_seconds").get("", (0, 0))[1], 2)}
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            posted = run_posting(all_roles, runs_dir)
+        seconds = (time.perf_counter() - start) / runs
+        results["posting_path"] = {"roles": len(all_roles), "posted": posted, "seconds": round(seconds, 4),
+                                   "roles_per_s": round(len(all_roles) / seconds, 1) if seconds else None}
+    finally:
+        if pool:
+            pool.shutdown()
+        shutil.rmtree(runs_dir, ignore_errors=True)
+    return results
+
+
+def child_main(mode, runs):
+    with PeakRSS() as rss:
+        if mode == "parse":
+            results = run_parse_mode(runs)
+        else:
+            results = run_scrape_mode(mode, os.environ["BENCH_FIXTURE_URL"], runs)
+    results["peak_rss_mb"] = rss.peak_mb
+    print(RESULT_MARKER + json.dumps(results))
+
+
+def run_child(mode, runs, base_url, verbose):
+    """Run one mode in a fresh interpreter configured to scrape the fixture server."""
+    state_dir = tempfile.mkdtemp(prefix=f"bench-{mode}-")
+    cookies_file = os.path.join(state_dir, "linkedin_cookies.json")
+    with open(cookies_file, "w") as f:
+        json.dump([{"name": "li_at", "value": "benchmark"}], f)
+    env = dict(os.environ,
+               STATE_DB_PATH=os.path.join(state_dir, "state.db"),
+               METRICS_PORT="0",
+               DOMAIN_REQUESTS_PER_MINUTE="1000000", DOMAIN_BURST="1000",
+               LINKEDIN_FETCH_MODE="http" if mode == "http" else "browser",
+               WUZZUF_FETCH_MODE="http" if mode == "http" else "browser",
+               BROWSER_LEAN_MODE=str(mode == "lean"),
+               LINKEDIN_PREFETCH_PAGES="9" if mode == "prefetch" else "0",
+               LINKEDIN_HTTP_BASE_URL=base_url or "",
+               LINKEDIN_COOKIES_FILE=cookies_file,
+               SELENIUM_USER_DATA_DIR=os.path.join(state_dir, "chrome-profile"),
+               WUZZUF_MAX_PAGES=str(WUZZUF_PAGES),
+               JOB_KEYWORDS=BENCH_JOB_KEYWORDS, EXCLUDED_KEYWORDS=BENCH_EXCLUDED_KEYWORDS,
+               BENCH_FIXTURE_URL=base_url or "")
+    try:
+        completed = subprocess.run([sys.executable, "-m", "benchmarks.bench_scrapers", "--child", mode, "--runs", str(runs)],
+                                   env=env, capture_output=True, text=True)
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+    if verbose or completed.returncode:
+        sys.stdout.write(completed.stdout)
+        sys.stderr.write(completed.stderr)
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    return None
+
+
+def compare(mode, results, baseline, tolerance):
+    """Lines describing how `results` differ from the baseline; the second value is True on a regression."""
+    lines, regressed = [], False
+    for name, result in results.items():
+        if not isinstance(result, dict):
+            continue
+        expected = baseline.get(name)
+        if not expected:
+            lines.append(f"  {name}: no baseline")
+            continue
+        for count in ("cards", "pages", "roles", "posted"):
+            if count in result and result[count] != expected.get(count):
+                lines.append(f"  ✗ {name}: {count} {result[count]} (baseline {expected.get(count)}) - selectors or paging changed?")
+                regressed = True
+        if (result.get("s_per_page") and expected.get("s_per_page")
+                and result["s_per_page"] > expected["s_per_page"] * (1 + tolerance)
+                and result["s_per_page"] - expected["s_per_page"] > MIN_SLOWDOWN_S_PER_PAGE):
+            lines.append(f"  ✗ {name}: {result['s_per_page']:.4f} s/page (baseline {expected['s_per_page']:.4f})")
+            regressed = True
+    if baseline.get("peak_rss_mb") and results.get("peak_rss_mb", 0) > baseline["peak_rss_mb"] * (1 + tolerance):
+        lines.append(f"  ✗ peak RSS {results['peak_rss_mb']} MB (baseline {baseline['peak_rss_mb']} MB)")
+        regressed = True
+    return lines, regressed
+
+
+def lean_savings(browser, lean):
+    """Per-page difference of lean mode against the full browser, one line per scraper."""
+    lines = ["\nlean against browser, per page:"]
+    for name, full in browser.items():
+        trimmed = lean.get(name)
+        if not isinstance(full, dict) or not isinstance(trimmed, dict) or not full.get("s_per_page"):
+            continue
+        line = f"  {name:24}: {full['s_per_page'] - trimmed['s_per_page']:+.4f} s saved"
+        if full.get("kb_per_page") and trimmed.get("kb_per_page") is not None:
+            saved = full["kb_per_page"] - trimmed["kb_per_page"]
+            line += f", {saved:+.1f} KB saved ({saved / full['kb_per_page']:.0%})"
+        lines.append(line)
+    return lines
+
+
+def print_results(mode, results):
+    print(f"\n{mode} (peak RSS {results['peak_rss_mb']} MB)")
+    for name, result in results.items():
+        if not isinstance(result, dict):
+            continue
+        if "cards" in result:
+            weight = f", {result['kb_per_page']} KB/page" if result.get("kb_per_page") is not None else ""
+            print(f"  {name:24}: {result['cards']:4} cards, {result['pages']} pages, {result['roles']:3} roles kept | "
+                  f"{result['cards_per_s'] or 0:10.1f} cards/s, {result['s_per_page'] or 0:8.4f} s/page{weight}")
+        elif "posted" in result:
+            print(f"  {name:24}: {result['roles']:4} roles, {result['posted']} posted | "
+                  f"{result['roles_per_s'] or 0:10.1f} roles/s, {result['seconds']:8.4f} s/cycle")
+        else:
+            print(f"  {name:24}: {result['seconds']:.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", nargs="+", choices=MODES, default=["parse", "http"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every fixture response")
+    parser.add_argument("--linkedin-pages", type=int, default=len(LINKEDIN_PAGE_STARTS),
+                        help="results pages of the browser LinkedIn search (the baseline is for 3)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown against the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="record these results as the new baseline")
+    parser.add_argument("--verbose", action="store_true", help="show the scrapers' own output")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child_main(args.child, args.runs)
+
+    server = start_fixture_server(args.latency_ms / 1000, args.linkedin_pages)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        baselines = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH) as f:
+                baselines = json.load(f)
+
+        any_regressed = False
+        by_mode = {}
+        for mode in args.mode:
+            results = by_mode[mode] = run_child(mode, args.runs, base_url, args.verbose)
+            if results is None:
+                print(f"\n✗ {mode} mode failed (run with --verbose for details)")
+                any_regressed = True
+                continue
+            print_results(mode, results)
+            if mode in baselines and not args.save_baseline:
+                lines, regressed = compare(mode, results, baselines[mode], args.tolerance)
+                print("\n".join(lines) if lines else "  ✓ within the baseline")
+                any_regressed |= regressed
+            elif not args.save_baseline:
+                print(f"  ℹ️  No baseline for {mode} mode, not checked (record one with --save-baseline)")
+            if args.save_baseline:
+                baselines[mode] = results
+        if by_mode.get("browser") and by_mode.get("lean"):
+            print("\n".join(lean_savings(by_mode["browser"], by_mode["lean"])))
+    finally:
+        server.shutdown()
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"\n✓ Baseline saved to {BASELINE_PATH}")
+    return 1 if any_regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
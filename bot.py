@@ -1,12 +1,21 @@
 import discord, asyncio
 import scraper
 import wuzzuf_scraper
-import os, sys, json
-import urllib.parse
+import driver_pool
+import page_archive
+from state_store import get_store
+from posting_queue import PostingQueue, NewJobFilter, job_embed, DISCORD_MAX_RATELIMIT_WAIT
+from scheduler import PollScheduler, count_new_ids, POLL_MIN_INTERVAL_MINUTES
+from metrics import METRICS, start_metrics_server, mark_startup
+from job_details import JOB_DESCRIPTION_TTL_HOURS
+import os, time, threading
 import datetime
 from dotenv import load_dotenv
 import logging
 
+# Selenium is only imported once a browser is needed, so this should come quickly
+mark_startup("imports")
+
 # Configure logging to reduce Discord.py verbosity
 logging.basicConfig(
     level=logging.WARNING,
@@ -25,8 +34,6 @@ BOT_TOKEN = os.getenv('BOT_TOKEN')
 NEW_POSTINGS_CHANNEL_ID = int(os.getenv('NEW_POSTINGS_CHANNEL_ID'))
 DEBUG_CHANNEL_ID = int(os.getenv('DEBUG_CHANNEL_ID'))
 COMPANIES_CHANNEL_ID = int(os.getenv('COMPANIES_CHANNEL_ID'))
-WUZZUF_URLS_UNFILTERED = os.getenv('WUZZUF_URLS_UNFILTERED', '')
-WUZZUF_URLS_FILTERED = os.getenv('WUZZUF_URLS_FILTERED', '')
 POSTED_JOBS_EXPIRATION_PERIOD_HOURS = int(os.getenv('POSTED_JOBS_EXPIRATION_PERIOD_HOURS', 24))
 SHOW_DETAILED_LOGS = os.getenv('SHOW_DETAILED_LOGS', 'False').lower() == 'true'
 
@@ -39,17 +46,28 @@ COMPANIES_CHANNEL = None
 # Flag to prevent multiple task instances
 TASK_STARTED = False
 
+# Browsers are shared by every scraping cycle for the lifetime of the bot
+DRIVER_POOL = driver_pool.create_default_pool()
+
+# Jobs that haven't been posted yet; failed sends stay here for the next cycle
+POSTING_QUEUE = PostingQueue()
+
+# Prometheus endpoint with per-phase timings; !stats posts a summary of the same numbers
+start_metrics_server()
+
 intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
 
-bot = discord.Client(intents=intents)
+# discord.py waits out rate limits up to DISCORD_MAX_RATELIMIT_WAIT and raises RateLimited beyond that
+bot = discord.Client(intents=intents, max_ratelimit_timeout=DISCORD_MAX_RATELIMIT_WAIT)
 
 @bot.event
 async def on_ready():
     global NEW_POSTINGS_CHANNEL, DEBUG_CHANNEL, COMPANIES_CHANNEL, TASK_STARTED
     
     print(f'✓ Bot logged in as {bot.user.name}')
+    mark_startup("on_ready")
     print('-' * 60)
 
     NEW_POSTINGS_CHANNEL = bot.get_channel(NEW_POSTINGS_CHANNEL_ID)
@@ -63,7 +81,7 @@ async def on_ready():
 
 @bot.event
 async def on_disconnect():
-    print("⚠️  Discord connection lost (normal during long scraping)")
+    print("⚠️  Discord connection lost, reconnecting...")
 
 @bot.event
 async def on_resumed():
@@ -72,41 +90,23 @@ async def on_resumed():
 @bot.event
 async def on_message(message):
     async def add_to_blacklist(companies):
-        config = get_config()
-        blacklist = set(config["blacklist"])
-
-        for company in companies:
-            blacklist.add(company)
+        added = get_store().add_to_blacklist(companies)
 
-        confirmation_string = ""
-        for company in blacklist.difference(set(config["blacklist"])):
-            confirmation_string += company + ", "
-        if not confirmation_string:
+        if not added:
             confirmation_string = "No companies were added to the blacklist."
         else:
-            confirmation_string = "Added " + confirmation_string[:-2] + " to the blacklist!"
+            confirmation_string = "Added " + ", ".join(added) + " to the blacklist!"
 
-        config["blacklist"] = list(blacklist)
-        save_config(config)
         await COMPANIES_CHANNEL.send(confirmation_string)
 
     async def remove_from_blacklist(companies):
-        config = get_config()
-        blacklist = set(config["blacklist"])
+        removed = get_store().remove_from_blacklist(companies)
 
-        for company in companies:
-            blacklist.discard(company)
-
-        confirmation_string = ""
-        for company in set(config["blacklist"]).difference(blacklist):
-            confirmation_string += company + ", "
-        if len(confirmation_string) == 0:
+        if not removed:
             confirmation_string = "No companies were removed from the blacklist."
         else:
-            confirmation_string = "Removed " + confirmation_string[:-2] + " from the blacklist!"
+            confirmation_string = "Removed " + ", ".join(removed) + " from the blacklist!"
 
-        config["blacklist"] = list(blacklist)
-        save_config(config)
         await COMPANIES_CHANNEL.send(confirmation_string)
 
     if message.author.bot:
@@ -118,96 +118,65 @@ async def on_message(message):
     elif message.content.splitlines()[0] == "!unblacklist":
         await remove_from_blacklist(message.content.splitlines()[1:])
 
-async def safe_send(channel, content=None, embed=None, max_retries=3):
-    """Send message with retry logic to handle disconnections"""
-    for attempt in range(max_retries):
-        try:
+    elif message.content.splitlines()[0] == "!stats":
+        # Discord messages are capped at 2000 characters
+        await safe_send(message.channel, METRICS.summary()[:2000])
+
+async def safe_send(channel, content=None, embed=None):
+    """
+    Send a message, or log why it couldn't be sent. discord.py already waits out rate limits
+    (up to DISCORD_MAX_RATELIMIT_WAIT) and retries server errors and dropped connections, so a
+    failure here is final.
+    """
+    try:
+        with METRICS.timed("discord_send_seconds", channel=getattr(channel, "name", "")):
             if embed:
                 return await channel.send(embed=embed)
             else:
                 return await channel.send(content)
-        except (discord.HTTPException, discord.ConnectionClosed) as e:
-            if attempt < max_retries - 1:
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                continue
-            else:
-                print(f"⚠️  Failed to send message after {max_retries} attempts")
-                return None
+    except discord.RateLimited as e:
+        METRICS.inc("discord_send_failures_total", reason="rate_limited")
+        print(f"⚠️  Skipping message, Discord rate limit of {e.retry_after:.0f}s")
+    except (discord.HTTPException, discord.ConnectionClosed) as e:
+        METRICS.inc("discord_send_failures_total", reason="send_error")
+        print(f"⚠️  Failed to send message: {e}")
+    return None
                 
 def prune_old_jobs():
-    """Checks the config file and removes job links and stop markers older than POSTED_JOBS_EXPIRATION_PERIOD_HOURS."""
-    config = get_config()
-    posted_jobs = config.get("posted", {})
-    last_job_per_source = config.get("last_job_per_source", {})
-
-    # --- Backward Compatibility: Convert old list format to new dict format ---
-    if isinstance(posted_jobs, list):
-        print("  - Updating config format for posted jobs...")
-        new_posted = {link: datetime.datetime.now().isoformat() for link in posted_jobs}
-        config["posted"] = new_posted
-        config["last_job_per_source"] = {}  # Initialize empty
-        save_config(config)
-        # No pruning on first conversion, just update the format
-        return
-    # --- End Compatibility ---
+    """Removes job links and stop markers older than POSTED_JOBS_EXPIRATION_PERIOD_HOURS, and expired job descriptions, from the state store."""
+    store = get_store()
+    cutoff = (datetime.datetime.now() - datetime.timedelta(hours=POSTED_JOBS_EXPIRATION_PERIOD_HOURS)).timestamp()
 
-    now = datetime.datetime.now()
-    expiration_time = datetime.timedelta(hours=POSTED_JOBS_EXPIRATION_PERIOD_HOURS)
-    
-    # Prune posted jobs
-    updated_posted_jobs = {}
-    expired_posted_count = 0
-    for link, timestamp_str in posted_jobs.items():
-        try:
-            post_time = datetime.datetime.fromisoformat(timestamp_str)
-            if now - post_time < expiration_time:
-                updated_posted_jobs[link] = timestamp_str
-            else:
-                expired_posted_count += 1
-        except (ValueError, TypeError):
-            # If timestamp is invalid, just drop it
-            expired_posted_count += 1
-
-    # Prune last_job_per_source entries
-    updated_last_job_per_source = {}
-    expired_marker_count = 0
-    for source_url, marker_data in last_job_per_source.items():
-        try:
-            marker_time = datetime.datetime.fromisoformat(marker_data["timestamp"])
-            if now - marker_time < expiration_time:
-                updated_last_job_per_source[source_url] = marker_data
-            else:
-                expired_marker_count += 1
-        except (ValueError, TypeError, KeyError):
-            # If invalid, drop it
-            expired_marker_count += 1
+    expired_posted_count = store.delete_posted_older_than(cutoff)
+    expired_marker_count = store.delete_stop_markers_older_than(cutoff)
+    store.delete_descriptions_older_than(time.time() - JOB_DESCRIPTION_TTL_HOURS * 3600)
 
     if expired_posted_count > 0 or expired_marker_count > 0:
         print(f"  - Pruned {expired_posted_count} old job link(s) and {expired_marker_count} stop marker(s) from history (older than {POSTED_JOBS_EXPIRATION_PERIOD_HOURS} hours).")
-        config["posted"] = updated_posted_jobs
-        config["last_job_per_source"] = updated_last_job_per_source
-        save_config(config)
 
 
 async def get_new_roles_postings_task():
-    async def send_new_roles():
+    linkedin_sources = {url: f"LinkedIn {label}" for url, _, label in scraper.configured_searches()}
+    wuzzuf_sources = {url: f"Wuzzuf {label}" for url, _, label in wuzzuf_scraper.configured_searches()}
+    source_labels = {**linkedin_sources, **wuzzuf_sources}
+    schedule = PollScheduler(get_store(), list(source_labels))
+    # Hash the posted titles while the first crawl runs, so the first dedup check doesn't wait on it
+    threading.Thread(target=get_store().build_duplicate_index, name="dedup-index", daemon=True).start()
+
+    async def send_new_roles(sources):
+        """Scrape and post the given search URLs. Returns {source_url: number of new job IDs, or None on a first crawl}; searches without any cards are left out"""
         async def send_companies_list(companies):
             companies_list_string = "Found jobs from these new companies:\n"
             for company in companies:
                 companies_list_string += company + "\n"
             await safe_send(COMPANIES_CHANNEL, companies_list_string)
 
-        def get_google_url(company):
-            base = "https://www.google.com/search?q="
-            return base + urllib.parse.quote_plus(company)
-
         # Prune old jobs before starting the scrape cycle
         prune_old_jobs()
+        # Pages scraped from here on are archived under this cycle (when PAGE_ARCHIVE_DIR is set)
+        page_archive.start_cycle()
 
-        config = get_config()
-        # 'posted' is now a dictionary, so we check against its keys
-        posted_links = set(config.get("posted", {}).keys()) 
-        blacklist = set(config["blacklist"])
+        store = get_store()
 
         scrape_start_time = datetime.datetime.now()
         print(f"\n{'='*60}")
@@ -215,163 +184,147 @@ async def get_new_roles_postings_task():
         print(f"{'='*60}")
         await safe_send(DEBUG_CHANNEL, f"🔍 **Starting job search cycle** at {scrape_start_time.strftime('%H:%M:%S')}")
         
-        # Scrape LinkedIn with stop markers
-        print("Scraping LinkedIn...")
-        await safe_send(DEBUG_CHANNEL, "⏳ Scraping LinkedIn...")
-        linkedin_roles, linkedin_stop_markers = scraper.get_recent_roles(show_details=SHOW_DETAILED_LOGS)
-
-        # Update stop markers for LinkedIn URLs (done AFTER posting to avoid race conditions)
-        # We'll update these at the end after saving all posted jobs
-
-        # Scrape Wuzzuf if configured (no stop markers)
-        wuzzuf_roles = []
-        if WUZZUF_URLS_UNFILTERED or WUZZUF_URLS_FILTERED:
-            print("Scraping Wuzzuf...")
-            await safe_send(DEBUG_CHANNEL, "⏳ Scraping Wuzzuf...")
-            wuzzuf_roles = wuzzuf_scraper.get_wuzzuf_roles(show_details=SHOW_DETAILED_LOGS)
-        
-        # Combine and process
-        all_roles = linkedin_roles + wuzzuf_roles
-        
-        unique_roles_to_post = []
-        seen_links = set()
-        
-        if SHOW_DETAILED_LOGS and all_roles:
-            print(f"--- Processing {len(all_roles)} total roles found ---")
-        
-        for role in all_roles:
-            company, title, link, _, _ = role 
-            
-            if link in seen_links:
-                if SHOW_DETAILED_LOGS: print(f"  - Skipping (duplicate link in this run): {title} at {company}")
-                continue
-            seen_links.add(link)
-
-            if link in posted_links:
-                if SHOW_DETAILED_LOGS: print(f"  - Skipping (already posted): {title} at {company}")
-                continue
-
-            if company in blacklist:
-                if SHOW_DETAILED_LOGS: print(f"  - Skipping (blacklisted company): {title} at {company}")
-                continue
-
-            if SHOW_DETAILED_LOGS: print(f"  - ✓ Adding to post queue: {title} at {company}")
-            unique_roles_to_post.append(role)
-        
-        if unique_roles_to_post:
-             print(f"--- Found {len(unique_roles_to_post)} new, unique, non-blacklisted jobs to post ---")
-
-        companies_for_this_run = set()
-        
-        for role in unique_roles_to_post:
-            company, title, link, picture, posted_time = role
-            
-            companies_for_this_run.add(company)
-            # Add new job to config with current timestamp
-            config["posted"][link] = datetime.datetime.now().isoformat()
+        # Roles flow through three concurrent stages: the scraper threads push each parsed
+        # page onto found_roles, the filter stage dedups them and queues new ones for
+        # posting, and the post stage sends whatever is queued while scraping goes on
+        loop = asyncio.get_running_loop()
+        found_roles = asyncio.Queue()
+        jobs_ready = asyncio.Event()
+        filtering_done = asyncio.Event()
+        if len(POSTING_QUEUE):
+            jobs_ready.set()  # Jobs left over from earlier cycles go out first
+
+        def on_roles(roles):
+            # Runs in a scraper thread right after a page is parsed
+            if roles:
+                loop.call_soon_threadsafe(found_roles.put_nowait, (time.monotonic(), roles))
+
+        async def scrape():
+            # Scrape LinkedIn and Wuzzuf at the same time in worker threads so the
+            # event loop keeps answering Discord heartbeats while the browsers work
+            # Only the search URLs that are due are scraped this round
+            due_linkedin = [url for url in sources if url in linkedin_sources]
+            due_wuzzuf = [url for url in sources if url in wuzzuf_sources]
+
+            if due_linkedin:
+                print(f"Scraping LinkedIn ({len(due_linkedin)}/{len(linkedin_sources)} searches due)...")
+                await safe_send(DEBUG_CHANNEL, f"⏳ Scraping LinkedIn ({len(due_linkedin)}/{len(linkedin_sources)} searches due)...")
+                linkedin_scrape = asyncio.to_thread(scraper.get_recent_roles, show_details=SHOW_DETAILED_LOGS, pool=DRIVER_POOL, on_roles=on_roles, sources=set(due_linkedin))
+            else:
+                linkedin_scrape = asyncio.sleep(0, result=([], {}))
 
-            source = "Wuzzuf" if "wuzzuf.net" in link else "LinkedIn"
-            
-            embed = discord.Embed(title=title, url=link, color=discord.Color.from_str("#378CCF"), timestamp=datetime.datetime.now())
-            embed.set_author(name=company, url=get_google_url(company))
-            embed.add_field(name="Posted", value=posted_time, inline=True)
-            embed.add_field(name="Source", value=source, inline=True)
-            embed.set_thumbnail(url=picture)
-            await safe_send(NEW_POSTINGS_CHANNEL, embed=embed)
+            if due_wuzzuf:
+                print(f"Scraping Wuzzuf ({len(due_wuzzuf)}/{len(wuzzuf_sources)} searches due)...")
+                await safe_send(DEBUG_CHANNEL, f"⏳ Scraping Wuzzuf ({len(due_wuzzuf)}/{len(wuzzuf_sources)} searches due)...")
+                wuzzuf_scrape = asyncio.to_thread(wuzzuf_scraper.get_wuzzuf_roles, show_details=SHOW_DETAILED_LOGS, pool=DRIVER_POOL, on_roles=on_roles, sources=set(due_wuzzuf))
+            else:
+                wuzzuf_scrape = asyncio.sleep(0, result=([], {}))
+
+            try:
+                return await asyncio.gather(linkedin_scrape, wuzzuf_scrape)
+            finally:
+                found_roles.put_nowait(None)  # Every page was pushed before the threads finished
+
+        async def filter_new_roles():
+            new_jobs = NewJobFilter(store, queued_roles=POSTING_QUEUE.roles())
+            try:
+                while (item := await found_roles.get()) is not None:
+                    found_at, roles = item
+                    for role in roles:
+                        company, title = role[0], role[1]
+                        reason = new_jobs.skip_reason(role)
+                        if reason:
+                            if SHOW_DETAILED_LOGS: print(f"  - Skipping ({reason}): {title} at {company}")
+                            continue
+
+                        if SHOW_DETAILED_LOGS: print(f"  - ✓ Adding to post queue: {title} at {company}")
+                        POSTING_QUEUE.enqueue(role, job_embed(role), found_at)
+                    jobs_ready.set()
+            finally:
+                filtering_done.set()
+                jobs_ready.set()
+
+        async def post_new_roles():
+            posted_roles = []
+            while True:
+                await jobs_ready.wait()
+                jobs_ready.clear()
+                # Each job is marked posted once its message is sent
+                posted_roles += await POSTING_QUEUE.flush(NEW_POSTINGS_CHANNEL)
+                if filtering_done.is_set() and not jobs_ready.is_set():
+                    return posted_roles
+
+        scrape_results, _, posted_roles = await asyncio.gather(scrape(), filter_new_roles(), post_new_roles())
+        (linkedin_roles, linkedin_recent_ids), (wuzzuf_roles, wuzzuf_recent_ids) = scrape_results
+        recent_ids = {**linkedin_recent_ids, **wuzzuf_recent_ids}
+        # Compare with what the sources knew before this round, for the polling scheduler
+        new_job_counts = {url: count_new_ids(ids, store.get_recent_job_ids(url)) for url, ids in recent_ids.items()}
+        companies_for_this_run = {company for company, _, _, _, _ in posted_roles}
+        METRICS.set("posted_links", store.posted_count())
+
+        latencies = sorted(POSTING_QUEUE.take_latencies())
+        latency_note = ""
+        if latencies:
+            latency_note = f"parse-to-post latency median {latencies[len(latencies) // 2]:.1f}s, max {latencies[-1]:.1f}s"
+            print(f"--- Posted {len(latencies)} job(s) from {len(linkedin_roles) + len(wuzzuf_roles)} scraped, {latency_note} ---")
         
         scrape_end_time = datetime.datetime.now()
         scrape_duration = (scrape_end_time - scrape_start_time).total_seconds()
         
         print(f"\n{'='*60}")
-        if unique_roles_to_post:
+        if posted_roles:
             await send_companies_list(companies_for_this_run)
             
-            # Update stop markers for LinkedIn URLs BEFORE saving config
-            config["last_job_per_source"] = config.get("last_job_per_source", {})
-            for source_url, first_job_link in linkedin_stop_markers.items():
-                if first_job_link:
-                    config["last_job_per_source"][source_url] = {
-                        "job_link": first_job_link,
-                        "timestamp": datetime.datetime.now().isoformat()
-                    }
-            
-            save_config(config)
-            print(f"✓ Posted {len(unique_roles_to_post)} new jobs from {len(companies_for_this_run)} companies")
+            store.set_recent_job_ids(recent_ids)
+            queued_note = f" ({len(POSTING_QUEUE)} still queued)" if len(POSTING_QUEUE) else ""
+            print(f"✓ Posted {len(posted_roles)} new jobs from {len(companies_for_this_run)} companies{queued_note}")
             print(f"⏱️  Scraping took {int(scrape_duration // 60)} minutes {int(scrape_duration % 60)} seconds")
-            await safe_send(DEBUG_CHANNEL, f"✅ **Posted {len(unique_roles_to_post)} new jobs** from {len(companies_for_this_run)} companies\n⏱️ Scraping took {int(scrape_duration // 60)}m {int(scrape_duration % 60)}s")
+            await safe_send(DEBUG_CHANNEL, f"✅ **Posted {len(posted_roles)} new jobs** from {len(companies_for_this_run)} companies{queued_note}\n⏱️ Scraping took {int(scrape_duration // 60)}m {int(scrape_duration % 60)}s, {latency_note}")
         else:
-            # Even if no jobs to post, update stop markers if we scraped
-            if linkedin_stop_markers:
-                config["last_job_per_source"] = config.get("last_job_per_source", {})
-                for source_url, first_job_link in linkedin_stop_markers.items():
-                    if first_job_link:
-                        config["last_job_per_source"][source_url] = {
-                            "job_link": first_job_link,
-                            "timestamp": datetime.datetime.now().isoformat()
-                        }
-                save_config(config)
+            # Even if no jobs to post, remember which jobs we scraped
+            store.set_recent_job_ids(recent_ids)
             
+            if len(POSTING_QUEUE):
+                print(f"⚠️  {len(POSTING_QUEUE)} job(s) could not be posted yet, retrying next cycle")
             print(f"✓ No new jobs found to post.")
             print(f"⏱️  Scraping took {int(scrape_duration // 60)} minutes {int(scrape_duration % 60)} seconds")
             await safe_send(DEBUG_CHANNEL, f"ℹ️ No new jobs found to post\n⏱️ Scraping took {int(scrape_duration // 60)}m {int(scrape_duration % 60)}s")
         
         print(f"{'='*60}\n")
+        return new_job_counts
 
     cycle_number = 0
     while True:
+        wait_seconds = schedule.seconds_until_next()
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+        due_sources = schedule.due()
+
         cycle_number += 1
         try:
-            await send_new_roles()
+            with METRICS.timed("cycle_seconds"):
+                new_job_counts = await send_new_roles(due_sources)
+            # A due search missing from the counts got no cards; it is retried instead of backed off
+            schedule.record_polls(new_job_counts, failed=[url for url in due_sources if url not in new_job_counts])
             
-            next_check_time = datetime.datetime.now() + datetime.timedelta(minutes=20)
-            print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] 😴 Waiting 20 minutes... (Cycle {cycle_number} complete)")
-            print(f"[Next check at {next_check_time.strftime('%H:%M:%S')}]\n")
-            await safe_send(DEBUG_CHANNEL, f'😴 **Waiting 20 minutes** before next check...\n⏰ Next check at: {next_check_time.strftime("%H:%M:%S")}')
-            
-            await asyncio.sleep(60 * 20)  # Wait 20 minutes
+            next_check_time = datetime.datetime.now() + datetime.timedelta(seconds=schedule.seconds_until_next())
+            print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] 😴 Waiting until {next_check_time.strftime('%H:%M:%S')}... (Cycle {cycle_number} complete)")
+            print(f"[Next checks]\n{schedule.describe(source_labels)}\n")
+            # Discord messages are capped at 2000 characters
+            await safe_send(DEBUG_CHANNEL, f'😴 **Next checks** (busy searches are checked more often):\n{schedule.describe(source_labels)}'[:2000])
             
         except Exception as e:
             error_msg = f'Error occurred: {str(e)}'
             print(f"\n{'='*60}")
             print(f"✗ {error_msg}")
             print(f"{'='*60}\n")
-            await safe_send(DEBUG_CHANNEL, f'❌ **Error occurred:** {error_msg}\n⏳ Retrying in 20 minutes...')
-            await asyncio.sleep(60 * 20)
-
-def get_config():
-    config_path = os.path.join(sys.path[0], 'config.json')
-    
-    # Check if config file exists and is valid
-    try:
-        with open(config_path) as f:
-            config = json.load(f)
-            # Ensure last_job_per_source exists
-            if "last_job_per_source" not in config:
-                config["last_job_per_source"] = {}
-            # Ensure other required fields exist
-            if "posted" not in config:
-                config["posted"] = {}
-            if "blacklist" not in config:
-                config["blacklist"] = []
-            return config
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        # File doesn't exist or is empty/invalid - create default config
-        print(f"⚠️  Config file missing or invalid: {e}")
-        print("  - Creating new config.json with default values...")
-        default_config = {
-            "blacklist": [],
-            "posted": {},
-            "last_job_per_source": {}
-        }
-        save_config(default_config)
-        return default_config
-
-def save_config(config):
-    with open(os.path.join(sys.path[0], 'config.json'), 'w') as f:
-        f.seek(0)
-        json.dump(config, f, indent=4)
-        f.truncate()
+            await safe_send(DEBUG_CHANNEL, f'❌ **Error occurred:** {error_msg}\n⏳ Retrying in {POLL_MIN_INTERVAL_MINUTES:.0f} minutes...')
+            await asyncio.sleep(60 * POLL_MIN_INTERVAL_MINUTES)
 
 print("Starting LinkedIn Jobs Notifier Bot...")
 print("=" * 60)
-bot.run(BOT_TOKEN, reconnect=True)
\ No newline at end of file
+try:
+    bot.run(BOT_TOKEN, reconnect=True)
+finally:
+    print("Shutting down browsers...")
+    DRIVER_POOL.shutdown()
\ No newline at end of file
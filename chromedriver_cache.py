@@ -0,0 +1,91 @@
+from dotenv import load_dotenv
+import os, sys, json, threading
+
+load_dotenv()
+# Where the resolved chromedriver path is remembered along with the Chrome version it matches
+CHROMEDRIVER_CACHE_FILE = os.getenv('CHROMEDRIVER_CACHE_FILE') or os.path.join(sys.path[0], 'chromedriver_cache.json')
+# Chrome ignores switches it doesn't know; this one marks the browsers the bot started
+BROWSER_MARKER = "--jobs-notifier-browser"
+
+_path = None
+_lock = threading.Lock()
+
+
+def installed_chrome_version():
+    """Version of the locally installed Chrome, read without any network access; None if unknown."""
+    try:
+        from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        return None
+
+def _major(version):
+    return (version or "").split(".")[0]
+
+def _load_cache(path=CHROMEDRIVER_CACHE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _save_cache(driver_path, chrome_version, path=CHROMEDRIVER_CACHE_FILE):
+    try:
+        with open(path, 'w') as f:
+            json.dump({"path": driver_path, "chrome_version": chrome_version}, f, indent=4)
+    except OSError as e:
+        print(f"⚠️  Could not save the chromedriver location to {path}: {e}")
+
+
+def chromedriver_path():
+    """
+    Path of a chromedriver for the installed Chrome, resolved once per process.
+
+    webdriver-manager (which checks versions and may download) only runs when nothing is
+    cached or Chrome's major version changed since; otherwise startup stays offline.
+    """
+    global _path
+    with _lock:
+        if _path:
+            return _path
+        chrome_version = installed_chrome_version()
+        cached = _load_cache()
+        if (cached and os.path.isfile(cached.get("path", ""))
+                and (chrome_version is None or _major(cached.get("chrome_version")) == _major(chrome_version))):
+            _path = cached["path"]
+            return _path
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        print(f"  - Resolving chromedriver for Chrome {chrome_version or '(version unknown)'}...")
+        _path = ChromeDriverManager().install()
+        _save_cache(_path, chrome_version)
+        return _path
+
+def invalidate():
+    """Forget the cached chromedriver, e.g. after Chrome refused it; the next call resolves it again."""
+    global _path
+    with _lock:
+        _path = None
+        try:
+            os.remove(CHROMEDRIVER_CACHE_FILE)
+        except FileNotFoundError:
+            pass
+
+
+def start_chrome(options):
+    """webdriver.Chrome on the cached chromedriver; if Chrome rejects that driver, it is resolved again once."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.common.exceptions import SessionNotCreatedException
+    if BROWSER_MARKER not in options.arguments:
+        options.add_argument(BROWSER_MARKER)
+    for attempt in range(2):
+        service = ChromeService(executable_path=chromedriver_path())
+        service.log_path = os.devnull
+        try:
+            return webdriver.Chrome(options=options, service=service)
+        except SessionNotCreatedException:
+            if attempt:
+                raise
+            print("  ⚠️  The cached chromedriver doesn't fit this Chrome, resolving it again...")
+            invalidate()
@@ -0,0 +1,156 @@
+from dotenv import load_dotenv
+from collections import defaultdict
+from functools import lru_cache
+import os, re, hashlib, struct
+
+load_dotenv()
+# Jobs whose company + title tokens overlap at least this much (Jaccard) are the same posting
+DEDUP_SIMILARITY = float(os.getenv('DEDUP_SIMILARITY', 0.8))
+
+LINKEDIN_JOB_KEY = re.compile(r"/jobs/view/(?:[^/?#]*-)?(\d+)|[?&]currentJobId=(\d+)")
+WUZZUF_JOB_KEY = re.compile(r"wuzzuf\.net/jobs/p/([^/?#]+)")
+
+# Words that differ between how sites spell the same company or title
+COMPANY_NOISE = {"inc", "llc", "ltd", "limited", "co", "company", "corp", "corporation", "group",
+                 "holding", "sae", "plc", "gmbh", "the", "egypt"}
+# Location words ("remote", "hybrid") stay: the same title remote and on-site are different jobs
+TITLE_NOISE = {"urgent", "urgently", "hiring"}
+
+# MinHash signature of NUM_PERM values split into BANDS bands; two jobs become candidates
+# when any band matches, which happens mostly for pairs above ~(1/BANDS)^(1/rows) similarity
+NUM_PERM = 32
+BANDS = 8
+_ROWS = NUM_PERM // BANDS
+
+
+def job_key(link):
+    """Canonical key for a job link: the LinkedIn job ID or Wuzzuf slug, else the link without its query."""
+    if not link:
+        return None
+    match = LINKEDIN_JOB_KEY.search(link) if "linkedin.com" in link else None
+    if match:
+        return f"linkedin:{match.group(1) or match.group(2)}"
+    match = WUZZUF_JOB_KEY.search(link)
+    if match:
+        return f"wuzzuf:{match.group(1).lower()}"
+    return link.split("?")[0].split("#")[0].rstrip("/")
+
+
+def _words(text, noise):
+    if text == "N/A":  # placeholder the scrapers use for a missing field
+        return []
+    return [word for word in re.sub(r"[\W_]+", " ", (text or "").lower()).split() if word not in noise]
+
+def fingerprint(company, title):
+    """Normalized 'company|title', identical for the same posting spelled slightly differently."""
+    return " ".join(_words(company, COMPANY_NOISE)) + "|" + " ".join(_words(title, TITLE_NOISE))
+
+def _site(key):
+    """'linkedin' or 'wuzzuf' for a key that is a job ID on that site, else None."""
+    site, sep, _ = (key or "").partition(":")
+    return site if sep and site in ("linkedin", "wuzzuf") else None
+
+def _tokens(fingerprint_):
+    company, _, title = fingerprint_.partition("|")
+    if not company or not title:
+        return frozenset()  # too little to tell postings apart
+    # Title words are tied to the company's first word, so the same title at an unrelated
+    # company shares almost nothing and doesn't even become an LSH candidate
+    qualifier = company.split()[0]
+    return frozenset(["c:" + word for word in company.split()] + [f"t:{qualifier}:{word}" for word in title.split()])
+
+@lru_cache(maxsize=4096)
+def _token_hashes(token):
+    """NUM_PERM independent 32-bit hashes of one token (one per MinHash permutation)."""
+    return struct.unpack(f"<{NUM_PERM}I", hashlib.shake_128(token.encode()).digest(4 * NUM_PERM))
+
+def _band_keys(tokens):
+    signature = tuple(map(min, *(_token_hashes(token) for token in tokens))) if len(tokens) > 1 else _token_hashes(next(iter(tokens)))
+    return [(band, signature[band * _ROWS:(band + 1) * _ROWS]) for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    """
+    Finds an earlier job that is the same posting as a new one.
+
+    Jobs match on their canonical key (same LinkedIn ID or Wuzzuf slug under any URL
+    variant), on an identical company + title fingerprint, or on near-identical company +
+    title tokens. Near duplicates are looked up through MinHash LSH, so only jobs sharing
+    a signature band are compared and a lookup doesn't scan the whole history.
+    Company + title matching only links jobs across sites (or without a job ID): two
+    different IDs on the same site are two jobs, however alike their titles.
+    """
+
+    def __init__(self, similarity=DEDUP_SIMILARITY):
+        self.similarity = similarity
+        self._by_key = {}         # job key -> link
+        self._by_fingerprint = {} # fingerprint -> link
+        self._entries = {}        # link -> (job key, fingerprint, tokens, band keys)
+        self._bands = defaultdict(set)  # band key -> links
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, link):
+        return link in self._entries
+
+    def add(self, link, company=None, title=None, fingerprint_=None):
+        """Index a job; pass its company and title, or the stored fingerprint."""
+        self.discard(link)
+        key = job_key(link)
+        fingerprint_ = fingerprint_ if fingerprint_ is not None else fingerprint(company, title)
+        tokens = _tokens(fingerprint_)
+        band_keys = _band_keys(tokens) if tokens else []
+        self._entries[link] = (key, fingerprint_, tokens, band_keys)
+        self._by_key[key] = link
+        if tokens:
+            self._by_fingerprint[fingerprint_] = link
+        for band_key in band_keys:
+            self._bands[band_key].add(link)
+
+    def discard(self, link):
+        entry = self._entries.pop(link, None)
+        if entry is None:
+            return
+        key, fingerprint_, _, band_keys = entry
+        if self._by_key.get(key) == link:
+            del self._by_key[key]
+        if self._by_fingerprint.get(fingerprint_) == link:
+            del self._by_fingerprint[fingerprint_]
+        for band_key in band_keys:
+            links = self._bands[band_key]
+            links.discard(link)
+            if not links:
+                del self._bands[band_key]
+
+    def find(self, link, company, title):
+        """Return (link of the earlier job, reason) if this job was indexed already under any guise, else None."""
+        key = job_key(link)
+        match = self._by_key.get(key)
+        if match:
+            return match, "same job ID"
+
+        fingerprint_ = fingerprint(company, title)
+        tokens = _tokens(fingerprint_)
+        if not tokens:
+            return None
+        site = _site(key)
+
+        def comparable(candidate):
+            # Another ID from the same site is a different job; its key would have matched above
+            return site is None or _site(self._entries[candidate][0]) != site
+
+        match = self._by_fingerprint.get(fingerprint_)
+        if match and comparable(match):
+            return match, "same company and title"
+
+        candidates = set()
+        for band_key in _band_keys(tokens):
+            candidates.update(self._bands.get(band_key, ()))
+        for candidate in candidates:
+            if not comparable(candidate):
+                continue
+            other = self._entries[candidate][2]
+            if len(tokens & other) / len(tokens | other) >= self.similarity:
+                return candidate, "near-identical company and title"
+        return None
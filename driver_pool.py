@@ -0,0 +1,226 @@
+from dotenv import load_dotenv
+from contextlib import contextmanager
+from metrics import METRICS, mark_startup
+import os, shutil, tempfile, threading, time
+import logging
+
+logging.getLogger('selenium').setLevel(logging.WARNING)
+
+load_dotenv()
+SCRAPE_CONCURRENCY = max(1, int(os.getenv('SCRAPE_CONCURRENCY', 1)))
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', 2 * SCRAPE_CONCURRENCY))
+DRIVER_RECYCLE_AFTER_PAGES = int(os.getenv('DRIVER_RECYCLE_AFTER_PAGES', 50))
+# Browsers older than this are restarted at the next page boundary (0 disables)
+DRIVER_MAX_AGE_MINUTES = float(os.getenv('DRIVER_MAX_AGE_MINUTES', 120))
+# A page that hasn't loaded after this many seconds gets a fresh browser and one retry
+PAGE_LOAD_TIMEOUT = float(os.getenv('PAGE_LOAD_TIMEOUT', 60))
+
+# Profile files that belong to the running Chrome instance or can be rebuilt; never copied into clones
+PROFILE_CLONE_IGNORE = shutil.ignore_patterns(
+    'Singleton*', 'lockfile', '*.lock', 'LOCK',
+    'Cache', 'Code Cache', 'GPUCache', 'GrShaderCache', 'ShaderCache',
+    'Service Worker', 'Crashpad', 'BrowserMetrics*',
+)
+# Name prefix of the temporary profile copies, so leftovers can be recognised as ours
+PROFILE_CLONE_PREFIX = "jobs-notifier-profile-"
+
+
+class DriverPool:
+    """
+    Keeps Chrome drivers alive between searches so each URL doesn't pay a cold start.
+
+    Drivers are created by a per-kind factory (e.g. "linkedin" needs the logged-in
+    profile, "wuzzuf" doesn't). A driver is health-checked when it is checked out
+    and replaced once it has loaded DRIVER_RECYCLE_AFTER_PAGES pages. Scrapers call
+    fresh_driver() between pages, which swaps in a new browser when the current one
+    is older than DRIVER_MAX_AGE_MINUTES or was flagged by the memory watchdog.
+    """
+
+    def __init__(self, factories, max_drivers=DRIVER_POOL_SIZE, recycle_after_pages=DRIVER_RECYCLE_AFTER_PAGES,
+                 max_age_minutes=DRIVER_MAX_AGE_MINUTES):
+        self.factories = factories
+        self.max_drivers = max(1, max_drivers)
+        self.recycle_after_pages = recycle_after_pages
+        self.max_age = max_age_minutes * 60
+        self._idle = {kind: [] for kind in factories}
+        self._pages = {}    # id(driver) -> pages loaded
+        self._live = {}     # id(driver) -> (kind, driver, started at), idle or checked out
+        self._flagged = {}  # id(driver) -> (cause, why it should be restarted)
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def _create(self, kind):
+        with METRICS.timed("driver_start_seconds", kind=kind):
+            driver = self.factories[kind]()
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        self._pages[id(driver)] = 0
+        self._live[id(driver)] = (kind, driver, time.monotonic())
+        return driver
+
+    def _quit(self, driver):
+        self._pages.pop(id(driver), None)
+        self._live.pop(id(driver), None)
+        self._flagged.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def is_healthy(driver):
+        """A driver is healthy if its browser session still answers commands."""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, kind):
+        """Check out a healthy driver of the given kind, creating one if the pool has room."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool has been shut down")
+                if self._idle[kind]:
+                    driver = self._idle[kind].pop()
+                    break
+                if self._total < self.max_drivers:
+                    driver = None
+                    self._total += 1
+                    break
+                # Pool is full: free an idle driver of another kind if there is one
+                other = next((k for k, idle in self._idle.items() if idle), None)
+                if other:
+                    self._quit(self._idle[other].pop())
+                    self._total -= 1
+                    continue
+                self._cond.wait()
+
+        if driver is not None and self.is_healthy(driver):
+            return driver
+        if driver is not None:
+            print("  ⚠️  Browser session was unresponsive, starting a new one...")
+            self._quit(driver)
+        try:
+            return self._create(kind)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, kind, driver, discard=False):
+        """Return a driver to the pool, recycling it if it is worn out or broken."""
+        worn_out = self._pages.get(id(driver), 0) >= self.recycle_after_pages or self.needs_restart(driver)
+        with self._cond:
+            if discard or worn_out or self._closed:
+                self._quit(driver)
+                self._total -= 1
+            else:
+                self._idle[kind].append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, kind):
+        """Context manager around acquire/release. Drivers that raised are discarded."""
+        driver = self.acquire(kind)
+        try:
+            yield driver
+        except Exception:
+            self.release(kind, driver, discard=not self.is_healthy(driver))
+            raise
+        else:
+            self.release(kind, driver)
+
+    def count_page(self, driver):
+        """Record a page load against the driver's recycle budget."""
+        self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+    def live_drivers(self):
+        """(kind, driver) for every browser the pool has running, idle or checked out."""
+        return [(kind, driver) for kind, driver, _ in list(self._live.values())]
+
+    def flag(self, driver, cause, reason):
+        """Ask for a driver to be restarted at its next page boundary (used by the memory watchdog)."""
+        if id(driver) in self._live:
+            self._flagged[id(driver)] = (cause, reason)
+
+    def needs_restart(self, driver):
+        """(cause, reason) if a driver should be replaced before its next page, else None."""
+        if id(driver) in self._flagged:
+            return self._flagged[id(driver)]
+        live = self._live.get(id(driver))
+        if live and self.max_age and time.monotonic() - live[2] > self.max_age:
+            return "age", f"running for over DRIVER_MAX_AGE_MINUTES={self.max_age / 60:.0f}"
+        return None
+
+    def restart(self, kind, driver, cause, reason):
+        """Quit a checked-out driver and return a new one in its place."""
+        print(f"  ♻️  Restarting the {kind} browser ({reason})...")
+        METRICS.inc("browser_restarts_total", kind=kind, reason=cause)
+        self._quit(driver)
+        # If this raises, the caller still releases the dead driver, which frees its slot
+        return self._create(kind)
+
+    def fresh_driver(self, kind, driver):
+        """Between pages: the same driver, or a new one if it grew too old or too big. The crawl carries on from the next page."""
+        restart = self.needs_restart(driver)
+        return self.restart(kind, driver, *restart) if restart else driver
+
+    def load(self, kind, driver, url):
+        """
+        driver.get(url) that survives a hung renderer: after PAGE_LOAD_TIMEOUT the browser is
+        replaced and the page tried once more. Returns the driver that loaded the page.
+        """
+        from selenium.common.exceptions import TimeoutException
+        try:
+            driver.get(url)
+        except TimeoutException:
+            driver = self.restart(kind, driver, "timeout", f"page didn't load within {PAGE_LOAD_TIMEOUT:.0f}s")
+            driver.get(url)
+        self.count_page(driver)
+        mark_startup("first_page")
+        return driver
+
+    def shutdown(self):
+        """Quit every idle driver and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            for idle in self._idle.values():
+                while idle:
+                    self._quit(idle.pop())
+                    self._total -= 1
+            self._cond.notify_all()
+
+
+def clone_profile(source_dir):
+    """
+    Copy a Chrome user-data dir so another browser can use the same logged-in session.
+    Chrome locks a profile to a single process, so parallel browsers each need their own copy.
+    """
+    clone_dir = tempfile.mkdtemp(prefix=PROFILE_CLONE_PREFIX)
+    if os.path.isdir(source_dir):
+        shutil.copytree(source_dir, clone_dir, ignore=PROFILE_CLONE_IGNORE, dirs_exist_ok=True,
+                        ignore_dangling_symlinks=True)
+    return clone_dir
+
+def remove_profile_clone(clone_dir):
+    shutil.rmtree(clone_dir, ignore_errors=True)
+
+
+def create_default_pool():
+    """Build the pool shared by the LinkedIn and Wuzzuf scrapers, watched by the memory watchdog."""
+    import scraper, wuzzuf_scraper
+    from memory_watchdog import MemoryWatchdog, kill_orphaned_browsers
+    kill_orphaned_browsers()
+    pool = DriverPool({
+        "linkedin": scraper.init_driver,
+        "wuzzuf": wuzzuf_scraper.init_wuzzuf_driver,
+    })
+    MemoryWatchdog(pool).start()
+    return pool
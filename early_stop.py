@@ -0,0 +1,91 @@
+from dotenv import load_dotenv
+import os, re
+
+load_dotenv()
+# How many of the most recent job IDs each search URL remembers between cycles
+EARLY_STOP_RECENT_IDS = max(1, int(os.getenv('EARLY_STOP_RECENT_IDS', 100)))
+# Stop crawling a search once this many known jobs were seen in a row
+EARLY_STOP_CONSECUTIVE_KNOWN = max(1, int(os.getenv('EARLY_STOP_CONSECUTIVE_KNOWN', 3)))
+# Count jobs that were already posted (from any search) as known too
+EARLY_STOP_ON_POSTED = os.getenv('EARLY_STOP_ON_POSTED', 'True').lower() == 'true'
+
+LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/?#]*-)?(\d+)")
+WUZZUF_JOB_ID = re.compile(r"/jobs/p/([^/?#]+)")
+
+
+def job_id(link):
+    """Stable ID for a job link: LinkedIn's numeric job ID, Wuzzuf's slug, else the link itself."""
+    if not link:
+        return None
+    match = LINKEDIN_JOB_ID.search(link) or WUZZUF_JOB_ID.search(link)
+    return match.group(1) if match else link
+
+
+def merge_recent_ids(seen_now, previous, limit=EARLY_STOP_RECENT_IDS):
+    """The bounded, newest-first ID list to keep: this crawl's IDs in page order, then older ones."""
+    merged = list(dict.fromkeys(list(seen_now) + list(previous)))
+    return merged[:limit]
+
+
+class EarlyStop:
+    """
+    Decides when a search crawl has caught up with the previous cycle.
+
+    A single stop-marker link is fragile: once that posting is removed or reshuffled the
+    crawl runs to the last page. Instead every card is checked against the source's most
+    recent job IDs (and optionally the posted history); the crawl stops after
+    `consecutive` known cards in a row. Promoted cards are pinned out of date order, so
+    they neither count towards nor break a run.
+    """
+
+    def __init__(self, known_ids, is_posted=None, consecutive=EARLY_STOP_CONSECUTIVE_KNOWN):
+        self.previous_ids = list(known_ids)
+        self.known_ids = set(self.previous_ids)
+        self.is_posted = is_posted if EARLY_STOP_ON_POSTED else None
+        self.consecutive = consecutive
+        self.run = 0
+        self.seen_ids = []  # every ID seen this crawl, in page order
+        self.stop_page = None
+        self.stop_card = None
+        self.stop_reason = None
+
+    @property
+    def active(self):
+        return bool(self.known_ids) or self.is_posted is not None
+
+    def is_known(self, link, id_):
+        if id_ in self.known_ids:
+            return "seen last cycle"
+        if self.is_posted and self.is_posted(link):
+            return "already posted"
+        return None
+
+    def check(self, link, promoted=False, page=None, card=None):
+        """Record a card; True once the crawl should stop at it."""
+        id_ = job_id(link)
+        if id_ not in self.seen_ids:
+            self.seen_ids.append(id_)
+        if promoted:
+            return False
+
+        reason = self.is_known(link, id_)
+        self.run = self.run + 1 if reason else 0
+        if self.run < self.consecutive:
+            return False
+        self.stop_page, self.stop_card = page, card
+        self.stop_reason = f"{self.run} known jobs in a row, last one {reason}"
+        return True
+
+    def report(self, max_pages):
+        """One-line summary of where the crawl stopped and how many pages that saved."""
+        if self.stop_page is None:
+            return f"no early stop ({len(self.seen_ids)} jobs seen)"
+        return (f"stopped at page {self.stop_page}, card {self.stop_card} ({self.stop_reason}), "
+                f"saved up to {max_pages - self.stop_page} of {max_pages} pages")
+
+    def pages_saved(self, max_pages):
+        return 0 if self.stop_page is None else max_pages - self.stop_page
+
+    def recent_ids(self, limit=EARLY_STOP_RECENT_IDS):
+        """What the source should remember for the next cycle."""
+        return merge_recent_ids(self.seen_ids, self.previous_ids, limit)
@@ -0,0 +1,69 @@
+import heapq
+
+BUCKET_SECONDS = 3600
+
+
+class ExpiringLinkSet:
+    """
+    Set of links that remembers when each was added, for O(1) membership checks and
+    expiry that only touches what expired.
+
+    Links are grouped into hourly buckets keyed by insert time. Expiring drops whole
+    buckets that lie entirely before the cutoff and only inspects individual links in
+    the one bucket the cutoff falls into, so pruning costs O(expired + one bucket)
+    instead of O(history).
+    """
+
+    def __init__(self, bucket_seconds=BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self._added_at = {}   # link -> unix timestamp
+        self._buckets = {}    # bucket number -> set of links
+        self._bucket_heap = []  # bucket numbers, oldest first
+
+    def __contains__(self, link):
+        return link in self._added_at
+
+    def __len__(self):
+        return len(self._added_at)
+
+    def _bucket(self, timestamp):
+        return int(timestamp // self.bucket_seconds)
+
+    def add(self, link, timestamp):
+        """Add `link` (or move it, if it is already present) to the bucket for `timestamp`."""
+        if link in self._added_at:
+            self._discard_from_bucket(link)
+        self._added_at[link] = timestamp
+        bucket = self._bucket(timestamp)
+        if bucket not in self._buckets:
+            self._buckets[bucket] = set()
+            heapq.heappush(self._bucket_heap, bucket)
+        self._buckets[bucket].add(link)
+
+    def _discard_from_bucket(self, link):
+        # Emptied buckets stay in the heap and are skipped lazily by expire()
+        self._buckets.get(self._bucket(self._added_at[link]), set()).discard(link)
+
+    def discard(self, link):
+        if link in self._added_at:
+            self._discard_from_bucket(link)
+            del self._added_at[link]
+
+    def expire(self, cutoff):
+        """Remove and return every link added before the `cutoff` unix timestamp."""
+        expired = []
+        cutoff_bucket = self._bucket(cutoff)
+        while self._bucket_heap and self._bucket_heap[0] < cutoff_bucket:
+            bucket = heapq.heappop(self._bucket_heap)
+            for link in self._buckets.pop(bucket, ()):
+                del self._added_at[link]
+                expired.append(link)
+
+        # The bucket containing the cutoff is only partly expired
+        boundary = self._buckets.get(cutoff_bucket)
+        if boundary:
+            for link in [link for link in boundary if self._added_at[link] < cutoff]:
+                boundary.discard(link)
+                del self._added_at[link]
+                expired.append(link)
+        return expired
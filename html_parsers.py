@@ -0,0 +1,176 @@
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urljoin
+import re, sys
+
+# CSS selectors used to pull job cards out of a results page. Fields with several
+# selectors are tried in order, so a renamed class only needs a new entry here.
+LINKEDIN_SELECTORS = {
+    "card": "li.occludable-update",
+    "company": [".artdeco-entity-lockup__subtitle", ".job-card-container__primary-description"],
+    "title": ["a.job-card-container__link strong"],
+    "link": ["a[href*='/jobs/view/']"],
+    "posted_time": ["time"],
+    "picture": ["img"],
+    "promoted": ".job-card-container__footer-item",
+    "insight": [".job-card-container__job-insight-text"],
+}
+
+# Cards served by the jobs-guest search endpoint (used by the driverless LinkedIn mode)
+LINKEDIN_GUEST_SELECTORS = {
+    "card": "div.base-card",
+    "company": ["h4.base-search-card__subtitle", ".base-search-card__subtitle"],
+    "title": ["h3.base-search-card__title", ".base-search-card__title"],
+    "link": ["a.base-card__full-link", "a[href*='/jobs/view/']"],
+    "posted_time": ["time"],
+    "picture": ["img"],
+    "insight": [".job-search-card__benefits", ".base-search-card__metadata"],
+}
+
+WUZZUF_SELECTORS = {
+    "card": "div.css-pkv5jc",
+    "title": ["h2.css-193uk2c a"],
+    "company": ["a.css-ipsyv7"],
+    "posted_time": ["div.css-1jldrig", "div.css-eg55jf"],
+    "picture": ["a img.css-1in28d3"],
+}
+
+# Description of a job detail page, for keyword checks on more than the card text
+DESCRIPTION_SELECTORS = {
+    "linkedin": ["#job-details", ".jobs-description__content", ".jobs-box__html-content",
+                 ".show-more-less-html__markup", ".description__text"],
+    # Wuzzuf's class names are build hashes, so the job page's main content is read whole
+    "wuzzuf": ["main", "#app"],
+}
+
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+WUZZUF_BASE_URL = "https://wuzzuf.net"
+LINKEDIN_PLACEHOLDER_PICTURE = "https://via.placeholder.com/100"
+WUZZUF_PLACEHOLDER_PICTURE = "https://wuzzuf.net/images/wuzzuf-logo-square.png"
+
+
+def _first(node, selectors):
+    for selector in selectors:
+        match = node.css_first(selector)
+        if match is not None:
+            return match
+    return None
+
+def _text(node, selectors):
+    """Visible-ish text of the first matching element with whitespace collapsed, or None."""
+    match = _first(node, selectors)
+    if match is None:
+        return None
+    text = " ".join(match.text(separator=" ").split())
+    return text or None
+
+def _attribute(node, selectors, attribute):
+    match = _first(node, selectors)
+    if match is None:
+        return None
+    return match.attributes.get(attribute) or None
+
+
+def parse_linkedin_cards(html, base_url=LINKEDIN_BASE_URL):
+    """
+    Parse LinkedIn search result cards into dicts with company, title, link, picture,
+    datetime, promoted and insight keys. Missing fields are None.
+    """
+    selectors = LINKEDIN_SELECTORS
+    cards = []
+    for card in LexborHTMLParser(html).css(selectors["card"]):
+        href = _attribute(card, selectors["link"], "href")
+        picture = _attribute(card, selectors["picture"], "src")
+        cards.append({
+            "company": _text(card, selectors["company"]),
+            "title": _text(card, selectors["title"]),
+            "link": urljoin(base_url, href).split("?")[0] if href else None,
+            "picture": urljoin(base_url, picture) if picture else None,
+            "datetime": _attribute(card, selectors["posted_time"], "datetime"),
+            "promoted": any("promoted" in item.text().lower() for item in card.css(selectors["promoted"])),
+            "insight": _text(card, selectors["insight"]),
+        })
+    return cards
+
+def parse_linkedin_guest_cards(html, base_url=LINKEDIN_BASE_URL):
+    """
+    Parse cards from the jobs-guest search endpoint into the same dicts as parse_linkedin_cards.
+    Links are normalized to https://www.linkedin.com/jobs/view/<id>/ so they match browser-scraped links.
+    """
+    selectors = LINKEDIN_GUEST_SELECTORS
+    cards = []
+    for card in LexborHTMLParser(html).css(selectors["card"]):
+        href = _attribute(card, selectors["link"], "href") or ""
+        urn = card.attributes.get("data-entity-urn") or ""
+        job_id = re.search(r"(\d+)$", urn) or re.search(r"-(\d+)(?:[/?]|$)", href) or re.search(r"/jobs/view/(\d+)", href)
+        image = _first(card, selectors["picture"])
+        picture = None
+        if image is not None:
+            picture = image.attributes.get("data-delayed-url") or image.attributes.get("src")
+        cards.append({
+            "company": _text(card, selectors["company"]),
+            "title": _text(card, selectors["title"]),
+            "link": f"{LINKEDIN_BASE_URL}/jobs/view/{job_id.group(1)}/" if job_id else None,
+            "picture": urljoin(base_url, picture) if picture else None,
+            "datetime": _attribute(card, selectors["posted_time"], "datetime"),
+            "promoted": False,
+            "insight": _text(card, selectors["insight"]),
+        })
+    return cards
+
+def parse_wuzzuf_cards(html, base_url=WUZZUF_BASE_URL):
+    """
+    Parse Wuzzuf search result cards into dicts with company, title, link, picture and
+    posted_time keys. Cards without a title link or company are skipped.
+    """
+    selectors = WUZZUF_SELECTORS
+    cards = []
+    for card in LexborHTMLParser(html).css(selectors["card"]):
+        title = _text(card, selectors["title"])
+        href = _attribute(card, selectors["title"], "href")
+        company = _text(card, selectors["company"])
+        if not (title and href and company):
+            continue
+        picture = _attribute(card, selectors["picture"], "src")
+        cards.append({
+            "company": company,
+            "title": title,
+            "link": urljoin(base_url, href).split("?")[0],
+            "picture": urljoin(base_url, picture) if picture else None,
+            "posted_time": _text(card, selectors["posted_time"]),
+        })
+    return cards
+
+
+def parse_job_description(html, site):
+    """Text of the description on a job detail page of `site`, or None if it isn't there."""
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(["script", "style", "noscript"])
+    return _text(tree, DESCRIPTION_SELECTORS[site])
+
+
+def parse_linkedin_html(html, base_url=LINKEDIN_BASE_URL):
+    """Return (company, title, link, picture, posted_time) tuples for every LinkedIn card with a link."""
+    return [
+        (card["company"] or "N/A", card["title"] or "N/A", card["link"],
+         card["picture"] or LINKEDIN_PLACEHOLDER_PICTURE, card["datetime"] or "N/A")
+        for card in parse_linkedin_cards(html, base_url) if card["link"]
+    ]
+
+def parse_wuzzuf_html(html, base_url=WUZZUF_BASE_URL):
+    """Return (company, title, link, picture, posted_time) tuples for every Wuzzuf card."""
+    return [
+        (card["company"], card["title"], card["link"],
+         card["picture"] or WUZZUF_PLACEHOLDER_PICTURE, card["posted_time"] or "N/A")
+        for card in parse_wuzzuf_cards(html, base_url)
+    ]
+
+
+if __name__ == '__main__':
+    # Usage: python html_parsers.py linkedin|wuzzuf saved_page.html
+    site, path = sys.argv[1], sys.argv[2]
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    roles = parse_linkedin_html(html) if site == "linkedin" else parse_wuzzuf_html(html)
+    for role in roles:
+        print(" | ".join(role))
+    print(f"\n✓ Parsed {len(roles)} jobs from {path}")
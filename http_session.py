@@ -0,0 +1,36 @@
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import requests, threading
+
+# Desktop Chrome UA; both sites serve stripped-down markup to unknown clients
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+REQUEST_TIMEOUT = 20
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_size=16):
+    """A keep-alive session with a connection pool large enough for concurrent page fetches."""
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    return session
+
+def get_session():
+    """Process-wide shared session, so connections are reused across URLs and cycles."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
@@ -0,0 +1,175 @@
+from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from rate_limit import wait_for_slot
+from page_readiness import wait_for_presence
+from http_session import REQUEST_TIMEOUT
+from keyword_matcher import JOB_KEYWORDS, DEFAULT_MATCHER
+from state_store import get_store
+from dedup import job_key
+from metrics import METRICS
+import html_parsers
+import os, time, threading
+
+load_dotenv()
+# Filtered searches also read the description of cards whose title/company/insight has no keyword
+JOB_DETAILS_ENRICHMENT = os.getenv('JOB_DETAILS_ENRICHMENT', 'False').lower() == 'true'
+# Detail pages loaded at once per search: browser tabs, or concurrent requests without a browser
+JOB_DETAILS_TABS = max(1, int(os.getenv('JOB_DETAILS_TABS', 4)))
+# Descriptions are cached by job ID for this long, so a job seen by several searches or cycles is loaded once
+JOB_DESCRIPTION_TTL_HOURS = float(os.getenv('JOB_DESCRIPTION_TTL_HOURS', 72))
+
+# How long to wait for another search thread that is already loading the same job
+INFLIGHT_WAIT_SECONDS = 120
+
+_inflight = {}  # job key -> Event, set once the thread loading it has cached the result
+_inflight_lock = threading.Lock()
+
+
+def worth_describing(link, excluded_found, store=None):
+    """
+    Cheap prefilter for a card that failed the keyword check on its own text: its detail page is
+    only loaded when no excluded keyword was on the card and the job hasn't been posted already.
+    """
+    if not link or excluded_found or not JOB_KEYWORDS:
+        return False
+    return not (store or get_store()).is_posted(link)
+
+
+def describe(links, fetch, store=None):
+    """
+    {link: description} for `links`. Cached descriptions younger than JOB_DESCRIPTION_TTL_HOURS
+    are used as they are, jobs another thread is loading right now are waited for, and
+    `fetch(links) -> {link: description}` loads the rest.
+    """
+    store = store or get_store()
+    keys = {link: job_key(link) for link in links}
+    fresh_after = time.time() - JOB_DESCRIPTION_TTL_HOURS * 3600
+    found = store.get_descriptions(set(keys.values()), fresh_after)
+    METRICS.inc("description_cache_hits_total", sum(1 for key in keys.values() if key in found))
+
+    mine, waiting = {}, {}  # job key -> link to load / Event of the thread loading it
+    with _inflight_lock:
+        for link, key in keys.items():
+            if key in found or key in mine or key in waiting:
+                continue
+            if key in _inflight:
+                waiting[key] = _inflight[key]
+            else:
+                _inflight[key] = threading.Event()
+                mine[key] = link
+
+    try:
+        fetched = fetch(list(mine.values())) if mine else {}
+        loaded = {job_key(link): description for link, description in fetched.items() if description}
+        if loaded:
+            store.set_descriptions(loaded)
+        found.update(loaded)
+    finally:
+        with _inflight_lock:
+            for key in mine:
+                _inflight.pop(key).set()
+
+    if waiting:
+        for event in waiting.values():
+            event.wait(INFLIGHT_WAIT_SECONDS)
+        found.update(store.get_descriptions(waiting, fresh_after))
+    return {link: found[key] for link, key in keys.items() if key in found}
+
+
+def match_descriptions(links, fetch, show_details=False):
+    """
+    The links whose description contains a JOB_KEYWORDS keyword. Excluded keywords are only
+    checked on the card: descriptions mention plenty of terms that aren't about the role itself.
+    """
+    descriptions = describe(links, fetch)
+    matched = set()
+    for link in links:
+        included, _ = DEFAULT_MATCHER.match(descriptions.get(link, ""))
+        if included:
+            matched.add(link)
+        if show_details:
+            if link not in descriptions:
+                print(f"    - ✗ No description for {link}")
+            elif included:
+                print(f"    - ✓ Description keywords found: {', '.join(included)} ({link})")
+            else:
+                print(f"    - No matching keywords in the description ({link})")
+    return matched
+
+
+def fetch_in_tabs(driver, links, site, tabs=JOB_DETAILS_TABS):
+    """
+    Load detail pages in up to `tabs` extra tabs of `driver` at a time. Chrome loads a batch
+    in parallel while the tabs are read one by one; the scraper's own tab is left untouched.
+    Returns {link: description}.
+    """
+    from selenium.common.exceptions import WebDriverException
+    selector = ", ".join(html_parsers.DESCRIPTION_SELECTORS[site])
+    home = driver.current_window_handle
+    descriptions = {}
+    mine = set()  # tabs opened here; prefetched result pages in other tabs are left alone
+    try:
+        for i in range(0, len(links), tabs):
+            opened = []
+            for link in links[i:i + tabs]:
+                wait_for_slot(link)
+                before = set(driver.window_handles)
+                driver.execute_script("window.open(arguments[0], '_blank');", link)
+                handles = set(driver.window_handles) - before
+                if handles:
+                    handle = handles.pop()
+                    mine.add(handle)
+                    opened.append((link, handle, time.monotonic()))
+            for link, handle, started in opened:
+                driver.switch_to.window(handle)
+                wait_for_presence(driver, selector)
+                METRICS.observe("detail_load_seconds", time.monotonic() - started, site=site)
+                METRICS.inc("detail_pages_total", site=site)
+                description = html_parsers.parse_job_description(driver.page_source, site)
+                driver.close()
+                mine.discard(handle)
+                if description:
+                    descriptions[link] = description
+    except WebDriverException as e:
+        print(f"    ⚠️  Loading job details in tabs failed: {e}")
+    finally:
+        try:
+            for handle in mine & set(driver.window_handles):
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(home)
+        except WebDriverException:
+            pass  # the pool replaces a driver that is this broken
+    return descriptions
+
+
+def fetch_over_http(links, site, session, url_for=None, workers=JOB_DETAILS_TABS):
+    """Load detail pages with up to `workers` concurrent requests. Returns {link: description}."""
+    def fetch_one(link):
+        url = url_for(link) if url_for else link
+        wait_for_slot(url)
+        try:
+            with METRICS.timed("detail_load_seconds", site=site):
+                response = session.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"    ⚠️  Could not load job details from {url}: {e}")
+            return link, None
+        METRICS.inc("detail_pages_total", site=site)
+        return link, html_parsers.parse_job_description(response.text, site)
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(links))) as executor:
+        return {link: description for link, description in executor.map(fetch_one, links) if description}
+
+
+def tab_fetcher(driver, site, check_keywords):
+    """fetch(links) loading detail pages in tabs of `driver`, or None when descriptions aren't needed."""
+    if not (JOB_DETAILS_ENRICHMENT and check_keywords):
+        return None
+    return lambda links: fetch_in_tabs(driver, links, site)
+
+def http_fetcher(site, check_keywords, session, url_for=None):
+    """fetch(links) loading detail pages over `session`, or None when descriptions aren't needed."""
+    if not (JOB_DETAILS_ENRICHMENT and check_keywords):
+        return None
+    return lambda links: fetch_over_http(links, site, session, url_for=url_for)
@@ -0,0 +1,113 @@
+from dotenv import load_dotenv
+import os, re
+
+load_dotenv()
+
+def load_keywords_from_env(env_var_name):
+    """Loads keywords from a multi-line .env variable."""
+    keywords_str = os.getenv(env_var_name, '')
+    if not keywords_str:
+        return []
+    # Split by newline, strip whitespace, and filter out empty lines
+    return [line.strip() for line in keywords_str.strip().splitlines() if line.strip()]
+
+JOB_KEYWORDS = load_keywords_from_env('JOB_KEYWORDS')
+EXCLUDED_KEYWORDS = load_keywords_from_env('EXCLUDED_KEYWORDS')
+# When true, a keyword only matches as a whole word ("java" no longer matches "javascript")
+KEYWORD_WHOLE_WORDS = os.getenv('KEYWORD_WHOLE_WORDS', 'False').lower() == 'true'
+
+
+def _trie_pattern(terms):
+    """
+    Build a regex that matches any of `terms`, factored into a prefix tree so the engine
+    walks each position once instead of trying every keyword in turn. Being greedy, it
+    matches the longest term starting at a position.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds included and excluded keywords in one pass over the text.
+
+    Matching is case-insensitive. All keywords are compiled into a single prefix-tree
+    regex; at each position the longest keyword is matched, and the shorter keywords
+    that are prefixes of it are credited too, so no overlapping keyword is missed.
+    """
+
+    def __init__(self, include, exclude, whole_words=False):
+        self.include, self.exclude = {}, {}  # lowercased -> keyword as configured
+        for keyword in include:
+            self.include.setdefault(keyword.lower(), keyword)
+        for keyword in exclude:
+            self.exclude.setdefault(keyword.lower(), keyword)
+        self.whole_words = whole_words
+
+        terms = set(self.include) | set(self.exclude)
+        # Every term that is found whenever `term` is the longest match at a position
+        self._found_with = {term: [term[:i] for i in range(1, len(term) + 1) if term[:i] in terms] for term in terms}
+        self._order = {term: i for i, term in enumerate(list(self.include) + list(self.exclude))}
+        self._pattern = re.compile("(?=(" + _trie_pattern(terms) + "))") if terms else None
+
+    @staticmethod
+    def _is_word_char(char):
+        return char.isalnum() or char == "_"
+
+    def _bounded(self, text, start, term):
+        """True if `term` at `start` isn't glued to surrounding letters/digits."""
+        end = start + len(term)
+        if self._is_word_char(term[0]) and start > 0 and self._is_word_char(text[start - 1]):
+            return False
+        if self._is_word_char(term[-1]) and end < len(text) and self._is_word_char(text[end]):
+            return False
+        return True
+
+    def find(self, text):
+        """Return the set of lowercased keywords that occur in `text`."""
+        found = set()
+        if not text or self._pattern is None:
+            return found
+        text_lower = text.lower()
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for term in self._found_with[match.group(1)]:
+                if term not in found and (not self.whole_words or self._bounded(text_lower, start, term)):
+                    found.add(term)
+        return found
+
+    def match(self, text):
+        """Return (included, excluded): the configured keywords found in `text`, in configuration order."""
+        found = sorted(self.find(text), key=self._order.get)
+        included = [self.include[term] for term in found if term in self.include]
+        excluded = [self.exclude[term] for term in found if term in self.exclude]
+        return included, excluded
+
+    def check(self, text, return_details=False):
+        """True if `text` contains any included keyword and no excluded keyword."""
+        included, excluded = self.match(text)
+        has_keywords = bool(included) and not excluded
+        if return_details:
+            return (has_keywords, included, excluded)
+        return has_keywords
+
+
+# Built once per process from JOB_KEYWORDS / EXCLUDED_KEYWORDS and shared by both scrapers
+DEFAULT_MATCHER = KeywordMatcher(JOB_KEYWORDS, EXCLUDED_KEYWORDS, whole_words=KEYWORD_WHOLE_WORDS)
+
+def check_keywords_in_text(text, return_details=False):
+    """Check if text contains any JOB_KEYWORDS and none of the EXCLUDED_KEYWORDS."""
+    return DEFAULT_MATCHER.check(text, return_details=return_details)
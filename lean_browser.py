@@ -0,0 +1,88 @@
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+# Lean mode: block images, fonts, media and trackers, and return from driver.get at DOMContentLoaded
+BROWSER_LEAN_MODE = os.getenv('BROWSER_LEAN_MODE', 'False').lower() == 'true'
+
+# Requests Chrome drops in lean mode. Cards are read from the HTML, and a logo's URL is
+# still in its <img src> attribute when the image itself is never downloaded.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*media.licdn.com/dms/image/*", "*static.licdn.com/aero-v1/sc/h/*.svg",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*connect.facebook.net*",
+    "*hotjar.com*", "*clarity.ms*", "*px.ads.linkedin.com*", "*snap.licdn.com*", "*linkedin.com/li/track*",
+]
+
+# Chrome features a scraper never uses
+DISABLED_FEATURES = "Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,InterestFeedContentSuggestions"
+# Images are turned off by the content setting in apply_lean_options
+LEAN_ARGUMENTS = [
+    f"--disable-features={DISABLED_FEATURES}",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+# Keep resource timings for every request of a page, not just the first 250
+TRACK_RESOURCES_SCRIPT = "performance.setResourceTimingBufferSize(5000);"
+
+PAGE_WEIGHT_SCRIPT = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+const size = (entry) => entry.transferSize || entry.encodedBodySize || 0;
+return [nav ? nav.domContentLoadedEventEnd / 1000 : null,
+        (nav ? size(nav) : 0) + resources.reduce((total, entry) => total + size(entry), 0),
+        resources.length];
+"""
+
+
+def apply_lean_options(options):
+    """Add lean mode's Chrome options: eager page loads, no images and fewer background features."""
+    options.page_load_strategy = "eager"
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+
+def prepare_driver(driver, lean=BROWSER_LEAN_MODE):
+    """Set up page weight tracking on a new driver and, in lean mode, CDP request blocking."""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": TRACK_RESOURCES_SCRIPT})
+        if lean:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️  Could not set up request blocking ({e}), pages load in full")
+    return driver
+
+
+class PageWeight:
+    """Load time and downloaded bytes of the page a driver is on, from the Resource Timing API."""
+
+    def __init__(self, load_seconds, bytes_, requests):
+        self.load_seconds = load_seconds
+        self.bytes = bytes_
+        self.requests = requests
+
+    @classmethod
+    def measure(cls, driver):
+        try:
+            load_seconds, bytes_, requests = driver.execute_script(PAGE_WEIGHT_SCRIPT)
+        except Exception:
+            return None
+        return cls(load_seconds, int(bytes_ or 0), int(requests or 0))
+
+    def summary(self):
+        # Cross-origin responses without Timing-Allow-Origin report no size, so this is a lower bound
+        load = f" in {self.load_seconds:.1f}s" if self.load_seconds is not None else ""
+        mode = ", lean" if BROWSER_LEAN_MODE else ""
+        return f"{self.bytes / 1024:.0f} KB over {self.requests} requests{load}{mode}"
@@ -0,0 +1,143 @@
+from dotenv import load_dotenv
+from urllib.parse import urlparse, parse_qs, urlencode
+from http_session import create_session, REQUEST_TIMEOUT
+from rate_limit import wait_for_slot
+from metrics import mark_startup
+import page_archive
+import html_parsers
+import os, sys, re, json, time, threading
+
+load_dotenv()
+# "http" reads LinkedIn search results with the saved session cookies instead of a browser
+LINKEDIN_FETCH_MODE = os.getenv('LINKEDIN_FETCH_MODE', 'browser').lower()
+LINKEDIN_COOKIES_FILE = os.getenv('LINKEDIN_COOKIES_FILE') or os.path.join(sys.path[0], 'linkedin_cookies.json')
+# Point this at a local stub server to replay recorded responses
+LINKEDIN_HTTP_BASE_URL = os.getenv('LINKEDIN_HTTP_BASE_URL', 'https://www.linkedin.com').rstrip('/')
+SEARCH_ENDPOINT = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+JOB_POSTING_ENDPOINT = "/jobs-guest/jobs/api/jobPosting/"
+
+# Signs that LinkedIn wants a login or is throttling us rather than serving results
+AUTHWALL_MARKERS = ("authwall", "/login", "checkpoint", "uas/login")
+BLOCKED_STATUS_CODES = (401, 403, 429, 999)
+# After a failed cookie export, searches go straight to the browser for this long before it is tried again
+COOKIE_EXPORT_RETRY_SECONDS = 3600
+
+
+class LinkedInHTTPUnavailable(Exception):
+    """Raised when the driverless mode can't be used and the browser should take over."""
+
+
+def save_cookies(cookies, path=LINKEDIN_COOKIES_FILE):
+    """Persist cookies as returned by Selenium's driver.get_cookies()."""
+    with open(path, 'w') as f:
+        json.dump(cookies, f, indent=4)
+
+def load_cookies(path=LINKEDIN_COOKIES_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def export_session_cookies(driver, path=LINKEDIN_COOKIES_FILE):
+    """Read the logged-in session out of a browser running on SELENIUM_USER_DATA_DIR and save it."""
+    driver.get("https://www.linkedin.com/feed/")
+    cookies = driver.get_cookies()
+    if not any(cookie["name"] == "li_at" for cookie in cookies):
+        raise LinkedInHTTPUnavailable("Browser profile has no LinkedIn session cookie (li_at)")
+    save_cookies(cookies, path)
+    print(f"  ✓ Exported {len(cookies)} LinkedIn session cookies to {path}")
+    return cookies
+
+
+_session = None
+_session_lock = threading.Lock()
+_export_failure = None  # (time.monotonic() of the last failed export, reason)
+
+def remember_export_failure(reason):
+    global _export_failure
+    with _session_lock:
+        _export_failure = (time.monotonic(), str(reason))
+
+def check_export_cooldown():
+    """Raise LinkedInHTTPUnavailable while a failed cookie export is too recent to try again."""
+    with _session_lock:
+        if _export_failure is None:
+            return
+        failed_at, reason = _export_failure
+    remaining = COOKIE_EXPORT_RETRY_SECONDS - (time.monotonic() - failed_at)
+    if remaining > 0:
+        raise LinkedInHTTPUnavailable(f"Cookie export failed ({reason}), trying again in {remaining / 60:.0f} min")
+
+def get_session():
+    """Shared keep-alive session carrying the exported LinkedIn cookies."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            cookies = load_cookies()
+            if not cookies:
+                raise LinkedInHTTPUnavailable(f"No exported LinkedIn cookies at {LINKEDIN_COOKIES_FILE}")
+            session = create_session()
+            for cookie in cookies:
+                session.cookies.set(cookie["name"], cookie["value"])
+                if cookie["name"] == "JSESSIONID":
+                    session.headers["csrf-token"] = cookie["value"].strip('"')
+            _session = session
+        return _session
+
+def reset_session():
+    """Drop the cached session, e.g. after cookies were exported again."""
+    global _session
+    with _session_lock:
+        _session = None
+
+
+def search_page_url(url, start):
+    """Map a /jobs/search/ URL onto the results endpoint, keeping its filters and paging with `start`."""
+    query_params = parse_qs(urlparse(url).query)
+    query_params['start'] = [start]
+    return f"{LINKEDIN_HTTP_BASE_URL}{SEARCH_ENDPOINT}?{urlencode(query_params, doseq=True)}"
+
+def job_posting_url(link):
+    """Detail endpoint of a /jobs/view/<id>/ link: the job's description without the page around it."""
+    match = re.search(r"/jobs/view/(?:[^/?#]*-)?(\d+)", link)
+    return f"{LINKEDIN_HTTP_BASE_URL}{JOB_POSTING_ENDPOINT}{match.group(1)}" if match else link
+
+def fetch_search_page(url, start):
+    """
+    Fetch one page of results as job card dicts (see html_parsers.parse_linkedin_cards).
+    An empty list means the results ran out; LinkedInHTTPUnavailable means fall back to the browser.
+    """
+    page_url = search_page_url(url, start)
+    wait_for_slot(page_url)
+    try:
+        response = get_session().get(page_url, timeout=REQUEST_TIMEOUT)
+    except Exception as e:
+        raise LinkedInHTTPUnavailable(f"Request failed: {e}")
+
+    if response.status_code in BLOCKED_STATUS_CODES or any(marker in response.url.lower() for marker in AUTHWALL_MARKERS):
+        raise LinkedInHTTPUnavailable(f"Hit the authwall (HTTP {response.status_code} at {response.url})")
+    if response.status_code >= 400:
+        raise LinkedInHTTPUnavailable(f"HTTP {response.status_code}")
+
+    mark_startup("first_page")
+    html = response.text
+    if not html.strip():
+        return []
+    cards = html_parsers.parse_linkedin_guest_cards(html, base_url=LINKEDIN_HTTP_BASE_URL)
+    page_archive.record("linkedin_guest", html, source=url, url=page_url, cards=len(cards))
+    if not cards:
+        # A non-empty body without any recognisable card means the markup changed
+        raise LinkedInHTTPUnavailable("Response had no recognisable job cards (markup changed?)")
+    return cards
+
+
+if __name__ == '__main__':
+    # Usage: python linkedin_http.py --export-cookies
+    if "--export-cookies" in sys.argv:
+        import scraper
+        driver = scraper.init_driver()
+        try:
+            export_session_cookies(driver)
+        finally:
+            driver.quit()
@@ -1,8 +1,7 @@
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
+from chromedriver_cache import start_chrome
+import linkedin_http
 import os
 
 load_dotenv()
@@ -10,8 +9,11 @@ SELENIUM_USER_DATA_DIR = os.getenv('SELENIUM_USER_DATA_DIR')
 
 options = Options()
 options.add_argument(f"user-data-dir={SELENIUM_USER_DATA_DIR}")
-driver = webdriver.Chrome(options=options, service=ChromeService(executable_path=ChromeDriverManager().install()))
+driver = start_chrome(options)
 
 driver.get("https://www.linkedin.com/login")
 input("Press enter when done")
+
+# Saved for LINKEDIN_FETCH_MODE=http, which reads search results without a browser
+linkedin_http.save_cookies(driver.get_cookies())
 driver.quit()
\ No newline at end of file
@@ -0,0 +1,163 @@
+from dotenv import load_dotenv
+from metrics import METRICS
+from chromedriver_cache import BROWSER_MARKER
+from driver_pool import PROFILE_CLONE_PREFIX
+import os, tempfile, threading
+import psutil
+
+load_dotenv()
+# A browser whose chromedriver + Chrome processes use more than this is restarted between pages
+DRIVER_MAX_RSS_MB = float(os.getenv('DRIVER_MAX_RSS_MB', 1500))
+WATCHDOG_INTERVAL_SECONDS = float(os.getenv('WATCHDOG_INTERVAL_SECONDS', 15))
+
+CHROMEDRIVER_NAMES = ("chromedriver", "chromedriver.exe")
+CHROME_NAMES = ("chrome", "chrome.exe", "chromium", "chromium-browser", "google-chrome", "headless_shell")
+
+
+def driver_processes(driver):
+    """The chromedriver process behind a Selenium driver and everything it started (Chrome and its renderers)."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return []
+    try:
+        root = psutil.Process(process.pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+def driver_rss(driver):
+    """Resident memory of a driver's whole process tree, in bytes."""
+    total = 0
+    for process in driver_processes(driver):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass  # a renderer exited while we were counting
+    return total
+
+
+class MemoryWatchdog:
+    """
+    Samples the RSS of every browser in a DriverPool from a background thread.
+
+    The totals go to the browser_rss_bytes gauge. A driver over DRIVER_MAX_RSS_MB is flagged
+    in the pool, which restarts it at the next page boundary or when it is returned, so the
+    scraping thread that owns it never has its browser pulled away mid-page.
+    """
+
+    def __init__(self, pool, max_rss_mb=DRIVER_MAX_RSS_MB, interval=WATCHDOG_INTERVAL_SECONDS):
+        self.pool = pool
+        self.max_rss = max_rss_mb * 2**20
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name="memory-watchdog", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.pool.closed:
+                return
+            self.sample()
+
+    def sample(self):
+        """Measure every live driver once, flagging the ones over the limit. Returns {kind: bytes}."""
+        by_kind = {}
+        for kind, driver in self.pool.live_drivers():
+            rss = driver_rss(driver)
+            by_kind[kind] = by_kind.get(kind, 0) + rss
+            if rss > self.max_rss:
+                self.pool.flag(driver, "memory", f"using {rss / 2**20:.0f} MB, over DRIVER_MAX_RSS_MB={self.max_rss / 2**20:.0f}")
+        for kind, rss in by_kind.items():
+            METRICS.set("browser_rss_bytes", rss, kind=kind)
+        return by_kind
+
+
+# What a process is re-parented to once the process that started it has died
+ORPHAN_PARENTS = ("systemd", "init", "launchd")
+
+def _is_orphaned(process):
+    """True if the process that started this one is gone."""
+    try:
+        parent = process.parent()
+        if parent is None:
+            return True
+        return parent.pid != os.getpid() and (parent.pid == 1 or parent.name().lower() in ORPHAN_PARENTS)
+    except psutil.Error:
+        return True
+
+def _current_user():
+    try:
+        return psutil.Process().username()
+    except psutil.Error:
+        return None
+
+def _profile_dir(cmdline):
+    for arg in cmdline:
+        if arg.startswith("--user-data-dir="):
+            return os.path.normcase(os.path.abspath(arg.split("=", 1)[1]))
+    return None
+
+def _is_our_chrome(cmdline):
+    """
+    True for the main process of a browser the bot started: it carries BROWSER_MARKER, or runs on
+    SELENIUM_USER_DATA_DIR or one of its temporary clones (browsers from before the marker existed).
+    """
+    if "--enable-automation" not in cmdline or any(arg.startswith("--type=") for arg in cmdline):
+        return False  # a normal browser window, or a renderer/helper that goes down with its browser
+    if BROWSER_MARKER in cmdline:
+        return True
+    profile = _profile_dir(cmdline)
+    if not profile:
+        return False
+    user_data_dir = os.getenv('SELENIUM_USER_DATA_DIR')
+    if user_data_dir and profile == os.path.normcase(os.path.abspath(user_data_dir)):
+        return True
+    return (os.path.dirname(profile) == os.path.normcase(os.path.abspath(tempfile.gettempdir()))
+            and os.path.basename(profile).startswith(os.path.normcase(PROFILE_CLONE_PREFIX)))
+
+def kill_orphaned_browsers():
+    """
+    Kill chromedriver and Chrome processes left behind by an earlier run of the bot that crashed.
+    Only processes of the user running the bot are considered, only Chrome the bot started (see
+    _is_our_chrome) and the chromedriver above it, and only when the process that started them
+    is gone, so other projects' automated browsers and normal browser windows are left alone.
+    Returns the number of processes killed.
+    """
+    user = _current_user()
+    if user is None:
+        return 0
+    victims = {}
+    for process in psutil.process_iter(["name", "cmdline", "username"]):
+        try:
+            name = (process.info["name"] or "").lower()
+            if name not in CHROME_NAMES or process.info["username"] != user:
+                continue
+            if not _is_our_chrome(process.info["cmdline"] or []):
+                continue
+            parent = process.parent()
+            if parent is not None and (parent.name() or "").lower() in CHROMEDRIVER_NAMES:
+                if _is_orphaned(parent):
+                    victims[parent.pid] = parent  # Chrome goes down with its chromedriver
+            elif _is_orphaned(process):
+                victims[process.pid] = process  # the browser's main process; renderers and helpers go down with it
+        except psutil.Error:
+            continue
+
+    killed = 0
+    for process in victims.values():
+        try:
+            for child in process.children(recursive=True):
+                child.kill()
+                killed += 1
+            process.kill()
+            killed += 1
+        except psutil.Error:
+            pass
+    if killed:
+        print(f"🧹 Killed {killed} leftover browser process(es) from an earlier run")
+    return killed
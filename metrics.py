@@ -0,0 +1,257 @@
+from dotenv import load_dotenv
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os, time, bisect, threading
+
+load_dotenv()
+# Local Prometheus endpoint (http://METRICS_HOST:METRICS_PORT/metrics); 0 disables it
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 9108))
+
+# Seconds; covers everything from parsing one page to a full search URL
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+HELP = {
+    "driver_start_seconds": "Time to start a Chrome driver",
+    "page_load_seconds": "Time spent in driver.get / the HTTP request for one results page",
+    "page_ready_seconds": "Time spent waiting for a page to be ready, per readiness condition",
+    "scroll_seconds": "Time spent in the LinkedIn scroll loop for one page",
+    "card_parse_seconds": "Time to snapshot and parse the job cards of one page",
+    "search_seconds": "Time to scrape one search URL",
+    "discord_send_seconds": "Time for one Discord API send",
+    "cycle_seconds": "Time for one scrape-and-post round",
+    "pages_scraped_total": "Results pages scraped",
+    "page_bytes_total": "Bytes downloaded by the browser for results pages (Resource Timing, a lower bound)",
+    "cards_parsed_total": "Job cards parsed",
+    "jobs_posted_total": "Jobs posted to Discord",
+    "discord_send_failures_total": "Discord sends that failed",
+    "posted_links": "Job links remembered as posted, within POSTED_JOBS_EXPIRATION_PERIOD_HOURS",
+    "browser_rss_bytes": "Resident memory of the chromedriver + Chrome process trees, per driver kind",
+    "browser_restarts_total": "Browsers restarted by the pool, by reason",
+    "detail_load_seconds": "Time to load one job detail page for description keywords",
+    "detail_pages_total": "Job detail pages loaded for description keywords",
+    "description_cache_hits_total": "Job descriptions served from the on-disk cache instead of loaded",
+    "prefetched_pages_total": "LinkedIn results pages loaded ahead in tabs, by whether the crawl used them or cancelled them",
+    "startup_seconds": "Seconds from process start to each startup milestone (imports, on_ready, first_page)",
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation."""
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+
+class Registry:
+    """
+    Thread-safe counters and histograms keyed by metric name and labels. Scraper threads
+    record into it directly; it renders as Prometheus text or as a short summary.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}    # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.gauges = {}      # (name, labels) -> last value
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.gauges[key] = value
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed(self, name, **labels):
+        """Observe how long the with-block took, whether or not it raised."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start, **labels)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+                for (metric, labels), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+            for name in sorted({name for name, _ in self.gauges}):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} gauge"]
+                for (metric, labels), value in sorted(self.gauges.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+            for name in sorted({name for name, _ in self.histograms}):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+                for (metric, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def totals(self, name, by=None):
+        """Merge a histogram over all labels except `by`: {label value: (count, sum, max, p95)}."""
+        merged = {}
+        with self.lock:
+            for (metric, labels), histogram in self.histograms.items():
+                if metric != name:
+                    continue
+                group = dict(labels).get(by, "") if by else ""
+                total = merged.setdefault(group, Histogram(histogram.buckets))
+                total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+                total.sum += histogram.sum
+                total.count += histogram.count
+                total.max = max(total.max, histogram.max)
+        return {group: (h.count, h.sum, h.max, h.quantile(0.95)) for group, h in merged.items()}
+
+    def counter_total(self, name):
+        with self.lock:
+            return sum(value for (metric, _), value in self.counters.items() if metric == name)
+
+    def summary(self, top=5):
+        """Short text for the !stats command: time per phase, then the slowest search URLs."""
+        lines = ["**Time per phase** (count, total, avg, p95, max):"]
+        for name in ("cycle_seconds", "search_seconds", "driver_start_seconds", "page_load_seconds",
+                     "page_ready_seconds", "scroll_seconds", "card_parse_seconds", "discord_send_seconds"):
+            stats = self.totals(name).get("")
+            if stats and stats[0]:
+                count, total, maximum, p95 = stats
+                lines.append(f"- {name.replace('_seconds', '')}: {count}x, {total:.1f}s, "
+                             f"{total / count:.2f}s, ≤{p95}s, {maximum:.1f}s")
+
+        searches = sorted(self.totals("search_seconds", by="source").items(), key=lambda item: -item[1][1])
+        if searches:
+            lines.append(f"**Slowest search URLs** (total, avg):")
+            for source, (count, total, _, _) in searches[:top]:
+                lines.append(f"- {source[:80]}: {total:.1f}s, {total / count:.1f}s")
+
+        lines.append(f"**Counters:** {self.counter_total('pages_scraped_total')} pages "
+                     f"({self.counter_total('page_bytes_total') / 2**20:.1f} MB in the browser), "
+                     f"{self.counter_total('cards_parsed_total')} cards, "
+                     f"{self.counter_total('detail_pages_total')} detail pages "
+                     f"(+{self.counter_total('description_cache_hits_total')} cached), "
+                     f"{self.counter_total('jobs_posted_total')} jobs posted, "
+                     f"{self.counter_total('discord_send_failures_total')} failed sends, "
+                     f"{self.counter_total('browser_restarts_total')} browser restarts")
+        with self.lock:
+            remembered = self.gauges.get(("posted_links", ()))
+        if remembered is not None:
+            lines.append(f"**History:** {remembered:.0f} posted job links remembered")
+        with self.lock:
+            browsers = {dict(labels).get("kind"): value for (metric, labels), value in self.gauges.items() if metric == "browser_rss_bytes"}
+        if browsers:
+            lines.append("**Browser memory:** " + ", ".join(f"{kind} {rss / 2**20:.0f} MB" for kind, rss in sorted(browsers.items())))
+        with self.lock:
+            startup = sorted((value, dict(labels).get("milestone")) for (metric, labels), value in self.gauges.items() if metric == "startup_seconds")
+        if startup:
+            lines.append("**Startup:** " + ", ".join(f"{milestone} at {seconds:.1f}s" for seconds, milestone in startup))
+        return "\n".join(lines)
+
+
+METRICS = Registry()
+
+def _process_start():
+    try:
+        import psutil
+        return psutil.Process().create_time()
+    except Exception:
+        return None  # fall back to when metrics was imported
+
+_PROCESS_START = _process_start() or time.time()
+_startup_marked = set()
+
+def mark_startup(milestone):
+    """Record how long after process start `milestone` was first reached; later calls are ignored."""
+    with METRICS.lock:
+        if milestone in _startup_marked:
+            return
+        _startup_marked.add(milestone)
+    seconds = time.time() - _PROCESS_START
+    METRICS.set("startup_seconds", round(seconds, 3), milestone=milestone)
+    print(f"⏱️  Startup: {milestone} after {seconds:.2f}s")
+
+def observe_readiness(report, **labels):
+    """Record each condition a page_readiness.ReadinessReport waited on."""
+    for condition, (seconds, _) in report.waits.items():
+        METRICS.observe("page_ready_seconds", seconds, condition=condition, **labels)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # keep scrapes of the endpoint out of the bot's output
+
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """Serve /metrics from a daemon thread. Returns the server, or None if disabled or the port is taken."""
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        print(f"⚠️  Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(f"✓ Metrics at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,234 @@
+"""
+Record-and-replay archive of scraped results pages.
+
+With PAGE_ARCHIVE_DIR set, every results page the scrapers parse is appended to a gzip file
+per day (one gzip member per page, so the file is only ever appended to), and each scraping
+cycle gets an index in cycles/<cycle>.jsonl: one line per page with its site, search URL, page
+URL, card count and where its member sits in the day file. Replaying runs the card parsers over
+the archived pages without a browser or network, e.g. to check new selectors after a markup change.
+
+Usage (from the repository root):
+    python page_archive.py cycles
+    python page_archive.py replay [--cycle 20261017-091500 ...] [--site wuzzuf] [--workers 4] [--changed]
+    python page_archive.py show <cycle> <page number>   # writes the page's HTML to stdout
+"""
+from dotenv import load_dotenv
+from concurrent.futures import ProcessPoolExecutor
+import html_parsers
+import os, sys, json, gzip, time, datetime, threading, argparse
+
+load_dotenv()
+# Directory of the archive; recording is off while this is empty
+PAGE_ARCHIVE_DIR = os.getenv('PAGE_ARCHIVE_DIR', '')
+# Day files and cycle indexes older than this are deleted when a cycle starts (0 keeps everything)
+PAGE_ARCHIVE_KEEP_DAYS = float(os.getenv('PAGE_ARCHIVE_KEEP_DAYS', 14))
+
+# The parser each recorded page goes through, by the `parser` field of its index entry
+PARSERS = {
+    "linkedin": html_parsers.parse_linkedin_cards,  # the browser's card snapshot
+    "linkedin_page": html_parsers.parse_linkedin_cards,  # the whole page around it
+    "linkedin_guest": html_parsers.parse_linkedin_guest_cards,
+    "wuzzuf": html_parsers.parse_wuzzuf_cards,
+}
+CARD_FIELDS = ("company", "title", "link")
+
+
+class PageArchive:
+    """Appends pages to the archive in `directory`. Safe to share between scraper threads."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.cycles_dir = os.path.join(directory, "cycles")
+        os.makedirs(self.cycles_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.cycle = None
+        self.count = 0
+
+    def start_cycle(self):
+        """Begin a new cycle index and drop the parts of the archive past PAGE_ARCHIVE_KEEP_DAYS."""
+        with self.lock:
+            self.cycle = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+            self.count = 0
+        self.prune()
+        return self.cycle
+
+    def record(self, parser, html, source, url, page=None, cards=None):
+        """Append one page and its index entry."""
+        data = gzip.compress(html.encode("utf-8"), compresslevel=6)
+        now = time.time()
+        day_file = f"pages-{datetime.date.fromtimestamp(now).isoformat()}.gz"
+        with self.lock:
+            if self.cycle is None:
+                self.cycle = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+            with open(os.path.join(self.directory, day_file), "ab") as f:
+                offset = f.tell()
+                f.write(data)
+            self.count += 1
+            entry = {"n": self.count, "file": day_file, "offset": offset, "length": len(data),
+                     "parser": parser, "source": source, "url": url, "page": page,
+                     "cards": cards, "bytes": len(html), "recorded_at": round(now, 3)}
+            with open(os.path.join(self.cycles_dir, f"{self.cycle}.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def prune(self, keep_days=PAGE_ARCHIVE_KEEP_DAYS):
+        if not keep_days:
+            return
+        cutoff = time.time() - keep_days * 86400
+        for folder in (self.directory, self.cycles_dir):
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if os.path.isfile(path) and name.endswith((".gz", ".jsonl")) and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_archive():
+    """Process-wide archive in PAGE_ARCHIVE_DIR, or None when recording is off."""
+    global _archive
+    if not PAGE_ARCHIVE_DIR:
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive(PAGE_ARCHIVE_DIR)
+        return _archive
+
+def start_cycle():
+    archive = get_archive()
+    if archive:
+        archive.start_cycle()
+
+def record(parser, html, source, url, page=None, cards=None):
+    """Archive a results page if PAGE_ARCHIVE_DIR is set. Never lets a recording problem break a scrape."""
+    archive = get_archive()
+    if archive is None:
+        return
+    try:
+        archive.record(parser, html, source, url, page=page, cards=cards)
+    except OSError as e:
+        print(f"⚠️  Could not archive {url}: {e}")
+
+
+# --- Replay ---
+
+def read_index(directory, cycles=None):
+    """[(cycle, entry)] for the given cycles (all of them by default), oldest first."""
+    cycles_dir = os.path.join(directory, "cycles")
+    names = sorted(name[:-len(".jsonl")] for name in os.listdir(cycles_dir) if name.endswith(".jsonl"))
+    entries = []
+    for cycle in names:
+        if cycles and cycle not in cycles:
+            continue
+        with open(os.path.join(cycles_dir, f"{cycle}.jsonl"), encoding="utf-8") as f:
+            entries += [(cycle, json.loads(line)) for line in f if line.strip()]
+    return entries
+
+def read_page(directory, entry, handle=None):
+    """The HTML of one archived page. Pass an open handle of its day file to avoid reopening it."""
+    if handle is None:
+        with open(os.path.join(directory, entry["file"]), "rb") as f:
+            return read_page(directory, entry, f)
+    handle.seek(entry["offset"])
+    return gzip.decompress(handle.read(entry["length"])).decode("utf-8")
+
+def replay_entries(directory, entries):
+    """Run each page's parser again. Returns [(cycle, n, cards now, cards missing a field, error)]."""
+    results, handles = [], {}
+    try:
+        for cycle, entry in entries:
+            try:
+                handle = handles.get(entry["file"])
+                if handle is None:
+                    handle = handles[entry["file"]] = open(os.path.join(directory, entry["file"]), "rb")
+                cards = PARSERS[entry["parser"]](read_page(directory, entry, handle))
+                incomplete = sum(1 for card in cards if not all(card.get(field) for field in CARD_FIELDS))
+                results.append((cycle, entry["n"], len(cards), incomplete, None))
+            except Exception as e:
+                results.append((cycle, entry["n"], 0, 0, str(e)))
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return results
+
+def replay(directory, cycles=None, site=None, workers=None):
+    """
+    Parse every selected page again, split over `workers` processes (all cores by default).
+    Returns (entries, {(cycle, n): (cards now, incomplete cards, error)}).
+    """
+    entries = [(cycle, entry) for cycle, entry in read_index(directory, cycles)
+               if not site or entry["parser"].startswith(site)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(entries) // 200 or 1))
+    if workers == 1:
+        results = replay_entries(directory, entries)
+    else:
+        # Contiguous chunks keep each worker reading its day files front to back
+        size = -(-len(entries) // workers)
+        chunks = [entries[i:i + size] for i in range(0, len(entries), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [result for chunk in executor.map(replay_entries, [directory] * len(chunks), chunks) for result in chunk]
+    return entries, {(cycle, n): (cards, incomplete, error) for cycle, n, cards, incomplete, error in results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay the page archive in PAGE_ARCHIVE_DIR.")
+    parser.add_argument("--dir", default=PAGE_ARCHIVE_DIR, help="archive directory (default: PAGE_ARCHIVE_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("cycles", help="list the recorded cycles")
+    replay_parser = commands.add_parser("replay", help="run the card parsers over archived pages")
+    replay_parser.add_argument("--cycle", action="append", help="only this cycle (repeatable)")
+    replay_parser.add_argument("--site", choices=("linkedin", "wuzzuf"))
+    replay_parser.add_argument("--workers", type=int, help="parser processes (default: all cores)")
+    replay_parser.add_argument("--changed", action="store_true", help="list every page whose card count changed")
+    show_parser = commands.add_parser("show", help="write one archived page's HTML to stdout")
+    show_parser.add_argument("cycle")
+    show_parser.add_argument("n", type=int)
+    args = parser.parse_args()
+
+    if not args.dir or not os.path.isdir(os.path.join(args.dir, "cycles")):
+        sys.exit(f"✗ No page archive at {args.dir!r}; set PAGE_ARCHIVE_DIR or pass --dir")
+
+    if args.command == "cycles":
+        counts = {}
+        for cycle, entry in read_index(args.dir):
+            pages, cards, size = counts.get(cycle, (0, 0, 0))
+            counts[cycle] = (pages + 1, cards + (entry["cards"] or 0), size + entry["length"])
+        for cycle, (pages, cards, size) in counts.items():
+            print(f"{cycle}: {pages} pages, {cards} cards, {size / 1024:.0f} KB compressed")
+        return
+
+    if args.command == "show":
+        for cycle, entry in read_index(args.dir, [args.cycle]):
+            if entry["n"] == args.n:
+                print(f"{entry['url']} ({entry['parser']}, page {entry['page']})", file=sys.stderr)
+                sys.stdout.write(read_page(args.dir, entry))
+                return
+        sys.exit(f"✗ No page {args.n} in cycle {args.cycle}")
+
+    start = time.perf_counter()
+    entries, results = replay(args.dir, args.cycle, args.site, args.workers)
+    elapsed = time.perf_counter() - start
+    changed, empty, errors, cards_total, incomplete_total = [], [], [], 0, 0
+    for cycle, entry in entries:
+        cards, incomplete, error = results[(cycle, entry["n"])]
+        cards_total += cards
+        incomplete_total += incomplete
+        if error:
+            errors.append((cycle, entry, error))
+        elif cards == 0:
+            empty.append((cycle, entry))
+        if entry["cards"] is not None and cards != entry["cards"]:
+            changed.append((cycle, entry, cards))
+
+    print(f"✓ Replayed {len(entries)} pages in {elapsed:.2f}s ({len(entries) / max(elapsed, 1e-9):.0f} pages/s): "
+          f"{cards_total} cards, {incomplete_total} missing a company, title or link")
+    print(f"  {len(changed)} pages parse to a different card count than when recorded, "
+          f"{len(empty)} pages have no cards, {len(errors)} failed")
+    for cycle, entry, cards in changed if args.changed else changed[:10]:
+        print(f"  - {cycle} #{entry['n']} {entry['parser']} page {entry['page']}: {entry['cards']} -> {cards} cards ({entry['url']})")
+    for cycle, entry, error in errors[:10]:
+        print(f"  - {cycle} #{entry['n']} failed: {error}")
+
+
+if __name__ == '__main__':
+    main()
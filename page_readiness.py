@@ -0,0 +1,103 @@
+from dotenv import load_dotenv
+import os, time
+
+load_dotenv()
+# Upper bound for any single readiness condition, in seconds
+PAGE_READY_TIMEOUT = float(os.getenv('PAGE_READY_TIMEOUT', 15))
+
+# Installs (once per document) observers that timestamp the last DOM mutation and the
+# last finished network request, then resolves once both have been quiet for idleMs.
+NETWORK_IDLE_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const idleMs = arguments[0], timeoutMs = arguments[1];
+if (!window.__readiness) {
+    const state = window.__readiness = {last: performance.now()};
+    const touch = () => { state.last = performance.now(); };
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true});
+    try {
+        new PerformanceObserver(touch).observe({type: "resource", buffered: false});
+    } catch (e) {}
+}
+const start = performance.now();
+const check = () => {
+    const now = performance.now();
+    if (now - window.__readiness.last >= idleMs) done(true);
+    else if (now - start >= timeoutMs) done(false);
+    else setTimeout(check, 50);
+};
+check();
+"""
+
+
+class ReadinessReport:
+    """Collects how long each readiness condition actually waited on one page."""
+
+    def __init__(self):
+        self.waits = {}  # condition -> [seconds, times timed out]
+
+    def record(self, condition, seconds, satisfied=True):
+        wait = self.waits.setdefault(condition, [0.0, 0])
+        wait[0] += seconds
+        if not satisfied:
+            wait[1] += 1
+
+    @property
+    def total(self):
+        return sum(seconds for seconds, _ in self.waits.values())
+
+    def summary(self):
+        parts = [f"{name} {seconds:.1f}s" + (f" ({timeouts} timed out)" if timeouts else "")
+                 for name, (seconds, timeouts) in self.waits.items()]
+        return f"{self.total:.1f}s ({', '.join(parts)})" if parts else "0.0s"
+
+
+def wait_for_presence(driver, selector, timeout=PAGE_READY_TIMEOUT, report=None):
+    """Wait until at least one element matches `selector`. Returns True if it appeared in time."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+        )
+        satisfied = True
+    except TimeoutException:
+        satisfied = False
+    if report is not None:
+        report.record("present", time.monotonic() - start, satisfied)
+    return satisfied
+
+
+def wait_for_stable_count(driver, selector, settle=0.75, timeout=PAGE_READY_TIMEOUT, report=None):
+    """Wait until the number of elements matching `selector` stops changing for `settle` seconds."""
+    from selenium.webdriver.common.by import By
+    start = time.monotonic()
+    count = len(driver.find_elements(By.CSS_SELECTOR, selector))
+    stable_since = start
+    satisfied = False
+    while time.monotonic() - start < timeout:
+        time.sleep(0.25)
+        new_count = len(driver.find_elements(By.CSS_SELECTOR, selector))
+        if new_count != count:
+            count, stable_since = new_count, time.monotonic()
+        elif time.monotonic() - stable_since >= settle:
+            satisfied = True
+            break
+    if report is not None:
+        report.record("stable", time.monotonic() - start, satisfied)
+    return count
+
+
+def wait_for_network_idle(driver, idle=0.5, timeout=PAGE_READY_TIMEOUT, report=None):
+    """Wait until no DOM mutation or network request has happened for `idle` seconds."""
+    start = time.monotonic()
+    driver.set_script_timeout(timeout + 5)
+    try:
+        satisfied = bool(driver.execute_async_script(NETWORK_IDLE_SCRIPT, int(idle * 1000), int(timeout * 1000)))
+    except Exception:
+        satisfied = False
+    if report is not None:
+        report.record("idle", time.monotonic() - start, satisfied)
+    return satisfied
@@ -0,0 +1,158 @@
+from dotenv import load_dotenv
+from collections import OrderedDict
+from itertools import islice
+from state_store import get_store
+from metrics import METRICS
+from dedup import DuplicateIndex
+import discord
+import os, time, datetime, urllib.parse
+
+load_dotenv()
+# Discord accepts at most 10 embeds per message
+EMBEDS_PER_MESSAGE = 10
+# Rate limit waits up to this many seconds are sat out; longer ones leave the queue for the next cycle
+DISCORD_MAX_RATELIMIT_WAIT = float(os.getenv('DISCORD_MAX_RATELIMIT_WAIT', 60))
+
+
+def get_google_url(company):
+    return "https://www.google.com/search?q=" + urllib.parse.quote_plus(company)
+
+def job_embed(role):
+    """The Discord embed announcing a (company, title, link, picture, posted_time) role."""
+    company, title, link, picture, posted_time = role
+    source = "Wuzzuf" if "wuzzuf.net" in link else "LinkedIn"
+    embed = discord.Embed(title=title, url=link, color=discord.Color.from_str("#378CCF"), timestamp=datetime.datetime.now())
+    embed.set_author(name=company, url=get_google_url(company))
+    embed.add_field(name="Posted", value=posted_time, inline=True)
+    embed.add_field(name="Source", value=source, inline=True)
+    embed.set_thumbnail(url=picture)
+    return embed
+
+
+class NewJobFilter:
+    """
+    Decides which scraped roles get posted during one run: not seen earlier in the run or
+    still queued, not posted before under any link or site, and not from a blacklisted company.
+    """
+
+    def __init__(self, store=None, queued_roles=()):
+        self.store = store or get_store()
+        self.blacklist = self.store.get_blacklist()
+        # Jobs seen this run or still queued, so the same posting found twice is queued once
+        self.run_duplicates = DuplicateIndex()
+        for company, title, link, _, _ in queued_roles:
+            self.run_duplicates.add(link, company, title)
+
+    def skip_reason(self, role):
+        """Why a role shouldn't be posted, or None if it's a new job."""
+        company, title, link, _, _ = role
+        duplicate = self.run_duplicates.find(link, company, title)
+        if duplicate:
+            return f"duplicate in this run or queued, {duplicate[1]}"
+        self.run_duplicates.add(link, company, title)
+
+        if self.store.is_posted(link):
+            return "already posted"
+        duplicate = self.store.find_duplicate(link, company, title)
+        if duplicate:
+            return f"already posted as {duplicate[0]}, {duplicate[1]}"
+        if company in self.blacklist:
+            return "blacklisted company"
+        return None
+
+
+class PostingQueue:
+    """
+    Jobs waiting to be posted, sent as messages of up to EMBEDS_PER_MESSAGE embeds.
+
+    discord.py already paces each route by its X-RateLimit headers and retries 429s and
+    server errors on its own, so there is no backoff here. When a send still fails the
+    job stays queued for the next flush, and a job is only marked posted once the message
+    carrying it went through. The queue is kept in the state store, so jobs left over
+    from one cycle, or from before a restart, go out first in the next.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or get_store()
+        self.pending = OrderedDict()  # link -> (role, embed, found_at)
+        self.latencies = []  # seconds from parsing to posting, per posted job
+        sent = []
+        for role in self.store.get_pending_posts():
+            if self.store.is_posted(role[2]):
+                sent.append(role[2])  # posted just before a crash, before it left the queue
+            else:
+                self.pending[role[2]] = (role, job_embed(role), time.monotonic())
+        if sent:
+            self.store.delete_pending_posts(sent)
+
+    def __contains__(self, link):
+        return link in self.pending
+
+    def __len__(self):
+        return len(self.pending)
+
+    def enqueue(self, role, embed, found_at=None):
+        """
+        Queue a (company, title, link, picture, posted_time) role with its embed. `found_at` is the
+        time.monotonic() at which the role was parsed. Returns False if the link is already queued.
+        """
+        link = role[2]
+        if link in self.pending:
+            return False
+        self.pending[link] = (role, embed, found_at or time.monotonic())
+        self.store.add_pending_post(role)
+        return True
+
+    def roles(self):
+        return [role for role, _, _ in self.pending.values()]
+
+    def take_latencies(self):
+        """Parse-to-post latencies recorded since the last call."""
+        latencies, self.latencies = self.latencies, []
+        return latencies
+
+    async def flush(self, channel):
+        """Send everything queued. Returns the roles that were posted; whatever failed stays queued."""
+        posted = []
+        batch_size = EMBEDS_PER_MESSAGE
+        while self.pending:
+            batch = list(islice(self.pending.items(), batch_size))
+            try:
+                with METRICS.timed("discord_send_seconds", channel=getattr(channel, "name", "")):
+                    await channel.send(embeds=[embed for _, (_, embed, _) in batch])
+            except discord.RateLimited as e:
+                METRICS.inc("discord_send_failures_total", reason="rate_limited")
+                print(f"⚠️  Discord rate limit of {e.retry_after:.0f}s, keeping {len(self.pending)} job(s) queued for the next cycle")
+                break
+            except discord.HTTPException as e:
+                METRICS.inc("discord_send_failures_total", reason=f"http_{e.status}")
+                if e.status != 400:
+                    # Server errors, rate limits, and missing access or channel (401/403/404) aren't the jobs' fault
+                    print(f"⚠️  Discord error {e.status} ({e.text}), keeping {len(self.pending)} job(s) queued for the next cycle")
+                    break
+                if len(batch) > 1:
+                    # Discord rejected the message; send the jobs one by one to find the bad embed
+                    batch_size = 1
+                    continue
+                # A single embed Discord refuses as invalid won't be accepted on retry either
+                role = batch[0][1][0]
+                print(f"⚠️  Discord rejected the post for {role[1]} at {role[0]} ({e.status}: {e.text}), dropping it")
+                del self.pending[batch[0][0]]
+                self.store.delete_pending_posts([batch[0][0]])
+                batch_size = EMBEDS_PER_MESSAGE
+                continue
+            except (discord.ConnectionClosed, OSError, TimeoutError) as e:
+                METRICS.inc("discord_send_failures_total", reason="connection")
+                print(f"⚠️  Lost the connection while posting ({e}), keeping {len(self.pending)} job(s) queued for the next cycle")
+                break
+
+            links = [link for link, _ in batch]
+            self.store.mark_posted(links, roles=[role for _, (role, _, _) in batch])
+            self.store.delete_pending_posts(links)
+            posted_at = time.monotonic()
+            for link in links:
+                role, _, found_at = self.pending.pop(link)
+                posted.append(role)
+                METRICS.inc("jobs_posted_total", site="wuzzuf" if "wuzzuf.net" in link else "linkedin")
+                self.latencies.append(posted_at - found_at)
+        return posted
@@ -0,0 +1,68 @@
+from dotenv import load_dotenv
+from urllib.parse import urlparse
+import os, time, threading
+
+load_dotenv()
+# 0 (or less) turns pacing off
+DOMAIN_REQUESTS_PER_MINUTE = float(os.getenv('DOMAIN_REQUESTS_PER_MINUTE', 20))
+DOMAIN_BURST = int(os.getenv('DOMAIN_BURST', 3))
+
+
+class TokenBucket:
+    """Classic token bucket: refills at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class DomainRateLimiter:
+    """One token bucket per host, so LinkedIn and Wuzzuf are paced independently."""
+
+    def __init__(self, requests_per_minute=DOMAIN_REQUESTS_PER_MINUTE, burst=DOMAIN_BURST):
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        domain = urlparse(url).netloc.lower()
+        with self.lock:
+            if domain not in self.buckets:
+                self.buckets[domain] = TokenBucket(self.rate, self.burst)
+            return self.buckets[domain]
+
+    def wait(self, url):
+        """Block until a request to `url`'s domain is allowed. Returns the seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0  # unlimited; a bucket that never refills would block forever
+        return self.bucket_for(url).acquire()
+
+
+# Shared by every scraper thread in the process
+DOMAIN_LIMITER = DomainRateLimiter()
+
+
+def wait_for_slot(url):
+    return DOMAIN_LIMITER.wait(url)
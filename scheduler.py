@@ -0,0 +1,123 @@
+from dotenv import load_dotenv
+import os, time, datetime
+
+load_dotenv()
+# Each search URL is polled somewhere between these intervals, depending on how busy it is
+POLL_MIN_INTERVAL_MINUTES = float(os.getenv('POLL_MIN_INTERVAL_MINUTES', 10))
+POLL_MAX_INTERVAL_MINUTES = max(POLL_MIN_INTERVAL_MINUTES, float(os.getenv('POLL_MAX_INTERVAL_MINUTES', 120)))
+# Interval used for a search URL until its rate of new jobs is known
+POLL_DEFAULT_INTERVAL_MINUTES = min(max(float(os.getenv('POLL_DEFAULT_INTERVAL_MINUTES', 20)), POLL_MIN_INTERVAL_MINUTES), POLL_MAX_INTERVAL_MINUTES)
+# Aim for about this many new jobs per poll: busy searches are polled sooner, quiet ones later
+POLL_TARGET_NEW_JOBS = max(0.1, float(os.getenv('POLL_TARGET_NEW_JOBS', 3)))
+
+RATE_SMOOTHING = 0.3     # weight of the latest poll in the new-jobs-per-hour average
+QUIET_BACKOFF = 1.5      # interval growth after a poll that found nothing new
+DUE_SLACK_SECONDS = 60   # sources due this soon are polled together with the ones already due
+
+
+def count_new_ids(recent_ids, previous_ids):
+    """How many of a source's recent job IDs weren't known before; None on its first crawl."""
+    if not previous_ids:
+        return None
+    previous = set(previous_ids)
+    return sum(1 for job_id in recent_ids if job_id not in previous)
+
+
+class SourceSchedule:
+    """Polling state of one search URL."""
+
+    def __init__(self, source_url, new_jobs_per_hour=None, interval=None, last_polled=None, last_change=None, next_poll=None):
+        self.source_url = source_url
+        self.new_jobs_per_hour = new_jobs_per_hour  # None until two polls were compared
+        self.interval = interval or POLL_DEFAULT_INTERVAL_MINUTES * 60
+        self.last_polled = last_polled
+        self.last_change = last_change  # last poll that found new jobs
+        self.next_poll = next_poll or 0.0  # due right away
+
+    def as_row(self):
+        return (self.source_url, self.new_jobs_per_hour, self.interval, self.last_polled, self.last_change, self.next_poll)
+
+    def record_poll(self, new_jobs, now):
+        """Update the rate estimate from a finished poll and schedule the next one."""
+        if new_jobs is not None and self.last_polled is not None:
+            hours = max(now - self.last_polled, 60) / 3600
+            rate = new_jobs / hours
+            if self.new_jobs_per_hour is None:
+                self.new_jobs_per_hour = rate
+            else:
+                self.new_jobs_per_hour = RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * self.new_jobs_per_hour
+            if new_jobs:
+                self.last_change = now
+
+        if new_jobs == 0:
+            # Nothing changed: back off from the current interval rather than trusting an old rate
+            interval = self.interval * QUIET_BACKOFF
+        elif self.new_jobs_per_hour:
+            interval = POLL_TARGET_NEW_JOBS / self.new_jobs_per_hour * 3600
+        else:
+            interval = self.interval
+        self.interval = min(max(interval, POLL_MIN_INTERVAL_MINUTES * 60), POLL_MAX_INTERVAL_MINUTES * 60)
+        self.last_polled = now
+        self.next_poll = now + self.interval
+
+    def record_failure(self, now):
+        """A poll that got no results says nothing about the rate: keep it and retry soon."""
+        self.next_poll = now + POLL_MIN_INTERVAL_MINUTES * 60
+
+
+class PollScheduler:
+    """
+    Decides which search URLs to poll and when.
+
+    Every source keeps a smoothed rate of new jobs per hour. After each poll its interval
+    is set so that a poll finds about POLL_TARGET_NEW_JOBS new jobs, and a poll that found
+    nothing stretches the interval, always within POLL_MIN/MAX_INTERVAL_MINUTES. Due sources
+    are scraped together, so the browsers still run at most SCRAPE_CONCURRENCY searches per
+    site from the shared driver pool. Schedules are kept in the state store across restarts.
+    """
+
+    def __init__(self, store, source_urls):
+        self.store = store
+        saved = store.get_source_schedules()
+        self.sources = {url: SourceSchedule(*saved[url]) if url in saved else SourceSchedule(url) for url in source_urls}
+        removed = [url for url in saved if url not in self.sources]
+        if removed:
+            store.delete_source_schedules(removed)  # searches no longer in .env
+
+    def due(self, now=None):
+        """Source URLs whose next poll is due (or nearly due), in configuration order."""
+        now = now or time.time()
+        return [url for url, source in self.sources.items() if source.next_poll <= now + DUE_SLACK_SECONDS]
+
+    def seconds_until_next(self, now=None):
+        now = now or time.time()
+        if not self.sources:
+            return POLL_DEFAULT_INTERVAL_MINUTES * 60
+        return max(0.0, min(source.next_poll for source in self.sources.values()) - now)
+
+    def record_polls(self, new_job_counts, failed=(), now=None):
+        """
+        Reschedule the polled sources from {source_url: new job count or None}. Sources in `failed`
+        (no results: an authwall, an error) are retried after POLL_MIN_INTERVAL_MINUTES instead
+        of being taken for quiet.
+        """
+        now = now or time.time()
+        for url, new_jobs in new_job_counts.items():
+            if url in self.sources:
+                self.sources[url].record_poll(new_jobs, now)
+        for url in failed:
+            if url in self.sources and url not in new_job_counts:
+                self.sources[url].record_failure(now)
+        polled = [url for url in list(new_job_counts) + list(failed) if url in self.sources]
+        self.store.set_source_schedules([self.sources[url].as_row() for url in dict.fromkeys(polled)])
+
+    def describe(self, labels=None):
+        """One line per source with its next poll time, interval and rate, soonest first."""
+        labels = labels or {}
+        lines = []
+        for source in sorted(self.sources.values(), key=lambda source: source.next_poll):
+            next_poll = datetime.datetime.fromtimestamp(max(source.next_poll, time.time())).strftime('%H:%M')
+            rate = "rate unknown" if source.new_jobs_per_hour is None else f"{source.new_jobs_per_hour:.1f} new/h"
+            lines.append(f"{next_poll} {labels.get(source.source_url, source.source_url)} "
+                         f"(every {source.interval / 60:.0f} min, {rate})")
+        return "\n".join(lines)
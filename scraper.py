@@ -1,17 +1,24 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver import ActionChains
-from selenium.webdriver.common.actions.wheel_input import ScrollOrigin
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from dotenv import load_dotenv
-import os, sys, time, json, re, datetime
+from driver_pool import DriverPool, SCRAPE_CONCURRENCY, clone_profile, remove_profile_clone
+from concurrent.futures import ThreadPoolExecutor
+from rate_limit import wait_for_slot
+from page_readiness import ReadinessReport, wait_for_presence, wait_for_stable_count, wait_for_network_idle
+from linkedin_http import LinkedInHTTPUnavailable, LINKEDIN_FETCH_MODE
+import linkedin_http
+from keyword_matcher import check_keywords_in_text
+from state_store import get_store
+from early_stop import EarlyStop, job_id
+from metrics import METRICS, observe_readiness
+from lean_browser import BROWSER_LEAN_MODE, PageWeight, apply_lean_options, prepare_driver
+from chromedriver_cache import start_chrome
+import job_details
+import page_archive
+from tab_prefetch import TabPrefetcher
+import html_parsers
+import os, time, threading
 import logging
 
-# Suppress Selenium and WebDriver Manager logs
+# Suppress Selenium and WebDriver Manager logs (Selenium itself is only imported once a browser is needed)
 logging.getLogger('selenium').setLevel(logging.WARNING)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 logging.getLogger('WDM').setLevel(logging.WARNING)
@@ -20,16 +27,10 @@ load_dotenv()
 LINKEDIN_URLS_UNFILTERED = os.getenv('LINKEDIN_URLS_UNFILTERED', '')
 LINKEDIN_URLS_FILTERED = os.getenv('LINKEDIN_URLS_FILTERED', '')
 SELENIUM_USER_DATA_DIR = os.getenv('SELENIUM_USER_DATA_DIR')
-
-def load_keywords_from_env(env_var_name):
-    """Loads keywords from a multi-line .env variable."""
-    keywords_str = os.getenv(env_var_name, '')
-    if not keywords_str:
-        return []
-    return [line.strip() for line in keywords_str.strip().splitlines() if line.strip()]
-
-JOB_KEYWORDS = load_keywords_from_env('JOB_KEYWORDS')
-EXCLUDED_KEYWORDS = load_keywords_from_env('EXCLUDED_KEYWORDS')
+MAX_PAGES = 10
+JOBS_PER_PAGE = 25
+# Load up to this many next pages in tabs while a page is parsed, once a crawl gets past its known jobs (0 = off)
+LINKEDIN_PREFETCH_PAGES = max(0, int(os.getenv('LINKEDIN_PREFETCH_PAGES', 0)))
 
 
 def parse_multiline_urls(url_string):
@@ -55,8 +56,15 @@ def parse_multiline_urls(url_string):
 
 def init_driver():
     """Initialize Chrome driver with options"""
+    from selenium.webdriver.chrome.options import Options
+    user_data_dir = SELENIUM_USER_DATA_DIR
+    clone_dir = None
+    if SCRAPE_CONCURRENCY > 1 and SELENIUM_USER_DATA_DIR:
+        # Parallel browsers can't share one live profile, so each gets a copy of the session
+        clone_dir = user_data_dir = clone_profile(SELENIUM_USER_DATA_DIR)
+
     options = Options()
-    options.add_argument(f"user-data-dir={SELENIUM_USER_DATA_DIR}")
+    options.add_argument(f"user-data-dir={user_data_dir}")
     options.add_argument("--headless=new") 
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
@@ -67,232 +75,213 @@ def init_driver():
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--log-level=3")
     options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    
-    service = ChromeService(executable_path=ChromeDriverManager().install())
-    service.log_path = os.devnull
-    
-    return webdriver.Chrome(options=options, service=service)
-
-def check_keywords_in_text(text, return_details=False):
-    """Check if text contains any JOB_KEYWORDS and none of the EXCLUDED_KEYWORDS."""
-    if not text:
-        return (False, [], []) if return_details else False
-    
-    text_lower = text.lower()
-    
-    # Check for excluded keywords first
-    excluded_found = []
-    for keyword in EXCLUDED_KEYWORDS:
-        if keyword.lower() in text_lower:
-            excluded_found.append(keyword)
-    
-    if excluded_found:
-        return (False, [], excluded_found) if return_details else False
-    
-    # Check for required keywords
-    keywords_found = []
-    for keyword in JOB_KEYWORDS:
-        if keyword.lower() in text_lower:
-            keywords_found.append(keyword)
-    
-    has_keywords = len(keywords_found) > 0
-    
-    if return_details:
-        return (has_keywords, keywords_found, [])
-    return has_keywords
-
-def get_config():
-    """Load config from config.json"""
-    config_path = os.path.join(sys.path[0], 'config.json')
+    if BROWSER_LEAN_MODE:
+        apply_lean_options(options)
     
     try:
-        with open(config_path) as f:
-            config = json.load(f)
-            if "last_job_per_source" not in config:
-                config["last_job_per_source"] = {}
-            if "posted" not in config:
-                config["posted"] = {}
-            return config
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Return default config if file doesn't exist or is invalid
-        return {
-            "posted": {},
-            "last_job_per_source": {}
-        }
+        driver = prepare_driver(start_chrome(options))
+    except Exception:
+        if clone_dir:
+            remove_profile_clone(clone_dir)
+        raise
+
+    if clone_dir:
+        quit_driver = driver.quit
+        def quit_and_remove_clone():
+            try:
+                quit_driver()
+            finally:
+                remove_profile_clone(clone_dir)
+        driver.quit = quit_and_remove_clone
+
+    return driver
 
 def get_stop_marker(url):
     """Get the stop marker (last job) for a LinkedIn URL if it exists."""
-    config = get_config()
-    last_job_per_source = config.get("last_job_per_source", {})
-    
-    if url not in last_job_per_source:
-        return None
-    
-    marker_data = last_job_per_source[url]
-    marker_link = marker_data.get("job_link")
-    
-    # Return the marker link directly - no need to verify it's in posted
     # The marker might be a job that didn't pass filters but is still valid as a stop point
-    return marker_link if marker_link else None
-
-def parse_job_listings(driver, check_keywords, show_details, stop_marker=None):
-    """Parse job listings from current page. Returns (roles, hit_stop_marker, first_job_link_on_page)"""
-    master_selector = "li.occludable-update"
-    positions = driver.find_elements(By.CSS_SELECTOR, master_selector)
-    num_positions = len(positions)
+    return get_store().get_stop_marker(url)
+
+def get_early_stop(url):
+    """Early stopping for a LinkedIn URL, anchored on the job IDs its previous crawls saw."""
+    store = get_store()
+    known_ids = store.get_recent_job_ids(url)
+    if not known_ids:
+        # Sources last crawled before recent IDs were kept still have their single marker. One
+        # known ID can't make a run of several, so the crawl stops at the marker itself, as it used to.
+        stop_marker = get_stop_marker(url)
+        if stop_marker:
+            return EarlyStop([job_id(stop_marker)], consecutive=1)
+    return EarlyStop(known_ids, is_posted=store.is_posted)
+
+
+class CrawlProgress:
+    """
+    How far the crawl of one search URL got. When the driverless crawl has to hand over to the
+    browser midway, the browser carries on from here instead of parsing and emitting the same
+    jobs again.
+    """
+
+    def __init__(self, url):
+        self.early_stop = get_early_stop(url)
+        self.roles = []
+        self.cards_seen = 0
+        self.seen_ids = set()  # job IDs of every card processed so far
+
+    def unseen(self, cards):
+        """The cards not processed yet; marks them as processed."""
+        fresh = [card for card in cards if not card["link"] or job_id(card["link"]) not in self.seen_ids]
+        self.seen_ids.update(job_id(card["link"]) for card in fresh)
+        self.cards_seen += len(fresh)
+        return fresh
+
+# Snapshots every job card in one WebDriver round trip. LinkedIn only renders a card's
+# content while it is near the viewport, so each card is scrolled into view and given
+# up to CARD_RENDER_TIMEOUT_MS to fill in before its HTML is copied.
+CARD_RENDER_TIMEOUT_MS = 1000
+SNAPSHOT_CARDS_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const renderTimeout = arguments[0];
+const rendered = (card) => new Promise(resolve => {
+    const deadline = performance.now() + renderTimeout;
+    const check = () => {
+        if (card.querySelector("a[href*='/jobs/view/']") || performance.now() > deadline) resolve();
+        else setTimeout(check, 50);
+    };
+    check();
+});
+(async () => {
+    const snapshots = [];
+    for (const card of document.querySelectorAll("li.occludable-update")) {
+        card.scrollIntoView({block: "center"});
+        await rendered(card);
+        snapshots.push(card.outerHTML);
+    }
+    done(snapshots);
+})().catch(e => done({error: String(e)}));
+"""
+
+def snapshot_job_cards(driver):
+    """Return the rendered HTML of every job card on the current page, in a single script call."""
+    driver.set_script_timeout(120)
+    snapshots = driver.execute_async_script(SNAPSHOT_CARDS_SCRIPT, CARD_RENDER_TIMEOUT_MS)
+    if isinstance(snapshots, dict):
+        raise RuntimeError(f"Card snapshot script failed: {snapshots.get('error')}")
+    return "<ul>" + "".join(snapshots) + "</ul>"
+
+def extract_job_cards(driver):
+    """Return every job card on the current page as a list of dicts (see html_parsers.parse_linkedin_cards)."""
+    return html_parsers.parse_linkedin_cards(snapshot_job_cards(driver))
+
+def parse_job_listings(driver, check_keywords, show_details, early_stop=None, page_number=1, fetch_details=None):
+    """Parse job listings from current page. Returns (roles, hit_stop_marker, first_job_link_on_page, cards)"""
+    return process_job_cards(extract_job_cards(driver), check_keywords, show_details, early_stop, page_number, fetch_details)
+
+def process_job_cards(cards, check_keywords, show_details, early_stop=None, page_number=1, fetch_details=None):
+    """
+    Filter parsed job cards into roles. Returns (roles, hit_stop_marker, first_job_link_on_page, cards)
+    With fetch_details (see job_details), cards failing the keyword check are decided on their description.
+    """
+    num_positions = len(cards)
     
     if show_details:
         print(f"\n  --- Parsing {num_positions} Job Cards ---")
-        if stop_marker:
-            print(f"  - Stop marker active: {stop_marker}")
+        if early_stop and early_stop.active:
+            print(f"  - Early stop active: {len(early_stop.known_ids)} known job IDs, "
+                  f"stopping after {early_stop.consecutive} known in a row")
     
     roles = []
     promoted_included = 0
     skipped_no_keywords = 0
+    deferred = []  # links waiting for their description, in card order
     hit_stop_marker = False
     first_job_link_on_page = None  # Track the very first job link we encounter
 
-    # Iterate by index
-    for i in range(num_positions):
+    for i, card in enumerate(cards):
         if show_details:
             print(f"\n  --- Processing Card {i+1}/{num_positions} ---")
-        
-        try:
-            # Re-find elements on each iteration
-            positions = driver.find_elements(By.CSS_SELECTOR, master_selector)
-            if i >= len(positions):
-                if show_details:
-                    print(f"    - ✗ Card index {i+1} is out of bounds. Ending page parse.")
-                break
-            
-            position = positions[i]
 
-            # Scroll card into view
-            driver.execute_script("arguments[0].scrollIntoView({ behavior: 'smooth', block: 'center' });", position)
-            time.sleep(0.3)
+        if card["promoted"]:
+            promoted_included += 1
+            if show_details:
+                print("    - Status: Promoted")
 
-            # Check if promoted
-            promoted = False
-            try:
-                footer_items = position.find_elements(By.CSS_SELECTOR, ".job-card-container__footer-item")
-                for item in footer_items:
-                    if "promoted" in item.text.lower():
-                        promoted = True
-                        promoted_included += 1
-                        if show_details:
-                            print("    - Status: Promoted")
-                        break
-            except:
-                pass
+        company = card["company"] or "N/A"
+        if show_details:
+            if not card["company"]:
+                print("    - ✗ Company name not found.")
+            print(f"    - Company: {company}")
 
-            # Get company name
-            company = "N/A"
-            try:
-                company = position.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle").text.strip()
-            except:
-                try:
-                    company = position.find_element(By.CSS_SELECTOR, ".job-card-container__primary-description").text.strip()
-                except:
-                    if show_details: 
-                        print("    - ✗ Company name not found.")
-            if show_details: 
-                print(f"    - Company: {company}")
-
-            # Get job link
-            link = ""
-            try:
-                link_element = position.find_element(By.CSS_SELECTOR, "a[href*='/jobs/view/']")
-                link = link_element.get_attribute('href').split('?')[0]
-            except Exception as e:
-                if show_details: 
-                    print(f"    - ✗ Job link not found. Error: {e}")
-                continue
-            if show_details: 
-                print(f"    - Link: {link}")
-            
-            # CRITICAL: Track the very first job link on the page (for stop marker)
-            if first_job_link_on_page is None:
-                first_job_link_on_page = link
-            
-            # CHECK FOR STOP MARKER - This is the key optimization!
-            if stop_marker and link == stop_marker:
-                if show_details:
-                    print(f"    - ⚠️  STOP MARKER HIT! Stopping scrape at this job.")
-                else:
-                    print(f"\n  ⚠️  Stop marker hit! Ending scrape early.")
-                hit_stop_marker = True
-                break  # Stop immediately when we hit the marker
-                
-            # Get job title
-            title = "N/A"
-            try:
-                title = position.find_element(By.CSS_SELECTOR, "a.job-card-container__link strong").text.strip()
-            except:
-                if show_details: 
-                    print("    - ✗ Job title not found.")
-            if show_details: 
-                print(f"    - Title: {title}")
-
-            # Get posted time
-            posted_time = "N/A"
-            try:
-                posted_time = position.find_element(By.CSS_SELECTOR, "time").get_attribute("datetime")
-            except:
-                if show_details: 
-                    print("    - ✗ Posted time not found.")
+        link = card["link"]
+        if not link:
+            if show_details:
+                print("    - ✗ Job link not found.")
+            continue
+        if show_details:
+            print(f"    - Link: {link}")
 
-            # Keyword check if enabled
-            if check_keywords:
-                if show_details:
-                    print("    - Checking keywords...")
-                try:
-                    # Get more detailed text for keyword matching
-                    full_text = f"{title} {company}"
-                    try:
-                        desc = position.find_element(By.CSS_SELECTOR, ".job-card-container__job-insight-text").text
-                        full_text += f" {desc}"
-                    except:
-                        pass
-                    
-                    found, keywords_found, excluded_found = check_keywords_in_text(full_text, return_details=True)
-                    
-                    if show_details:
-                        if keywords_found:
-                            print(f"      - ✓ Keywords found: {', '.join(keywords_found)}")
-                        if excluded_found:
-                            print(f"      - ✗ Excluded keywords found: {', '.join(excluded_found)}")
-                        if not found and not excluded_found:
-                            print(f"      - No matching keywords")
-                    
-                    if not found:
-                        skipped_no_keywords += 1
-                        if show_details:
-                            print("    - Result: SKIPPED (keyword filter)")
-                        continue
-                        
-                except Exception as e:
-                    if show_details:
-                        print(f"      - ✗ Error checking keywords: {e}")
-                    # If we can't check keywords, skip this job to be safe
-                    skipped_no_keywords += 1
-                    continue
+        # CRITICAL: Track the very first job link on the page (for stop marker)
+        if first_job_link_on_page is None:
+            first_job_link_on_page = link
 
-            # Get company picture
-            picture = "https://via.placeholder.com/100"
-            try:
-                img_element = position.find_element(By.CSS_SELECTOR, "img")
-                picture = img_element.get_attribute('src')
-            except:
-                pass
+        # CHECK FOR KNOWN JOBS - This is the key optimization!
+        if early_stop and early_stop.check(link, promoted=card["promoted"], page=page_number, card=i + 1):
+            if show_details:
+                print(f"    - ⚠️  CAUGHT UP! {early_stop.stop_reason}. Stopping scrape at this job.")
+            else:
+                print(f"\n  ⚠️  Caught up with known jobs! Ending scrape early.")
+            hit_stop_marker = True
+            break
 
-            roles.append((company, title, link, picture, posted_time))
+        title = card["title"] or "N/A"
+        if show_details:
+            if not card["title"]:
+                print("    - ✗ Job title not found.")
+            print(f"    - Title: {title}")
+
+        posted_time = card["datetime"] or "N/A"
+        if show_details and not card["datetime"]:
+            print("    - ✗ Posted time not found.")
+
+        # Keyword check if enabled
+        if check_keywords:
             if show_details:
-                print("    - Result: ADDED to list")
-            
-        except Exception as e:
+                print("    - Checking keywords...")
+            full_text = f"{title} {company}"
+            if card["insight"]:
+                full_text += f" {card['insight']}"
+
+            found, keywords_found, excluded_found = check_keywords_in_text(full_text, return_details=True)
+
             if show_details:
-                print(f"    - ✗ UNEXPECTED ERROR parsing card {i+1}: {e}")
-            continue
+                if keywords_found:
+                    print(f"      - ✓ Keywords found: {', '.join(keywords_found)}")
+                if excluded_found:
+                    print(f"      - ✗ Excluded keywords found: {', '.join(excluded_found)}")
+                if not found and not excluded_found:
+                    print(f"      - No matching keywords")
+
+            if not found and fetch_details and job_details.worth_describing(link, excluded_found):
+                deferred.append(link)
+                if show_details:
+                    print("    - Result: DEFERRED (checking the job description)")
+            elif not found:
+                skipped_no_keywords += 1
+                if show_details:
+                    print("    - Result: SKIPPED (keyword filter)")
+                continue
+
+        picture = card["picture"] or html_parsers.LINKEDIN_PLACEHOLDER_PICTURE
+
+        roles.append((company, title, link, picture, posted_time))
+        if show_details and link not in deferred:
+            print("    - Result: ADDED to list")
+
+    described = 0
+    if deferred:
+        matched = job_details.match_descriptions(deferred, fetch_details, show_details)
+        roles = [role for role in roles if role[2] not in deferred or role[2] in matched]
+        described = len(matched)
+        skipped_no_keywords += len(deferred) - described
     
     if show_details:
         print("\n  --- Parsing Summary ---")
@@ -301,65 +290,190 @@ def parse_job_listings(driver, check_keywords, show_details, stop_marker=None):
             summary += f" ({promoted_included} promoted)"
         if skipped_no_keywords > 0:
             summary += f", skipped {skipped_no_keywords} on keyword filter"
+        if deferred:
+            summary += f", {described} of {len(deferred)} matched on their description"
         if hit_stop_marker:
             summary += " [STOPPED EARLY]"
         print(summary)
     
-    return roles, hit_stop_marker, first_job_link_on_page
+    return roles, hit_stop_marker, first_job_link_on_page, cards
+
+def scrape_url(url, check_keywords=False, show_details=False, pool=None, on_roles=None):
+    """
+    Scrape a single LinkedIn URL with pagination and smart early stopping.
+    If given, on_roles(roles) is called with each page's roles as soon as the page is parsed.
+    """
+    progress = CrawlProgress(url)
+    if progress.early_stop.known_ids:
+        print(f"  ℹ️  Using {len(progress.early_stop.known_ids)} known job IDs for early stopping")
+    if LINKEDIN_FETCH_MODE == "http":
+        try:
+            return scrape_url_http(url, check_keywords=check_keywords, show_details=show_details, pool=pool, on_roles=on_roles, progress=progress)
+        except LinkedInHTTPUnavailable as e:
+            resume = f" from card {progress.cards_seen + 1}" if progress.cards_seen else ""
+            print(f"  ⚠️  Driverless mode unavailable ({e}), falling back to the browser{resume}...")
+    return scrape_url_browser(url, check_keywords=check_keywords, show_details=show_details, pool=pool, on_roles=on_roles, progress=progress)
+
+_cookie_export_lock = threading.Lock()
+
+def ensure_session_cookies(pool=None):
+    """
+    Export the LinkedIn session cookies from the browser profile unless they are saved already.
+    A failed export is remembered (see linkedin_http.COOKIE_EXPORT_RETRY_SECONDS), so searches
+    don't each start a browser to fail it again. Raises LinkedInHTTPUnavailable.
+    """
+    with _cookie_export_lock:
+        if linkedin_http.load_cookies() is not None:
+            return
+        linkedin_http.check_export_cooldown()
+        print("  - Exporting LinkedIn session cookies from the browser profile (one time)...")
+        own_pool = pool is None
+        if own_pool:
+            pool = DriverPool({"linkedin": init_driver}, max_drivers=1)
+        try:
+            with pool.driver("linkedin") as driver:
+                linkedin_http.export_session_cookies(driver)
+        except Exception as e:
+            linkedin_http.remember_export_failure(e)
+            if isinstance(e, LinkedInHTTPUnavailable):
+                raise
+            raise LinkedInHTTPUnavailable(f"Cookie export failed: {e}") from e
+        finally:
+            if own_pool:
+                pool.shutdown()
+        linkedin_http.reset_session()
+
+def scrape_url_http(url, check_keywords=False, show_details=False, pool=None, on_roles=None, progress=None):
+    """
+    Scrape a LinkedIn URL over HTTP using the session cookies exported from SELENIUM_USER_DATA_DIR.
+    Raises LinkedInHTTPUnavailable when the browser has to take over; `progress` then holds
+    what was already scraped.
+    """
+    ensure_session_cookies(pool)
+    progress = progress or CrawlProgress(url)
+    early_stop = progress.early_stop
+    all_roles = progress.roles
+    start = 0
+    page_number = 1
+    fetch_details = job_details.http_fetcher("linkedin", check_keywords, linkedin_http.get_session(), url_for=linkedin_http.job_posting_url)
+
+    # The guest endpoint serves fewer cards per request than a results page holds, so the crawl
+    # is bounded by cards: as deep as MAX_PAGES pages in the browser
+    while start < MAX_PAGES * JOBS_PER_PAGE:
+        with METRICS.timed("page_load_seconds", site="linkedin", source=url, page=page_number):
+            cards = linkedin_http.fetch_search_page(url, start)
+        if not cards:
+            break
+        METRICS.inc("pages_scraped_total", site="linkedin", source=url)
+        METRICS.inc("cards_parsed_total", len(cards), site="linkedin", source=url)
+
+        # Early stop counts browser pages, so its report compares with MAX_PAGES
+        browser_page = start // JOBS_PER_PAGE + 1
+        roles_on_page, hit_stop_marker, _, _ = process_job_cards(progress.unseen(cards), check_keywords, show_details, early_stop, browser_page, fetch_details)
+        all_roles.extend(roles_on_page)
+        if on_roles:
+            on_roles(roles_on_page)
+        print(f"  Page {page_number}: Found {len(roles_on_page)} jobs")
 
-def scrape_url(url, check_keywords=False, show_details=False):
-    """Scrape a single LinkedIn URL with pagination and smart early stopping."""
-    driver = init_driver()
-    driver.set_page_load_timeout(300)
-    all_roles = []
-    first_job_link = None  # Track the first job we scrape
+        if hit_stop_marker:
+            break
+
+        # The guest endpoint's start counts the cards served so far, not pages of 25 as in scrape_url
+        start += len(cards)
+        page_number += 1
+
+    print(f"\n  ✓ Total from this URL: {len(all_roles)} jobs (no browser)")
+    print(f"  ℹ️  Early stop: {early_stop.report(MAX_PAGES)}")
+    return all_roles, early_stop
+
+def results_page_url(url, page_number):
+    """The search URL for results page `page_number`: LinkedIn pages with start=(page-1)*25."""
+    from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    query_params['start'] = [(page_number - 1) * JOBS_PER_PAGE]
+    new_query = urlencode(query_params, doseq=True)
+    return urlunparse((
+        parsed_url.scheme,
+        parsed_url.netloc,
+        parsed_url.path,
+        parsed_url.params,
+        new_query,
+        parsed_url.fragment
+    ))
+
+def scrape_url_browser(url, check_keywords=False, show_details=False, pool=None, on_roles=None, progress=None):
+    """
+    Scrape a single LinkedIn URL in Chrome. Given the `progress` of a driverless crawl that
+    stopped midway, it starts at the page holding the next card and skips the cards already seen.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import NoSuchElementException
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool({"linkedin": init_driver}, max_drivers=1)
+    driver = pool.acquire("linkedin")
+    prefetch = None
     
-    # Get stop marker for this URL
-    stop_marker = get_stop_marker(url)
-    if stop_marker:
-        if show_details:
-            print(f"  ℹ️  Stop marker found for this URL")
-        else:
-            print(f"  ℹ️  Using stop marker for early stopping")
+    # Job IDs seen by earlier crawls of this URL
+    if progress is None:
+        progress = CrawlProgress(url)
+        if progress.early_stop.known_ids:
+            print(f"  ℹ️  Using {len(progress.early_stop.known_ids)} known job IDs for early stopping")
+    early_stop = progress.early_stop
+    all_roles = progress.roles
+    first_page = progress.cards_seen // JOBS_PER_PAGE + 1
     
     try:
-        from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-        
-        driver.get(url)
-        time.sleep(10)
+        first_url = results_page_url(url, first_page) if first_page > 1 else url
+        wait_for_slot(first_url)
+        with METRICS.timed("page_load_seconds", site="linkedin", source=url, page=first_page):
+            driver = pool.load("linkedin", driver, first_url)
         
         if "login" in driver.current_url.lower() or "authwall" in driver.current_url.lower():
             print("  ✗ Not logged in! Please run: python log_in_to_linkedin.py")
-            driver.quit()
-            return [], None
+            return all_roles, early_stop
+
+        page_number = first_page
+        jobs_per_page = JOBS_PER_PAGE
+        max_pages = MAX_PAGES
 
-        page_number = 1
-        jobs_per_page = 25
-        max_pages = 10
-        stopped_early = False
+        # A deep crawl (first run or expired stop marker) loads the next pages while this one is parsed;
+        # a crawl with known jobs starts prefetching once it gets past a page without them
+        if LINKEDIN_PREFETCH_PAGES and not early_stop.known_ids:
+            prefetch = TabPrefetcher(driver, LINKEDIN_PREFETCH_PAGES)
         
         while page_number <= max_pages:
             if show_details:
                 print(f"\n  --- Page {page_number} ---")
             else:
                 print(f"  Page {page_number}...", end=" ")
+            report = ReadinessReport()
 
             # Navigate to the page
-            if page_number > 1:
-                parsed_url = urlparse(url)
-                query_params = parse_qs(parsed_url.query)
-                query_params['start'] = [(page_number - 1) * jobs_per_page]
-                new_query = urlencode(query_params, doseq=True)
-                page_url = urlunparse((
-                    parsed_url.scheme,
-                    parsed_url.netloc,
-                    parsed_url.path,
-                    parsed_url.params,
-                    new_query,
-                    parsed_url.fragment
-                ))
-                driver.get(page_url)
-                time.sleep(5)
+            if page_number > first_page:
+                page_url = results_page_url(url, page_number)
+                # A browser that grew too big or too old is replaced here; the crawl goes on from this page
+                driver = pool.fresh_driver("linkedin", driver)
+                if prefetch and prefetch.driver is not driver:
+                    prefetch = TabPrefetcher(driver, LINKEDIN_PREFETCH_PAGES)  # the old browser's tabs went with it
+                if prefetch and prefetch.take(page_url) is not None:
+                    pool.count_page(driver)
+                    if not wait_for_presence(driver, "li.occludable-update", report=report):
+                        # The prefetched load failed or is stuck; load the page again in its tab
+                        with METRICS.timed("page_load_seconds", site="linkedin", source=url, page=page_number):
+                            driver = pool.load("linkedin", driver, page_url)
+                else:
+                    wait_for_slot(page_url)
+                    with METRICS.timed("page_load_seconds", site="linkedin", source=url, page=page_number):
+                        driver = pool.load("linkedin", driver, page_url)
+
+            if prefetch and prefetch.driver is driver:
+                prefetch.prefetch([results_page_url(url, n) for n in range(page_number + 1, max_pages + 1)])
+
+            wait_for_presence(driver, "li.occludable-update", report=report)
             
             # Scroll to load all jobs
             if show_details:
@@ -367,6 +481,7 @@ def scrape_url(url, check_keywords=False, show_details=False):
             else:
                 print("Scrolling...", end=" ")
 
+            scroll_start = time.monotonic()
             try:
                 scroll_container = WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, ".scaffold-layout__list"))
@@ -378,7 +493,8 @@ def scrape_url(url, check_keywords=False, show_details=False):
 
                 while scroll_attempts < max_scroll_attempts:
                     driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scroll_container)
-                    time.sleep(2.5)
+                    # Lazy-loaded cards are in once the list stops mutating and requests settle
+                    wait_for_network_idle(driver, idle=0.5, timeout=2.5, report=report)
                     new_height = driver.execute_script("return arguments[0].scrollHeight", scroll_container)
                     
                     if new_height == last_height:
@@ -396,31 +512,56 @@ def scrape_url(url, check_keywords=False, show_details=False):
                     print(f"    ✗ Could not find scroll container or scroll failed: {e}")
                 else:
                     print("Scroll failed.", end=" ")
+            METRICS.observe("scroll_seconds", time.monotonic() - scroll_start, site="linkedin", source=url, page=page_number)
 
-            # Get the actual number of job cards on this page
-            positions = driver.find_elements(By.CSS_SELECTOR, "li.occludable-update")
-            actual_jobs_on_page = len(positions)
-            
+            wait_for_stable_count(driver, "li.occludable-update", report=report)
+            observe_readiness(report, site="linkedin", source=url, page=page_number)
+            weight = PageWeight.measure(driver)
+            if weight:
+                METRICS.inc("page_bytes_total", weight.bytes, site="linkedin", source=url)
             if show_details:
-                print(f"  - Found {actual_jobs_on_page} job cards on this page")
-            
+                print(f"  - Waited {report.summary()} for the page to be ready")
+                if weight:
+                    print(f"  - Loaded {weight.summary()}")
+            else:
+                print(f"Waited {report.summary()}.", end=" ")
+                if weight:
+                    print(f"Loaded {weight.summary()}.", end=" ")
+
             # Parse the jobs with stop marker check
-            roles_on_page, hit_stop_marker, first_link_on_page = parse_job_listings(driver, check_keywords, show_details, stop_marker)
+            with METRICS.timed("card_parse_seconds", site="linkedin", source=url, page=page_number):
+                cards_html = snapshot_job_cards(driver)
+                cards = html_parsers.parse_linkedin_cards(cards_html)
+            # Detail pages loaded for the keyword check are timed under detail_load_seconds
+            fetch_details = job_details.tab_fetcher(driver, "linkedin", check_keywords)
+            roles_on_page, hit_stop_marker, _, _ = process_job_cards(
+                progress.unseen(cards), check_keywords, show_details, early_stop, page_number, fetch_details)
+            page_archive.record("linkedin", cards_html, source=url, url=driver.current_url, page=page_number, cards=len(cards))
+            if page_archive.get_archive():
+                # The snapshot is empty once the card selector stops matching, so keep the whole page too
+                page_source = driver.page_source
+                page_archive.record("linkedin_page", page_source, source=url, url=driver.current_url, page=page_number,
+                                    cards=len(html_parsers.parse_linkedin_cards(page_source)))
+            METRICS.inc("pages_scraped_total", site="linkedin", source=url)
+            METRICS.inc("cards_parsed_total", len(cards), site="linkedin", source=url)
             all_roles.extend(roles_on_page)
+            if on_roles:
+                on_roles(roles_on_page)
+            actual_jobs_on_page = len(cards)
             
-            # Track the first job link we see on page 1 (for updating stop marker later)
-            if page_number == 1 and first_link_on_page and not first_job_link:
-                first_job_link = first_link_on_page
-                if show_details:
-                    print(f"  - Tracking first job on page 1 as future stop marker: {first_job_link}")
+            if show_details:
+                print(f"  - Found {actual_jobs_on_page} job cards on this page")
             
             if not show_details:
-                promoted_count = sum(1 for pos in positions if 'promoted' in pos.text.lower())
+                promoted_count = sum(1 for card in cards if card["promoted"])
                 print(f"  Found {len(roles_on_page)} jobs ({promoted_count} promoted)")
 
-            # Check if we hit the stop marker
+            # Check if we caught up with jobs seen before
             if hit_stop_marker:
-                stopped_early = True
+                if prefetch and prefetch.driver is driver:
+                    cancelled = prefetch.cancel()
+                    if cancelled and show_details:
+                        print(f"  - Cancelled {cancelled} prefetched page(s) past the known jobs")
                 if not show_details:
                     print(f"  ✓ Early stop: Found all new jobs!")
                 break
@@ -438,64 +579,94 @@ def scrape_url(url, check_keywords=False, show_details=False):
                     if show_details:
                         print("\n  - Next button is disabled. Reached the last page.")
                     break
-            except:
+            except NoSuchElementException:
                 if show_details:
                     print("\n  - Next button not found. Might be the last page.")
+
+            if LINKEDIN_PREFETCH_PAGES and prefetch is None:
+                prefetch = TabPrefetcher(driver, LINKEDIN_PREFETCH_PAGES)
             
             page_number += 1
         
-        if stopped_early:
-            print(f"\n  ✓ Total from this URL: {len(all_roles)} jobs (stopped early at page {page_number})")
-        else:
-            print(f"\n  ✓ Total from this URL: {len(all_roles)} jobs")
+        print(f"\n  ✓ Total from this URL: {len(all_roles)} jobs")
+        print(f"  ℹ️  Early stop: {early_stop.report(MAX_PAGES)}")
         
     except Exception as e:
         print(f"  ✗ An error occurred during scraping: {e}")
     finally:
-        driver.quit()
+        if prefetch and prefetch.driver is driver:
+            cancelled = prefetch.cancel()
+            if cancelled and show_details:
+                print(f"  - Cancelled {cancelled} prefetched page(s) past the end of the crawl")
+        pool.release("linkedin", driver)
+        if own_pool:
+            pool.shutdown()
     
-    return all_roles, first_job_link
+    return all_roles, early_stop
 
-def get_recent_roles(show_details=False):
-    """Get roles from all configured URLs. Returns (all_roles, stop_markers_dict)"""
+def configured_searches():
+    """(url, check_keywords, label) for every configured search URL, in configuration order."""
+    unfiltered_urls = parse_multiline_urls(LINKEDIN_URLS_UNFILTERED)
+    filtered_urls = parse_multiline_urls(LINKEDIN_URLS_FILTERED)
+    return (
+        [(url, False, f"📋 Unfiltered Search {i}/{len(unfiltered_urls)}: {note or 'General'}")
+         for i, (url, note) in enumerate(unfiltered_urls, 1)] +
+        [(url, True, f"🔍 Filtered Search {i}/{len(filtered_urls)}: {note or 'Keywords'}")
+         for i, (url, note) in enumerate(filtered_urls, 1)]
+    )
+
+def get_recent_roles(show_details=False, pool=None, on_roles=None, sources=None):
+    """
+    Get roles from all configured URLs. Returns (all_roles, recent_job_ids_dict); searches that
+    returned no cards at all are missing from the dict.
+    If given, on_roles(roles) is called from the scraping threads as each page is parsed,
+    and only the search URLs in `sources` are scraped.
+    """
     all_roles = []
-    stop_markers = {}  # Map URL -> first job link scraped
-    
+    recent_ids = {}  # Map URL -> newest-first job IDs to remember
+    pages_saved = 0
+
+    # Browsers are reused across search URLs unless the caller shares its own pool
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool({"linkedin": init_driver}, max_drivers=SCRAPE_CONCURRENCY)
+
     log_mode = "(Detailed Log Mode)" if show_details else ""
     print("\n" + "="*60)
     print(f"LinkedIn Job Search {log_mode}")
     print("="*60)
 
-    # Scrape unfiltered URLs
-    unfiltered_urls = parse_multiline_urls(LINKEDIN_URLS_UNFILTERED)
-    if unfiltered_urls:
-        for i, (url, note) in enumerate(unfiltered_urls, 1):
-            print(f"\n📋 Unfiltered Search {i}/{len(unfiltered_urls)}: {note or 'General'}")
-            roles, first_job = scrape_url(url, check_keywords=False, show_details=show_details)
-            all_roles.extend(roles)
-            if first_job:
-                stop_markers[url] = first_job
-            if i < len(unfiltered_urls):
-                time.sleep(5)
-
-    # Scrape filtered URLs
-    filtered_urls = parse_multiline_urls(LINKEDIN_URLS_FILTERED)
-    if filtered_urls:
-        for i, (url, note) in enumerate(filtered_urls, 1):
-            print(f"\n🔍 Filtered Search {i}/{len(filtered_urls)}: {note or 'Keywords'}")
-            roles, first_job = scrape_url(url, check_keywords=True, show_details=show_details)
-            all_roles.extend(roles)
-            if first_job:
-                stop_markers[url] = first_job
-            if i < len(filtered_urls):
-                time.sleep(5)
+    searches = [search for search in configured_searches() if sources is None or search[0] in sources]
+
+    def run_search(search):
+        url, check_keywords, label = search
+        print(f"\n{label}")
+        with METRICS.timed("search_seconds", site="linkedin", source=url):
+            return scrape_url(url, check_keywords=check_keywords, show_details=show_details, pool=pool, on_roles=on_roles)
+
+    # Searches run in parallel; pacing comes from the per-domain rate limiter
+    with ThreadPoolExecutor(max_workers=SCRAPE_CONCURRENCY) as executor:
+        results = list(executor.map(run_search, searches))
+
+    # Merge in configuration order so roles and recent IDs don't depend on which search finished first
+    for (url, _, label), (roles, early_stop) in zip(searches, results):
+        all_roles.extend(roles)
+        if not early_stop.seen_ids:
+            # No cards at all (authwall, error): left out, so its recent IDs and schedule aren't taken for a quiet search
+            print(f"⚠️  {label}: no job cards this time, it will be retried soon")
+            continue
+        recent_ids[url] = early_stop.recent_ids()
+        pages_saved += early_stop.pages_saved(MAX_PAGES)
+
+    if own_pool:
+        pool.shutdown()
 
     print("\n" + "="*60)
-    print(f"✓ Search Complete: {len(all_roles)} total jobs found")
+    print(f"✓ Search Complete: {len(all_roles)} total jobs found, early stopping saved up to {pages_saved} pages")
     print("="*60 + "\n")
-    return all_roles, stop_markers
+    return all_roles, recent_ids
 
 if __name__ == '__main__':
     show_details_arg = os.getenv('SHOW_DETAILED_LOGS', 'False').lower() == 'true'
-    roles, markers = get_recent_roles(show_details=show_details_arg)
-    print(f"\nStop markers for next run: {len(markers)} URLs tracked")
\ No newline at end of file
+    roles, recent_ids = get_recent_roles(show_details=show_details_arg)
+    print(f"\nRecent job IDs for next run: {len(recent_ids)} URLs tracked")
\ No newline at end of file
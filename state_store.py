@@ -0,0 +1,354 @@
+from dotenv import load_dotenv
+from expiry_index import ExpiringLinkSet
+from dedup import DuplicateIndex, job_key, fingerprint
+import os, sys, json, time, sqlite3, datetime, threading
+
+load_dotenv()
+STATE_DB_PATH = os.getenv('STATE_DB_PATH') or os.path.join(sys.path[0], 'state.db')
+LEGACY_CONFIG_PATH = os.path.join(sys.path[0], 'config.json')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posted (
+    link TEXT PRIMARY KEY,
+    posted_at REAL NOT NULL,
+    job_key TEXT,
+    fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_posted_posted_at ON posted (posted_at);
+
+CREATE TABLE IF NOT EXISTS stop_markers (
+    source_url TEXT PRIMARY KEY,
+    job_link TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stop_markers_updated_at ON stop_markers (updated_at);
+
+CREATE TABLE IF NOT EXISTS recent_job_ids (
+    source_url TEXT PRIMARY KEY,
+    job_ids TEXT NOT NULL,  -- JSON list, newest first
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recent_job_ids_updated_at ON recent_job_ids (updated_at);
+
+CREATE TABLE IF NOT EXISTS source_schedule (
+    source_url TEXT PRIMARY KEY,
+    new_jobs_per_hour REAL,
+    interval REAL NOT NULL,
+    last_polled REAL,
+    last_change REAL,
+    next_poll REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_descriptions (
+    job_key TEXT PRIMARY KEY,  -- dedup.job_key of the job link
+    description TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_descriptions_fetched_at ON job_descriptions (fetched_at);
+
+CREATE TABLE IF NOT EXISTS pending_posts (
+    link TEXT PRIMARY KEY,
+    role TEXT NOT NULL,  -- JSON [company, title, link, picture, posted_time]
+    queued_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blacklist (
+    company TEXT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class StateStore:
+    """
+    Bot state (posted links, per-source stop markers, blacklist) in an embedded SQLite
+    database. WAL mode keeps readers and the writer out of each other's way, and every
+    change is a small transaction instead of a rewrite of the whole state.
+    """
+
+    def __init__(self, path=STATE_DB_PATH):
+        self.path = path
+        self.lock = threading.Lock()  # one connection shared by the bot loop and scraper threads
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._add_missing_columns()
+        self._load_posted_index()
+
+    def _add_missing_columns(self):
+        """Databases created by older versions lack the dedup columns of `posted`."""
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(posted)")}
+        for column in ("job_key", "fingerprint"):
+            if column not in columns:
+                self.db.execute(f"ALTER TABLE posted ADD COLUMN {column} TEXT")
+
+    def _load_posted_index(self):
+        """Posted links are mirrored in memory so dedup checks and pruning never scan the table."""
+        self.posted = ExpiringLinkSet()
+        for link, posted_at in self.db.execute("SELECT link, posted_at FROM posted"):
+            self.posted.add(link, posted_at)
+        # Hashing every title is the slow part of startup, so the dedup index is built later (see build_duplicate_index)
+        self.duplicates = None
+        self._index_build_lock = threading.Lock()
+        self._index_backlog = None  # (link, fingerprint) posted while the index is being built
+
+    def build_duplicate_index(self):
+        """
+        Build the dedup index of the posted jobs if it isn't built yet. The titles are hashed
+        outside the store lock, so calling this from a thread at startup doesn't hold up the scrapers.
+        """
+        with self._index_build_lock:
+            if self.duplicates is not None:
+                return
+            with self.lock:
+                rows = self.db.execute("SELECT link, fingerprint FROM posted").fetchall()
+                self._index_backlog = []
+            index = DuplicateIndex()
+            for link, fingerprint_ in rows:
+                index.add(link, fingerprint_=fingerprint_ or "")
+            with self.lock:
+                for link, fingerprint_ in self._index_backlog:
+                    if fingerprint_ is not None or link not in index:
+                        index.add(link, fingerprint_=fingerprint_ or "")
+                # Links pruned in the meantime
+                for link in [link for link, _ in rows + self._index_backlog if link not in self.posted]:
+                    index.discard(link)
+                self.duplicates = index
+                self._index_backlog = None
+
+    def _write(self, statements):
+        """Run (sql, params) pairs atomically. A params list of tuples runs the statement for each."""
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        self.db.executemany(sql, params)
+                    else:
+                        self.db.execute(sql, params)
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def _read(self, sql, params=()):
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    # --- Posted links ---
+
+    def is_posted(self, link):
+        with self.lock:
+            return link in self.posted
+
+    def posted_count(self):
+        with self.lock:
+            return len(self.posted)
+
+    def find_duplicate(self, link, company, title):
+        """(posted link, reason) if the same job was already posted under another link or on another site."""
+        self.build_duplicate_index()
+        with self.lock:
+            return self.duplicates.find(link, company, title)
+
+    def mark_posted(self, links, when=None, roles=()):
+        """Record links as posted. Pass their (company, title, link, ...) roles to catch reposts of the same jobs."""
+        when = when or time.time()
+        fingerprints = {role[2]: fingerprint(role[0], role[1]) for role in roles}
+        self._write([(
+            # Rows imported from config.json have no job key or fingerprint until posted again
+            "INSERT INTO posted (link, posted_at, job_key, fingerprint) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (link) DO UPDATE SET posted_at = excluded.posted_at, job_key = excluded.job_key, "
+            "fingerprint = COALESCE(excluded.fingerprint, posted.fingerprint)",
+            [(link, when, job_key(link), fingerprints.get(link)) for link in links],
+        )])
+        with self.lock:
+            for link in links:
+                self.posted.add(link, when)
+                if self.duplicates is not None:
+                    if link in fingerprints or link not in self.duplicates:
+                        self.duplicates.add(link, fingerprint_=fingerprints.get(link, ""))
+                elif self._index_backlog is not None:
+                    self._index_backlog.append((link, fingerprints.get(link)))
+
+    def delete_posted_older_than(self, cutoff):
+        """Forget links posted before the `cutoff` unix timestamp. Returns how many were removed."""
+        with self.lock:
+            expired = self.posted.expire(cutoff)
+            for link in expired if self.duplicates is not None else ():
+                self.duplicates.discard(link)
+            if expired:
+                # Range delete on the posted_at index, so this is O(expired) as well
+                self.db.execute("DELETE FROM posted WHERE posted_at < ?", (cutoff,))
+            return len(expired)
+
+    # --- Stop markers ---
+
+    def get_stop_marker(self, source_url):
+        rows = self._read("SELECT job_link FROM stop_markers WHERE source_url = ?", (source_url,))
+        return rows[0][0] if rows else None
+
+    def get_recent_job_ids(self, source_url):
+        """The newest-first job IDs the last crawls of `source_url` saw."""
+        rows = self._read("SELECT job_ids FROM recent_job_ids WHERE source_url = ?", (source_url,))
+        return json.loads(rows[0][0]) if rows else []
+
+    def set_recent_job_ids(self, recent_ids, when=None):
+        """Replace the {source_url: [job_id, ...]} lists."""
+        when = when or time.time()
+        self._write([(
+            "INSERT INTO recent_job_ids (source_url, job_ids, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (source_url) DO UPDATE SET job_ids = excluded.job_ids, updated_at = excluded.updated_at",
+            [(source_url, json.dumps(job_ids), when) for source_url, job_ids in recent_ids.items() if job_ids],
+        )])
+
+    def delete_stop_markers_older_than(self, cutoff):
+        """Forget stop markers and recent job IDs of sources that weren't crawled since `cutoff`."""
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = self.db.execute("DELETE FROM stop_markers WHERE updated_at < ?", (cutoff,)).rowcount
+                deleted += self.db.execute("DELETE FROM recent_job_ids WHERE updated_at < ?", (cutoff,)).rowcount
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+            return deleted
+
+    # --- Polling schedule ---
+
+    def get_source_schedules(self):
+        """{source_url: (source_url, new_jobs_per_hour, interval, last_polled, last_change, next_poll)}"""
+        rows = self._read("SELECT source_url, new_jobs_per_hour, interval, last_polled, last_change, next_poll FROM source_schedule")
+        return {row[0]: row for row in rows}
+
+    def set_source_schedules(self, rows):
+        self._write([(
+            "INSERT OR REPLACE INTO source_schedule "
+            "(source_url, new_jobs_per_hour, interval, last_polled, last_change, next_poll) VALUES (?, ?, ?, ?, ?, ?)",
+            list(rows),
+        )])
+
+    def delete_source_schedules(self, source_urls):
+        self._write([("DELETE FROM source_schedule WHERE source_url = ?", [(url,) for url in source_urls])])
+
+    # --- Job descriptions ---
+
+    def get_descriptions(self, keys, fetched_after=0):
+        """{job_key: description} for the given keys that were cached at or after `fetched_after`."""
+        keys = list(keys)
+        found = {}
+        for i in range(0, len(keys), 500):  # stay under SQLite's bound parameter limit
+            chunk = keys[i:i + 500]
+            found.update(self._read(
+                f"SELECT job_key, description FROM job_descriptions WHERE job_key IN ({','.join('?' * len(chunk))}) AND fetched_at >= ?",
+                (*chunk, fetched_after),
+            ))
+        return found
+
+    def set_descriptions(self, descriptions, when=None):
+        """Upsert {job_key: description}."""
+        when = when or time.time()
+        self._write([(
+            "INSERT OR REPLACE INTO job_descriptions (job_key, description, fetched_at) VALUES (?, ?, ?)",
+            [(key, description, when) for key, description in descriptions.items()],
+        )])
+
+    def delete_descriptions_older_than(self, cutoff):
+        """Forget descriptions fetched before `cutoff`. Returns how many were removed."""
+        with self.lock:
+            return self.db.execute("DELETE FROM job_descriptions WHERE fetched_at < ?", (cutoff,)).rowcount
+
+    # --- Posting queue ---
+
+    def get_pending_posts(self):
+        """Roles queued for posting and not sent yet, oldest first."""
+        rows = self._read("SELECT role FROM pending_posts ORDER BY queued_at, rowid")
+        return [tuple(json.loads(role)) for (role,) in rows]
+
+    def add_pending_post(self, role, when=None):
+        self._write([(
+            "INSERT OR IGNORE INTO pending_posts (link, role, queued_at) VALUES (?, ?, ?)",
+            (role[2], json.dumps(list(role)), when or time.time()),
+        )])
+
+    def delete_pending_posts(self, links):
+        self._write([("DELETE FROM pending_posts WHERE link = ?", [(link,) for link in links])])
+
+    # --- Blacklist ---
+
+    def get_blacklist(self):
+        return {company for (company,) in self._read("SELECT company FROM blacklist")}
+
+    def add_to_blacklist(self, companies):
+        """Returns the companies that weren't blacklisted before."""
+        added = set(companies) - self.get_blacklist()
+        self._write([("INSERT OR IGNORE INTO blacklist (company) VALUES (?)", [(company,) for company in added])])
+        return added
+
+    def remove_from_blacklist(self, companies):
+        """Returns the companies that were actually removed."""
+        removed = set(companies) & self.get_blacklist()
+        self._write([("DELETE FROM blacklist WHERE company = ?", [(company,) for company in removed])])
+        return removed
+
+    # --- One-time migration from config.json ---
+
+    def migrate_from_config(self, config_path=LEGACY_CONFIG_PATH):
+        """Import config.json (both the old list and the newer dict `posted` format) the first time the store opens."""
+        if self._read("SELECT 1 FROM meta WHERE key = 'migrated_from_config'"):
+            return
+        try:
+            with open(config_path) as f:
+                config = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            config = {}
+
+        def to_timestamp(value):
+            try:
+                return datetime.datetime.fromisoformat(value).timestamp()
+            except (ValueError, TypeError):
+                return None
+
+        now = time.time()
+        posted = config.get("posted", {})
+        if isinstance(posted, list):
+            posted_rows = [(link, now) for link in posted]
+        else:
+            posted_rows = [(link, to_timestamp(ts)) for link, ts in posted.items()]
+        marker_rows = [
+            (url, data.get("job_link"), to_timestamp(data.get("timestamp")))
+            for url, data in config.get("last_job_per_source", {}).items() if isinstance(data, dict)
+        ]
+
+        self._write([
+            ("INSERT OR IGNORE INTO posted (link, posted_at) VALUES (?, ?)",
+             [row for row in posted_rows if row[1] is not None]),
+            ("INSERT OR IGNORE INTO stop_markers (source_url, job_link, updated_at) VALUES (?, ?, ?)",
+             [row for row in marker_rows if row[1] and row[2] is not None]),
+            ("INSERT OR IGNORE INTO blacklist (company) VALUES (?)",
+             [(company,) for company in config.get("blacklist", [])]),
+            ("INSERT INTO meta (key, value) VALUES ('migrated_from_config', ?)", (datetime.datetime.now().isoformat(),)),
+        ])
+        self._load_posted_index()
+        if config:
+            print(f"  - Migrated {len(posted_rows)} posted job(s), {len(marker_rows)} stop marker(s) "
+                  f"and {len(config.get('blacklist', []))} blacklisted companies from config.json")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Process-wide store, opened (and migrated from config.json) on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = StateStore()
+            _store.migrate_from_config()
+        return _store
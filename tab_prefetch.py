@@ -0,0 +1,76 @@
+from rate_limit import wait_for_slot
+from metrics import METRICS
+import time
+
+
+class TabPrefetcher:
+    """
+    Loads the next result pages of a search in background tabs of one driver while the current
+    page is scrolled and parsed in the driver's current tab. At most `lookahead` pages load at
+    once. take() moves the driver onto a prefetched page; cancel() closes whatever is still
+    loading once the crawl stops, which aborts those requests.
+    """
+
+    def __init__(self, driver, lookahead):
+        self.driver = driver
+        self.lookahead = lookahead
+        self.tabs = {}  # page url -> (window handle, time the load started)
+
+    def prefetch(self, urls):
+        """Start loading the first of `urls` that aren't loading yet, up to the look-ahead."""
+        for url in urls:
+            if len(self.tabs) >= self.lookahead:
+                break
+            if url in self.tabs:
+                continue
+            wait_for_slot(url)
+            before = set(self.driver.window_handles)
+            # The tab loads on its own; the driver stays on the current page
+            self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+            opened = set(self.driver.window_handles) - before
+            if opened:
+                self.tabs[url] = (opened.pop(), time.monotonic())
+
+    def take(self, url):
+        """
+        Close the current tab and switch to the one prefetching `url`. Returns the seconds since
+        its load started, or None if `url` wasn't prefetched (the driver is left as it was).
+        """
+        entry = self.tabs.pop(url, None)
+        if entry is None:
+            return None
+        handle, started = entry
+        self.driver.close()
+        self.driver.switch_to.window(handle)
+        try:
+            # Background tabs don't lay out lazy-loaded content until they are in front
+            self.driver.execute_cdp_cmd("Page.bringToFront", {})
+        except Exception:
+            pass
+        METRICS.inc("prefetched_pages_total", outcome="used")
+        return time.monotonic() - started
+
+    def cancel(self):
+        """Close every tab still prefetching and return to the current one. Returns how many were closed."""
+        if not self.tabs:
+            return 0
+        try:
+            current = self.driver.current_window_handle
+        except Exception:
+            current = None
+        cancelled = 0
+        for handle, _ in self.tabs.values():
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+                cancelled += 1
+            except Exception:
+                pass  # the tab or the whole browser is already gone
+        self.tabs.clear()
+        try:
+            if current:
+                self.driver.switch_to.window(current)
+        except Exception:
+            pass
+        METRICS.inc("prefetched_pages_total", cancelled, outcome="cancelled")
+        return cancelled
@@ -0,0 +1,40 @@
+from dedup import DuplicateIndex
+
+
+def index_with(*jobs):
+    index = DuplicateIndex()
+    for link, company, title in jobs:
+        index.add(link, company, title)
+    return index
+
+
+def test_same_job_id_under_another_url_is_a_duplicate():
+    index = index_with(("https://www.linkedin.com/jobs/view/111/", "Microsoft", "Software Test Engineer"))
+    match = index.find("https://www.linkedin.com/jobs/view/software-test-engineer-111?refId=abc", "Microsoft", "Software Test Engineer")
+    assert match == ("https://www.linkedin.com/jobs/view/111/", "same job ID")
+
+
+def test_senior_and_non_senior_linkedin_jobs_are_different():
+    index = index_with(("https://www.linkedin.com/jobs/view/111/", "Microsoft", "Software Test Engineer"))
+    assert index.find("https://www.linkedin.com/jobs/view/222/", "Microsoft", "Senior Software Test Engineer") is None
+
+
+def test_remote_and_non_remote_linkedin_jobs_are_different():
+    index = index_with(("https://www.linkedin.com/jobs/view/333/", "Acme", "Backend Engineer"))
+    assert index.find("https://www.linkedin.com/jobs/view/444/", "Acme", "Backend Engineer (Remote)") is None
+
+
+def test_same_title_at_same_company_with_another_linkedin_id_is_a_different_job():
+    index = index_with(("https://www.linkedin.com/jobs/view/555/", "Acme", "Backend Engineer"))
+    assert index.find("https://www.linkedin.com/jobs/view/666/", "Acme", "Backend Engineer") is None
+
+
+def test_remote_and_on_site_titles_across_sites_are_different():
+    index = index_with(("https://www.linkedin.com/jobs/view/333/", "Acme", "Backend Engineer"))
+    assert index.find("https://wuzzuf.net/jobs/p/abc-backend-engineer-remote", "Acme", "Backend Engineer (Remote)") is None
+
+
+def test_same_posting_on_the_other_site_is_a_duplicate():
+    index = index_with(("https://www.linkedin.com/jobs/view/777/", "Acme Inc.", "Senior .NET Developer"))
+    match = index.find("https://wuzzuf.net/jobs/p/xyz-senior-net-developer-cairo", "ACME", "Senior .NET Developer - Urgent")
+    assert match is not None and match[0] == "https://www.linkedin.com/jobs/view/777/"
@@ -0,0 +1,70 @@
+import json
+import pytest
+import scraper
+from early_stop import EarlyStop, job_id, merge_recent_ids
+from state_store import StateStore
+
+SEARCH = "https://www.linkedin.com/jobs/search/?keywords=.net"
+
+
+def link(n):
+    return f"https://www.linkedin.com/jobs/view/senior-developer-at-acme-{n}/?refId=x"
+
+
+def test_job_id():
+    assert job_id(link(42)) == "42"
+    assert job_id("https://wuzzuf.net/jobs/p/abc-net-developer-cairo?o=1") == "abc-net-developer-cairo"
+    assert job_id(None) is None
+
+
+def test_stops_after_a_run_of_known_ids():
+    stop = EarlyStop(["3", "2", "1"], consecutive=3)
+    assert not stop.check(link(5), page=1, card=1)
+    assert not stop.check(link(3), page=1, card=2)
+    assert not stop.check(link(4), page=1, card=3)  # a new job breaks the run
+    assert not stop.check(link(2), page=2, card=1)
+    assert not stop.check(link(1), page=2, card=2)
+    assert stop.check(link(3), page=2, card=3)
+    assert (stop.stop_page, stop.stop_card) == (2, 3)
+    assert stop.pages_saved(5) == 3
+
+
+def test_promoted_cards_neither_count_nor_break_a_run():
+    stop = EarlyStop(["2", "1"], consecutive=2)
+    assert not stop.check(link(2))
+    assert not stop.check(link(9), promoted=True)
+    assert stop.check(link(1))
+    assert "9" in stop.seen_ids
+
+
+def test_recent_ids_put_this_crawl_first():
+    stop = EarlyStop(["2", "1"])
+    stop.check(link(3))
+    stop.check(link(2))
+    assert stop.recent_ids() == ["3", "2", "1"]
+    assert merge_recent_ids(["3", "2"], ["2", "1"], limit=2) == ["3", "2"]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = StateStore(str(tmp_path / "state.db"))
+    monkeypatch.setattr(scraper, "get_store", lambda: store)
+    return store
+
+
+def test_source_with_only_the_old_stop_marker_stops_at_it(store, tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"last_job_per_source": {SEARCH: {"job_link": link(7), "timestamp": "2026-10-01T09:00:00"}}}))
+    store.migrate_from_config(str(config))
+    stop = scraper.get_early_stop(SEARCH)
+    assert not stop.check(link(8))
+    assert stop.check(link(7))
+
+
+def test_source_with_recent_ids_needs_a_run(store):
+    store.set_recent_job_ids({SEARCH: ["7", "6", "5"]})
+    store.mark_posted([link(9)])
+    stop = scraper.get_early_stop(SEARCH)
+    assert not stop.check(link(7))
+    assert not stop.check(link(6))
+    assert stop.check(link(9))  # already posted counts as known
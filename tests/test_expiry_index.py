@@ -0,0 +1,41 @@
+from expiry_index import ExpiringLinkSet
+
+HOUR = 3600
+
+
+def test_membership_and_length():
+    links = ExpiringLinkSet()
+    links.add("a", 10 * HOUR)
+    links.add("b", 10 * HOUR + 5)
+    assert "a" in links and "b" in links and "c" not in links
+    assert len(links) == 2
+
+
+def test_expire_drops_whole_buckets_and_splits_the_boundary_one():
+    links = ExpiringLinkSet()
+    links.add("old", 8 * HOUR)
+    links.add("early", 10 * HOUR + 100)
+    links.add("late", 10 * HOUR + 3000)
+    links.add("new", 12 * HOUR)
+    assert sorted(links.expire(10 * HOUR + 1000)) == ["early", "old"]
+    assert "late" in links and "new" in links and len(links) == 2
+    assert links.expire(10 * HOUR + 1000) == []
+
+
+def test_readding_moves_a_link_to_its_new_bucket():
+    links = ExpiringLinkSet()
+    links.add("a", 1 * HOUR)
+    links.add("a", 5 * HOUR)  # posted again
+    assert links.expire(3 * HOUR) == []
+    assert links.expire(6 * HOUR) == ["a"]
+    assert len(links) == 0
+
+
+def test_discarded_links_are_not_expired():
+    links = ExpiringLinkSet()
+    links.add("a", 1 * HOUR)
+    links.add("b", 1 * HOUR)
+    links.discard("a")
+    links.discard("missing")
+    assert "a" not in links
+    assert links.expire(2 * HOUR) == ["b"]
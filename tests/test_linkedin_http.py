@@ -0,0 +1,83 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import os, threading
+import pytest
+import linkedin_http
+from http_session import create_session
+from linkedin_http import LinkedInHTTPUnavailable
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "linkedin_guest_1.html")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers the search endpoint the way `reply` says: (status, body, redirect location)."""
+    reply = (200, b"", None)
+
+    def do_GET(self):
+        if urlparse(self.path).path.startswith("/authwall"):
+            return self.send_body(200, b"<html><body>Sign in to see more jobs</body></html>")
+        status, body, location = self.reply
+        if location:
+            self.send_response(status)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_body(status, body)
+
+    def send_body(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    monkeypatch.setattr(linkedin_http, "LINKEDIN_HTTP_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(linkedin_http, "_session", create_session())
+    monkeypatch.setattr(linkedin_http, "wait_for_slot", lambda url: None)
+    yield lambda status, body=b"", location=None: setattr(StubHandler, "reply", (status, body, location))
+    server.shutdown()
+    server.server_close()
+
+
+SEARCH = "https://www.linkedin.com/jobs/search/?keywords=.net&location=Egypt"
+
+
+def test_results_page_is_parsed_into_cards(stub):
+    with open(FIXTURE, "rb") as f:
+        stub(200, f.read())
+    cards = linkedin_http.fetch_search_page(SEARCH, 0)
+    assert len(cards) == 25
+    assert all(card["title"] and card["company"] and card["link"] for card in cards)
+
+
+def test_empty_body_means_the_results_ran_out(stub):
+    stub(200, b"")
+    assert linkedin_http.fetch_search_page(SEARCH, 25) == []
+
+
+def test_redirect_to_the_authwall_falls_back_to_the_browser(stub):
+    stub(302, location="/authwall?trk=guest_jobs")
+    with pytest.raises(LinkedInHTTPUnavailable, match="authwall"):
+        linkedin_http.fetch_search_page(SEARCH, 0)
+
+
+@pytest.mark.parametrize("status", [403, 429, 999])
+def test_blocked_status_falls_back_to_the_browser(stub, status):
+    stub(status, b"blocked")
+    with pytest.raises(LinkedInHTTPUnavailable, match=str(status)):
+        linkedin_http.fetch_search_page(SEARCH, 0)
+
+
+def test_page_without_cards_falls_back_to_the_browser(stub):
+    stub(200, b"<html><body><div class='new-markup'>Backend Engineer</div></body></html>")
+    with pytest.raises(LinkedInHTTPUnavailable, match="no recognisable job cards"):
+        linkedin_http.fetch_search_page(SEARCH, 0)
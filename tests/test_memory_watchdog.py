@@ -0,0 +1,30 @@
+import os, tempfile
+from memory_watchdog import _is_our_chrome
+from chromedriver_cache import BROWSER_MARKER
+
+
+def chrome(*args):
+    return ["/opt/google/chrome/chrome", "--enable-automation", "--headless=new", *args]
+
+
+def test_browser_with_the_marker_is_ours():
+    assert _is_our_chrome(chrome(BROWSER_MARKER, "--user-data-dir=/tmp/.org.chromium.Chromium.x1"))
+
+
+def test_browser_on_the_bot_profile_or_its_clone_is_ours(monkeypatch, tmp_path):
+    monkeypatch.setenv("SELENIUM_USER_DATA_DIR", str(tmp_path / "profile"))
+    assert _is_our_chrome(chrome(f"--user-data-dir={tmp_path / 'profile'}"))
+    clone = os.path.join(tempfile.gettempdir(), "jobs-notifier-profile-abc123")
+    assert _is_our_chrome(chrome(f"--user-data-dir={clone}"))
+
+
+def test_other_automated_browsers_are_left_alone(monkeypatch, tmp_path):
+    monkeypatch.setenv("SELENIUM_USER_DATA_DIR", str(tmp_path / "profile"))
+    assert not _is_our_chrome(chrome("--user-data-dir=/tmp/.org.chromium.Chromium.x1"))
+    assert not _is_our_chrome(chrome(f"--user-data-dir={tmp_path / 'other-project'}"))
+    assert not _is_our_chrome(chrome())
+
+
+def test_normal_windows_and_renderers_are_left_alone():
+    assert not _is_our_chrome(["/opt/google/chrome/chrome", BROWSER_MARKER])
+    assert not _is_our_chrome(chrome(BROWSER_MARKER, "--type=renderer"))
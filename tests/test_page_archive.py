@@ -0,0 +1,51 @@
+import os, sys
+import page_archive
+from page_archive import PageArchive, replay
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def archive_with_pages(directory):
+    archive = PageArchive(str(directory))
+    cycle = archive.start_cycle()
+    wuzzuf = fixture("wuzzuf_search_1.html")
+    guest = fixture("linkedin_guest_1.html")
+    archive.record("wuzzuf", wuzzuf, source="https://wuzzuf.net/search/jobs/?q=.net", url="https://wuzzuf.net/search/jobs/?q=.net&start=0",
+                   page=1, cards=len(page_archive.PARSERS["wuzzuf"](wuzzuf)))
+    # Recorded before a parser change: the count no longer matches what the parser finds
+    archive.record("linkedin_guest", guest, source="https://www.linkedin.com/jobs/search/?keywords=.net", url="https://www.linkedin.com/jobs-guest/?start=0",
+                   page=1, cards=3)
+    archive.record("linkedin", "<ul></ul>", source="https://www.linkedin.com/jobs/search/?keywords=.net", url="https://www.linkedin.com/jobs/search/?keywords=.net",
+                   page=1, cards=0)
+    return cycle
+
+
+def test_replay_parses_the_recorded_pages_again(tmp_path):
+    cycle = archive_with_pages(tmp_path)
+    entries, results = replay(str(tmp_path), workers=1)
+    assert [entry["parser"] for _, entry in entries] == ["wuzzuf", "linkedin_guest", "linkedin"]
+    wuzzuf, guest, empty = (results[(cycle, n)] for n in (1, 2, 3))
+    assert wuzzuf[0] == entries[0][1]["cards"] and wuzzuf[2] is None
+    assert guest[0] == 25
+    assert empty == (0, 0, None)
+
+
+def test_replay_filters_by_site(tmp_path):
+    archive_with_pages(tmp_path)
+    entries, _ = replay(str(tmp_path), site="linkedin", workers=1)
+    assert {entry["parser"] for _, entry in entries} == {"linkedin_guest", "linkedin"}
+
+
+def test_changed_lists_pages_whose_card_count_moved(tmp_path, monkeypatch, capsys):
+    cycle = archive_with_pages(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["page_archive.py", "--dir", str(tmp_path), "replay", "--changed"])
+    page_archive.main()
+    out = capsys.readouterr().out
+    assert "Replayed 3 pages" in out
+    assert "1 pages parse to a different card count than when recorded, 1 pages have no cards, 0 failed" in out
+    assert f"{cycle} #2 linkedin_guest page 1: 3 -> 25 cards" in out
@@ -0,0 +1,62 @@
+import asyncio
+import discord
+from state_store import StateStore
+from posting_queue import PostingQueue, job_embed
+
+
+class Response:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "error"
+
+
+class Channel:
+    """Fails every send whose embeds include a title in `bad` with `status`, or every send when `bad` is None."""
+    name = "jobs"
+
+    def __init__(self, status, bad=None):
+        self.status = status
+        self.bad = bad
+        self.sent = []
+
+    async def send(self, embeds):
+        titles = [embed.title for embed in embeds]
+        if self.bad is None or any(title in self.bad for title in titles):
+            raise discord.HTTPException(Response(self.status), "rejected")
+        self.sent += titles
+
+
+def role(n):
+    return ("Acme", f"Engineer {n}", f"https://www.linkedin.com/jobs/view/{n}/", "", "")
+
+
+def queue_with(store, *ns):
+    queue = PostingQueue(store)
+    for n in ns:
+        queue.enqueue(role(n), job_embed(role(n)))
+    return queue
+
+
+def test_forbidden_channel_keeps_every_job_queued(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    queue = queue_with(store, 1, 2, 3)
+    posted = asyncio.run(queue.flush(Channel(403)))
+    assert posted == [] and len(queue) == 3
+    assert not store.is_posted(role(1)[2])
+
+
+def test_invalid_embed_drops_only_that_job(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    queue = queue_with(store, 1, 2, 3)
+    channel = Channel(400, bad={job_embed(role(2)).title})
+    posted = asyncio.run(queue.flush(channel))
+    assert [r[2] for r in posted] == [role(1)[2], role(3)[2]]
+    assert len(queue) == 0 and store.get_pending_posts() == []
+
+
+def test_queue_survives_a_restart(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    queue = queue_with(store, 1, 2)
+    asyncio.run(queue.flush(Channel(503)))
+    restarted = PostingQueue(store)
+    assert [r[2] for r in restarted.roles()] == [role(1)[2], role(2)[2]]
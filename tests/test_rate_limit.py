@@ -0,0 +1,38 @@
+import rate_limit
+from rate_limit import TokenBucket, DomainRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_burst_is_free_then_requests_wait_for_a_refill(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    bucket = TokenBucket(rate=0.5, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == 2.0  # one token every 2s
+    clock.now += 10  # idle time refills only up to the burst
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == 2.0
+
+
+def test_domains_are_paced_independently():
+    limiter = DomainRateLimiter(requests_per_minute=60, burst=2)
+    linkedin = limiter.bucket_for("https://www.linkedin.com/jobs/search/?keywords=a")
+    assert limiter.bucket_for("https://WWW.linkedin.com/jobs/view/1/") is linkedin
+    assert limiter.bucket_for("https://wuzzuf.net/search/jobs/?q=b") is not linkedin
+
+
+def test_zero_rate_is_unlimited():
+    limiter = DomainRateLimiter(requests_per_minute=0, burst=1)
+    assert [limiter.wait("https://www.linkedin.com/") for _ in range(5)] == [0.0] * 5
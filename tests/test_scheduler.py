@@ -0,0 +1,88 @@
+import pytest
+import scheduler
+from scheduler import PollScheduler, SourceSchedule, count_new_ids
+from state_store import StateStore
+
+A = "https://www.linkedin.com/jobs/search/?keywords=a"
+B = "https://wuzzuf.net/search/jobs/?q=b"
+MIN, MAX, DEFAULT = (scheduler.POLL_MIN_INTERVAL_MINUTES * 60, scheduler.POLL_MAX_INTERVAL_MINUTES * 60,
+                     scheduler.POLL_DEFAULT_INTERVAL_MINUTES * 60)
+T = 1_800_000_000  # an arbitrary "now"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StateStore(str(tmp_path / "state.db"))
+
+
+def test_count_new_ids():
+    assert count_new_ids(["3", "2", "1"], []) is None  # first crawl
+    assert count_new_ids(["4", "3", "2"], ["3", "2", "1"]) == 1
+
+
+def test_new_sources_are_due_right_away(store):
+    schedule = PollScheduler(store, [A, B])
+    assert schedule.due(now=1000) == [A, B]
+    assert schedule.seconds_until_next(now=1000) == 0
+
+
+def test_quiet_poll_stretches_the_interval_busy_poll_shortens_it():
+    source = SourceSchedule(A)
+    source.record_poll(None, now=0)  # first crawl: nothing to compare yet
+    assert source.interval == DEFAULT
+    source.record_poll(0, now=DEFAULT)
+    assert source.interval == DEFAULT * scheduler.QUIET_BACKOFF
+    source.record_poll(100, now=DEFAULT * 3)
+    assert source.interval == MIN  # far more than POLL_TARGET_NEW_JOBS per poll
+
+
+def test_interval_never_passes_the_maximum():
+    source = SourceSchedule(A, interval=MAX)
+    source.record_poll(0, now=0)
+    assert source.interval == MAX
+
+
+def test_failed_poll_is_retried_soon_and_keeps_its_rate(store):
+    schedule = PollScheduler(store, [A, B])
+    schedule.record_polls({A: None, B: None}, now=T)
+    schedule.record_polls({A: 2}, failed=[B], now=T + DEFAULT)
+    b = schedule.sources[B]
+    assert b.interval == DEFAULT and b.new_jobs_per_hour is None and b.last_polled == T
+    assert b.next_poll == T + DEFAULT + MIN
+    # The retry time is kept across restarts
+    assert PollScheduler(store, [A, B]).sources[B].next_poll == T + DEFAULT + MIN
+
+
+def test_schedules_survive_a_restart_and_removed_searches_are_pruned(store):
+    schedule = PollScheduler(store, [A, B])
+    schedule.record_polls({A: None, B: None}, now=T)
+    assert set(store.get_source_schedules()) == {A, B}
+    restarted = PollScheduler(store, [A])
+    assert restarted.sources[A].next_poll == T + DEFAULT
+    assert set(store.get_source_schedules()) == {A}
+
+
+def test_rate_sets_the_interval_for_the_target_number_of_new_jobs():
+    source = SourceSchedule(A, interval=MAX)
+    source.record_poll(None, now=T)
+    source.record_poll(1, now=T + 3600)  # one new job per hour
+    assert source.new_jobs_per_hour == pytest.approx(1)
+    assert source.interval == pytest.approx(min(max(scheduler.POLL_TARGET_NEW_JOBS * 3600, MIN), MAX))
+
+
+def test_only_due_sources_are_polled_and_nearly_due_ones_join_them(store):
+    schedule = PollScheduler(store, [A, B])
+    schedule.sources[A].next_poll = T
+    schedule.sources[B].next_poll = T + scheduler.DUE_SLACK_SECONDS + 1
+    assert schedule.due(now=T) == [A]
+    assert schedule.seconds_until_next(now=T - 30) == 30
+    assert schedule.due(now=T + 1) == [A, B]
+
+
+def test_describe_lists_the_soonest_source_first(store):
+    schedule = PollScheduler(store, [A, B])
+    schedule.sources[A].next_poll = T + 600
+    schedule.sources[B].next_poll = T
+    lines = schedule.describe({A: "LinkedIn a", B: "Wuzzuf b"}).splitlines()
+    assert [line.split(" ")[1] for line in lines] == ["Wuzzuf", "LinkedIn"]
+    assert "rate unknown" in lines[0]
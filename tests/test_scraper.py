@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import os, threading
+import pytest
+import linkedin_http
+import scraper
+from http_session import create_session
+from linkedin_http import LinkedInHTTPUnavailable
+from state_store import StateStore
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures")
+SEARCH = "https://www.linkedin.com/jobs/search/?keywords=.net&location=Egypt"
+
+
+class FakePool:
+    """Hands out a placeholder driver and remembers whether it was shut down."""
+
+    def __init__(self, *args, **kwargs):
+        self.shut_down = False
+        FakePool.created.append(self)
+
+    @contextmanager
+    def driver(self, kind):
+        yield object()
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+@pytest.fixture
+def no_cookies(monkeypatch):
+    FakePool.created = []
+    monkeypatch.setattr(linkedin_http, "load_cookies", lambda: None)
+    monkeypatch.setattr(linkedin_http, "_export_failure", None)
+    monkeypatch.setattr(scraper, "DriverPool", FakePool)
+
+
+def test_failed_export_shuts_its_browser_down_and_is_remembered(no_cookies, monkeypatch):
+    def export(driver):
+        raise LinkedInHTTPUnavailable("Browser profile has no LinkedIn session cookie (li_at)")
+    monkeypatch.setattr(linkedin_http, "export_session_cookies", export)
+
+    with pytest.raises(LinkedInHTTPUnavailable, match="li_at"):
+        scraper.ensure_session_cookies()
+    assert len(FakePool.created) == 1 and FakePool.created[0].shut_down
+
+    # The next search goes straight to the browser instead of starting one to export again
+    with pytest.raises(LinkedInHTTPUnavailable, match="trying again in"):
+        scraper.ensure_session_cookies()
+    assert len(FakePool.created) == 1
+
+
+def test_export_is_retried_after_the_cooldown(no_cookies, monkeypatch):
+    monkeypatch.setattr(linkedin_http, "export_session_cookies", lambda driver: None)
+    monkeypatch.setattr(linkedin_http, "_export_failure", (-linkedin_http.COOKIE_EXPORT_RETRY_SECONDS * 2, "old"))
+    scraper.ensure_session_cookies()
+    assert len(FakePool.created) == 1 and FakePool.created[0].shut_down
+
+
+class GuestHandler(BaseHTTPRequestHandler):
+    """Serves one page of guest results, then blocks like an authwall would."""
+
+    def do_GET(self):
+        start = int(parse_qs(urlparse(self.path).query).get("start", ["0"])[0])
+        if start:
+            self.send_response(403)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        with open(os.path.join(FIXTURES, "linkedin_guest_1.html"), "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_browser_fallback_carries_on_where_the_driverless_crawl_stopped(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GuestHandler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    store = StateStore(str(tmp_path / "state.db"))
+    monkeypatch.setattr(scraper, "get_store", lambda: store)
+    monkeypatch.setattr(scraper, "LINKEDIN_FETCH_MODE", "http")
+    monkeypatch.setattr(linkedin_http, "LINKEDIN_HTTP_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(linkedin_http, "load_cookies", lambda: [{"name": "li_at", "value": "x"}])
+    monkeypatch.setattr(linkedin_http, "_session", create_session())
+    monkeypatch.setattr(linkedin_http, "wait_for_slot", lambda url: None)
+
+    handed_over = []
+    def browser(url, progress=None, **kwargs):
+        handed_over.append(progress)
+        return progress.roles, progress.early_stop
+    monkeypatch.setattr(scraper, "scrape_url_browser", browser)
+
+    emitted = []
+    try:
+        roles, _ = scraper.scrape_url(SEARCH, on_roles=emitted.extend)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    progress = handed_over[0]
+    assert progress.cards_seen == 25
+    assert progress.cards_seen // scraper.JOBS_PER_PAGE + 1 == 2  # the browser starts on page 2
+    assert len(emitted) == len(roles) == len({role[2] for role in emitted}) > 0
+    # Cards already handled are skipped if the browser's page overlaps them
+    cards = [{"link": role[2]} for role in emitted]
+    assert progress.unseen(cards) == []
+
+
+class TenCardHandler(BaseHTTPRequestHandler):
+    """Serves ten distinct guest cards per request for as long as it is asked, like a large search."""
+    requests = []
+
+    def do_GET(self):
+        start = int(parse_qs(urlparse(self.path).query).get("start", ["0"])[0])
+        TenCardHandler.requests.append(start)
+        with open(os.path.join(FIXTURES, "linkedin_guest_1.html"), encoding="utf-8") as f:
+            card = "<li>" + f.read().split("<li>")[1]
+        body = "".join(card.replace("4100000000", str(5000000000 + start + i)) for i in range(10)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_driverless_crawl_goes_as_deep_as_the_browser(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TenCardHandler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    TenCardHandler.requests = []
+    store = StateStore(str(tmp_path / "state.db"))
+    monkeypatch.setattr(scraper, "get_store", lambda: store)
+    monkeypatch.setattr(linkedin_http, "LINKEDIN_HTTP_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(linkedin_http, "load_cookies", lambda: [{"name": "li_at", "value": "x"}])
+    monkeypatch.setattr(linkedin_http, "_session", create_session())
+    monkeypatch.setattr(linkedin_http, "wait_for_slot", lambda url: None)
+    try:
+        roles, early_stop = scraper.scrape_url_http(SEARCH)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(roles) == scraper.MAX_PAGES * scraper.JOBS_PER_PAGE
+    assert TenCardHandler.requests == list(range(0, scraper.MAX_PAGES * scraper.JOBS_PER_PAGE, 10))
@@ -0,0 +1,100 @@
+import datetime, json
+import pytest
+import state_store
+from state_store import StateStore
+
+LINK = "https://www.linkedin.com/jobs/view/111/"
+WUZZUF_LINK = "https://wuzzuf.net/jobs/p/abc-senior-net-developer-cairo"
+SEARCH = "https://www.linkedin.com/jobs/search/?keywords=.net"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StateStore(str(tmp_path / "state.db"))
+
+
+def write_config(tmp_path, config):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_migrates_the_old_list_format(store, tmp_path):
+    store.migrate_from_config(write_config(tmp_path, {"posted": [LINK, WUZZUF_LINK]}))
+    assert store.is_posted(LINK) and store.is_posted(WUZZUF_LINK)
+    assert store.posted_count() == 2
+
+
+def test_migrates_the_dict_format_with_timestamps(store, tmp_path):
+    store.migrate_from_config(write_config(tmp_path, {"posted": {
+        LINK: "2026-10-01T09:00:00",
+        WUZZUF_LINK: "not a timestamp",  # unreadable entries are skipped
+    }}))
+    assert store.is_posted(LINK) and not store.is_posted(WUZZUF_LINK)
+    posted_at = store._read("SELECT posted_at FROM posted WHERE link = ?", (LINK,))[0][0]
+    assert posted_at == pytest.approx(datetime.datetime(2026, 10, 1, 9).timestamp())
+
+
+def test_migrates_blacklist_and_stop_markers(store, tmp_path):
+    store.migrate_from_config(write_config(tmp_path, {
+        "blacklist": ["Spam Corp", "Recruiters Inc"],
+        "last_job_per_source": {
+            SEARCH: {"job_link": LINK, "timestamp": "2026-10-01T09:00:00"},
+            "https://www.linkedin.com/jobs/search/?keywords=go": {"job_link": None, "timestamp": "2026-10-01T09:00:00"},
+        },
+    }))
+    assert store.get_blacklist() == {"Spam Corp", "Recruiters Inc"}
+    assert store.get_stop_marker(SEARCH) == LINK
+    assert store.get_stop_marker("https://www.linkedin.com/jobs/search/?keywords=go") is None
+
+
+def test_migration_runs_once(store, tmp_path):
+    store.migrate_from_config(write_config(tmp_path, {"posted": [LINK]}))
+    store.migrate_from_config(write_config(tmp_path, {"posted": [WUZZUF_LINK], "blacklist": ["Spam Corp"]}))
+    assert not store.is_posted(WUZZUF_LINK) and store.get_blacklist() == set()
+
+
+def test_missing_config_is_fine(store, tmp_path):
+    store.migrate_from_config(str(tmp_path / "missing.json"))
+    assert store.posted_count() == 0
+
+
+def test_imported_link_gets_its_fingerprint_when_posted_again(store, tmp_path):
+    store.migrate_from_config(write_config(tmp_path, {"posted": [LINK]}))
+    role = ("Acme", "Senior .NET Developer", LINK, "", "")
+    assert store.find_duplicate(WUZZUF_LINK, "Acme", "Senior .NET Developer") is None
+    store.mark_posted([LINK], roles=[role])
+    assert store.find_duplicate(WUZZUF_LINK, "Acme", "Senior .NET Developer")[0] == LINK
+    # ...also after a restart, and marking it again without its role keeps the fingerprint
+    store.mark_posted([LINK])
+    restarted = StateStore(store.path)
+    assert restarted._read("SELECT job_key, fingerprint FROM posted WHERE link = ?", (LINK,))[0][1]
+    assert restarted.find_duplicate(WUZZUF_LINK, "Acme", "Senior .NET Developer")[0] == LINK
+
+
+def test_dedup_index_is_built_on_first_lookup(store):
+    store.mark_posted([LINK], roles=[("Acme", "Senior .NET Developer", LINK, "", "")])
+    restarted = StateStore(store.path)
+    assert restarted.duplicates is None
+    assert restarted.find_duplicate(WUZZUF_LINK, "Acme", "Senior .NET Developer")[0] == LINK
+    assert restarted.duplicates is not None
+
+
+def test_jobs_posted_and_pruned_while_the_index_builds_are_kept_in_step(store, monkeypatch):
+    store.mark_posted([LINK], when=1000, roles=[("Acme", "Senior .NET Developer", LINK, "", "")])
+    restarted = StateStore(store.path)
+    other = "https://www.linkedin.com/jobs/view/222/"
+    real_index = state_store.DuplicateIndex
+
+    class RacingIndex(real_index):
+        def add(self, link, *args, **kwargs):
+            if link == LINK:
+                # The scrapers keep going while the titles are hashed outside the store lock
+                restarted.mark_posted([other], roles=[("Globex", "Go Engineer", other, "", "")])
+                restarted.delete_posted_older_than(2000)
+            super().add(link, *args, **kwargs)
+
+    monkeypatch.setattr(state_store, "DuplicateIndex", RacingIndex)
+    restarted.build_duplicate_index()
+    assert restarted.find_duplicate(WUZZUF_LINK, "Acme", "Senior .NET Developer") is None
+    assert restarted.find_duplicate("https://wuzzuf.net/jobs/p/xyz-go-engineer", "Globex", "Go Engineer")[0] == other
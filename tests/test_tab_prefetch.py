@@ -0,0 +1,90 @@
+import pytest
+import tab_prefetch
+from tab_prefetch import TabPrefetcher
+
+
+class SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        if handle not in self.driver.tabs:
+            raise RuntimeError(f"no such window {handle}")
+        self.driver.current_window_handle = handle
+
+
+class StubDriver:
+    """Just enough of a WebDriver for tabs: window.open adds a tab, close() removes the current one."""
+
+    def __init__(self):
+        self.tabs = {"main": "https://www.linkedin.com/jobs/search/?start=0"}
+        self.current_window_handle = "main"
+        self.switch_to = SwitchTo(self)
+        self.opened = 0
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    def execute_script(self, script, url):
+        self.opened += 1
+        self.tabs[f"tab{self.opened}"] = url
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def close(self):
+        del self.tabs[self.current_window_handle]
+
+
+def page(n):
+    return f"https://www.linkedin.com/jobs/search/?start={(n - 1) * 25}"
+
+
+@pytest.fixture(autouse=True)
+def no_pacing(monkeypatch):
+    monkeypatch.setattr(tab_prefetch, "wait_for_slot", lambda url: None)
+
+
+def test_prefetch_opens_at_most_the_lookahead():
+    driver = StubDriver()
+    prefetch = TabPrefetcher(driver, 2)
+    prefetch.prefetch([page(2), page(3), page(4)])
+    assert sorted(driver.tabs.values()) == sorted([page(1), page(2), page(3)])
+    prefetch.prefetch([page(2), page(3), page(4)])  # already loading, nothing new
+    assert driver.opened == 2
+    assert driver.current_window_handle == "main"
+
+
+def test_take_moves_onto_the_prefetched_tab():
+    driver = StubDriver()
+    prefetch = TabPrefetcher(driver, 2)
+    prefetch.prefetch([page(2), page(3)])
+    assert prefetch.take(page(2)) is not None
+    assert driver.tabs[driver.current_window_handle] == page(2)
+    assert "main" not in driver.tabs  # the page it replaced is closed
+    assert prefetch.take(page(5)) is None  # never prefetched: the driver stays put
+    assert driver.tabs[driver.current_window_handle] == page(2)
+    # The freed slot is used for the next page
+    prefetch.prefetch([page(3), page(4)])
+    assert sorted(driver.tabs.values()) == sorted([page(2), page(3), page(4)])
+
+
+def test_cancel_closes_the_outstanding_tabs_and_stays_on_the_current_page():
+    driver = StubDriver()
+    prefetch = TabPrefetcher(driver, 3)
+    prefetch.prefetch([page(2), page(3), page(4)])
+    prefetch.take(page(2))
+    assert prefetch.cancel() == 2
+    assert list(driver.tabs.values()) == [page(2)]
+    assert driver.tabs[driver.current_window_handle] == page(2)
+    assert prefetch.cancel() == 0
+
+
+def test_cancel_survives_tabs_that_are_already_gone():
+    driver = StubDriver()
+    prefetch = TabPrefetcher(driver, 2)
+    prefetch.prefetch([page(2), page(3)])
+    del driver.tabs["tab1"]  # crashed on its own
+    assert prefetch.cancel() == 1
+    assert list(driver.tabs) == ["main"]
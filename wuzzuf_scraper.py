@@ -1,12 +1,20 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from dotenv import load_dotenv
-import os, time, json
+from driver_pool import DriverPool, SCRAPE_CONCURRENCY
+from concurrent.futures import ThreadPoolExecutor
+from rate_limit import wait_for_slot
+from page_readiness import ReadinessReport, wait_for_presence, wait_for_stable_count
+from http_session import get_session, REQUEST_TIMEOUT
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from keyword_matcher import check_keywords_in_text
+from state_store import get_store
+from early_stop import EarlyStop
+from metrics import METRICS, observe_readiness, mark_startup
+from lean_browser import BROWSER_LEAN_MODE, PageWeight, apply_lean_options, prepare_driver
+from chromedriver_cache import start_chrome
+import job_details
+import page_archive
+import html_parsers
+import os
 import logging
 
 # Suppress logs
@@ -17,17 +25,9 @@ logging.getLogger('WDM').setLevel(logging.WARNING)
 load_dotenv()
 WUZZUF_URLS_UNFILTERED = os.getenv('WUZZUF_URLS_UNFILTERED', '')
 WUZZUF_URLS_FILTERED = os.getenv('WUZZUF_URLS_FILTERED', '')
-
-def load_keywords_from_env(env_var_name):
-    """Loads keywords from a multi-line .env variable."""
-    keywords_str = os.getenv(env_var_name, '')
-    if not keywords_str:
-        return []
-    # Split by newline, strip whitespace, and filter out empty lines
-    return [line.strip() for line in keywords_str.strip().splitlines() if line.strip()]
-
-JOB_KEYWORDS = load_keywords_from_env('JOB_KEYWORDS')
-EXCLUDED_KEYWORDS = load_keywords_from_env('EXCLUDED_KEYWORDS')
+# "http" fetches result pages directly and only falls back to Chrome when they can't be parsed
+WUZZUF_FETCH_MODE = os.getenv('WUZZUF_FETCH_MODE', 'http').lower()
+WUZZUF_MAX_PAGES = max(1, int(os.getenv('WUZZUF_MAX_PAGES', 3)))
 
 
 def parse_multiline_urls(url_string):
@@ -53,6 +53,7 @@ def parse_multiline_urls(url_string):
 
 def init_wuzzuf_driver():
     """Initialize Chrome driver for Wuzzuf"""
+    from selenium.webdriver.chrome.options import Options
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
@@ -61,138 +62,267 @@ def init_wuzzuf_driver():
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--log-level=3")
     options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    if BROWSER_LEAN_MODE:
+        apply_lean_options(options)
     
-    service = ChromeService(executable_path=ChromeDriverManager().install())
-    service.log_path = os.devnull
-    
-    return webdriver.Chrome(options=options, service=service)
+    return prepare_driver(start_chrome(options))
 
-def check_keywords_in_text(text):
+def filter_roles(roles, check_keywords, show_details, fetch_details=None):
     """
-    Check if text contains any JOB_KEYWORDS and none of the EXCLUDED_KEYWORDS.
+    Apply the keyword filter to parsed roles, logging each decision in detailed mode.
+    With fetch_details (see job_details), titles without a keyword are decided on the job description.
     """
-    if not text:
-        return False
+    kept = []
+    deferred = []  # links waiting for their description, in card order
+    for role in roles:
+        company, title, link, picture, posted_time = role
+        if check_keywords:
+            found, _, excluded_found = check_keywords_in_text(title, return_details=True)
+            if not found and fetch_details and job_details.worth_describing(link, excluded_found):
+                deferred.append(link)
+                if show_details:
+                    print(f"    - DEFERRED (checking the job description): {title}")
+            elif not found:
+                if show_details:
+                    print(f"    - SKIPPING (keyword filter): {title}")
+                continue
+        
+        kept.append(role)
+        if show_details and link not in deferred:
+            print(f"    - ADDED: {title} at {company}")
 
-    text_lower = text.lower()
-    
-    has_required_keyword = any(keyword.lower() in text_lower for keyword in JOB_KEYWORDS)
-    if not has_required_keyword:
-        return False
+    if deferred:
+        matched = job_details.match_descriptions(deferred, fetch_details, show_details)
+        kept = [role for role in kept if role[2] not in deferred or role[2] in matched]
+    return kept
 
-    has_excluded_keyword = any(keyword.lower() in text_lower for keyword in EXCLUDED_KEYWORDS)
-    if has_excluded_keyword:
-        return False
-            
-    return True
+def get_early_stop(url):
+    """Early stopping for a Wuzzuf URL, anchored on the job IDs its previous crawls saw."""
+    store = get_store()
+    return EarlyStop(store.get_recent_job_ids(url), is_posted=store.is_posted)
+
+def take_new_roles(roles, early_stop, page_number, seen_links, show_details):
+    """
+    Drop roles already seen on earlier pages and cut the page at the point where the
+    crawl caught up with known jobs. Returns (roles, hit_stop_marker).
+    """
+    kept = []
+    for card_number, role in enumerate(roles, 1):
+        link = role[2]
+        if link in seen_links:
+            continue
+        seen_links.add(link)
+        if early_stop.check(link, page=page_number, card=card_number):
+            if show_details:
+                print(f"    - ⚠️  CAUGHT UP! {early_stop.stop_reason}. Stopping scrape at this job.")
+            return kept, True
+        kept.append(role)
+    return kept, False
+
+def wuzzuf_page_url(url, page_index):
+    """Wuzzuf paginates search results with a zero-based `start` page index."""
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    query_params['start'] = [page_index]
+    return urlunparse(parsed_url._replace(query=urlencode(query_params, doseq=True)))
 
-def scrape_wuzzuf(url, check_keywords=False, show_details=False):
-    """Scrape a single Wuzzuf URL."""
-    driver = init_wuzzuf_driver()
-    driver.set_page_load_timeout(60)
+def fetch_wuzzuf_page(url):
+    wait_for_slot(url)
+    response = get_session().get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    mark_startup("first_page")
+    return response.text
+
+def scrape_wuzzuf_http(url, early_stop, check_keywords=False, show_details=False, on_roles=None):
+    """
+    Scrape a Wuzzuf URL and its following result pages over plain HTTP, until the crawl
+    catches up with known jobs. Returns None when the first page can't be fetched or
+    parsed, so the caller can fall back to Chrome.
+    """
     all_roles = []
+    seen_links = set()
+    fetch_details = job_details.http_fetcher("wuzzuf", check_keywords, get_session())
+    for page_index in range(WUZZUF_MAX_PAGES):
+        page_url = wuzzuf_page_url(url, page_index)
+        try:
+            with METRICS.timed("page_load_seconds", site="wuzzuf", source=url, page=page_index + 1):
+                html = fetch_wuzzuf_page(page_url)
+            with METRICS.timed("card_parse_seconds", site="wuzzuf", source=url, page=page_index + 1):
+                roles = html_parsers.parse_wuzzuf_html(html, base_url=page_url)
+            page_archive.record("wuzzuf", html, source=url, url=page_url, page=page_index + 1, cards=len(roles))
+        except Exception as e:
+            if page_index == 0:
+                print(f"  ✗ Wuzzuf HTTP fetch failed: {e}")
+                return None
+            if show_details:
+                print(f"  - Page {page_index + 1} could not be fetched: {e}")
+            break
 
-    try:
-        driver.get(url)
-        time.sleep(5)
-        
-        # Updated selector for Wuzzuf job cards to match the new site structure
-        job_cards = driver.find_elements(By.CSS_SELECTOR, "div.css-pkv5jc")
-        
+        if not roles:
+            if page_index == 0:
+                print("  ⚠️  No job cards could be parsed from the Wuzzuf HTML")
+                return None
+            break  # Ran past the last page of results
+        METRICS.inc("pages_scraped_total", site="wuzzuf", source=url)
+        METRICS.inc("cards_parsed_total", len(roles), site="wuzzuf", source=url)
+
+        roles, hit_stop_marker = take_new_roles(roles, early_stop, page_index + 1, seen_links, show_details)
         if show_details:
-            print(f"  - Found {len(job_cards)} potential job cards.")
+            print(f"  - Page {page_index + 1}: {len(roles)} new job cards")
+        roles = filter_roles(roles, check_keywords, show_details, fetch_details)
+        all_roles.extend(roles)
+        if on_roles:
+            on_roles(roles)
+        if hit_stop_marker:
+            break
 
-        for card in job_cards:
-            try:
-                # Updated selectors for title, company, etc. based on new HTML
-                title_element = card.find_element(By.CSS_SELECTOR, "h2.css-193uk2c a")
-                title = title_element.text.strip()
-                link = title_element.get_attribute('href').split('?')[0]
+    print(f"  ✓ Total: {len(all_roles)} jobs found on this URL")
+    print(f"  ℹ️  Early stop: {early_stop.report(WUZZUF_MAX_PAGES)}")
+    return all_roles
 
-                company_element = card.find_element(By.CSS_SELECTOR, "a.css-ipsyv7")
-                company = company_element.text.strip()
+def scrape_wuzzuf(url, check_keywords=False, show_details=False, pool=None, on_roles=None):
+    """
+    Scrape a single Wuzzuf URL, over HTTP when possible and with Chrome otherwise.
+    Returns (roles, early_stop); early_stop.recent_ids() is what to remember for the next cycle.
+    If given, on_roles(roles) is called with each page's roles as soon as the page is parsed.
+    """
+    early_stop = get_early_stop(url)
+    if early_stop.known_ids:
+        print(f"  ℹ️  Using {len(early_stop.known_ids)} known job IDs for early stopping")
 
-            
-                posted_time = "N/A" # Default value
-                try:
-                    # First, try the most common selector for the time
-                    posted_time_element = card.find_element(By.CSS_SELECTOR, "div.css-1jldrig")
-                    posted_time = posted_time_element.text.strip()
-                except:
-                    # If the first one fails, try the other selector as a fallback
-                    try:
-                        posted_time_element = card.find_element(By.CSS_SELECTOR, "div.css-eg55jf")
-                        posted_time = posted_time_element.text.strip()
-                    except:
-                        # If both fail, it will remain "N/A"
-                        pass
-                                
-                picture = None
-                try:
-                    img_element = card.find_element(By.CSS_SELECTOR, "a img.css-1in28d3")
-                    picture = img_element.get_attribute('src')
-                except:
-                    picture = "https://wuzzuf.net/images/wuzzuf-logo-square.png"
-                
-                if check_keywords:
-                    if not check_keywords_in_text(title):
-                        if show_details:
-                            print(f"    - SKIPPING (keyword filter): {title}")
-                        continue
-                
-                all_roles.append((company, title, link, picture, posted_time))
-                if show_details:
-                    print(f"    - ADDED: {title} at {company}")
+    if WUZZUF_FETCH_MODE == "http":
+        roles = scrape_wuzzuf_http(url, early_stop, check_keywords=check_keywords, show_details=show_details, on_roles=on_roles)
+        if roles is not None:
+            return roles, early_stop
+        print("  - Falling back to the browser for this URL...")
+    roles = scrape_wuzzuf_browser(url, early_stop, check_keywords=check_keywords, show_details=show_details, pool=pool, on_roles=on_roles)
+    return roles, early_stop
+
+def scrape_wuzzuf_browser(url, early_stop, check_keywords=False, show_details=False, pool=None, on_roles=None):
+    """Scrape the result pages of a Wuzzuf URL with Chrome, until the crawl catches up with known jobs."""
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool({"wuzzuf": init_wuzzuf_driver}, max_drivers=1)
+    driver = pool.acquire("wuzzuf")
+    all_roles = []
+    seen_links = set()
+
+    try:
+        for page_index in range(WUZZUF_MAX_PAGES):
+            page_url = wuzzuf_page_url(url, page_index) if page_index else url
+            # A browser that grew too big or too old is replaced here; the crawl goes on from this page
+            driver = pool.fresh_driver("wuzzuf", driver)
+            wait_for_slot(page_url)
+            with METRICS.timed("page_load_seconds", site="wuzzuf", source=url, page=page_index + 1):
+                driver = pool.load("wuzzuf", driver, page_url)
+
+            report = ReadinessReport()
+            wait_for_presence(driver, "div.css-pkv5jc", report=report)
+            wait_for_stable_count(driver, "div.css-pkv5jc", report=report)
+            observe_readiness(report, site="wuzzuf", source=url, page=page_index + 1)
+            weight = PageWeight.measure(driver)
+            loaded = ""
+            if weight:
+                METRICS.inc("page_bytes_total", weight.bytes, site="wuzzuf", source=url)
+                loaded = f", loaded {weight.summary()}"
+            print(f"  - Page {page_index + 1}: waited {report.summary()} for the page to be ready{loaded}")
+
+            # The browser only loads the page; the cards are parsed from its HTML
+            with METRICS.timed("card_parse_seconds", site="wuzzuf", source=url, page=page_index + 1):
+                html = driver.page_source
+                roles = html_parsers.parse_wuzzuf_html(html)
+            page_archive.record("wuzzuf", html, source=url, url=page_url, page=page_index + 1, cards=len(roles))
+            if not roles:
+                break  # Ran past the last page of results
+            METRICS.inc("pages_scraped_total", site="wuzzuf", source=url)
+            METRICS.inc("cards_parsed_total", len(roles), site="wuzzuf", source=url)
+
+            roles, hit_stop_marker = take_new_roles(roles, early_stop, page_index + 1, seen_links, show_details)
+            if show_details:
+                print(f"  - Found {len(roles)} new job cards.")
+            roles = filter_roles(roles, check_keywords, show_details, job_details.tab_fetcher(driver, "wuzzuf", check_keywords))
+            all_roles.extend(roles)
+            if on_roles:
+                on_roles(roles)
+            if hit_stop_marker:
+                break
 
-            except Exception as e:
-                if show_details:
-                    print(f"  - Could not parse a job card: {e}")
-                continue
-        
         if show_details:
              print(f"  - Successfully parsed {len(all_roles)} jobs.")
         else:
             print(f"  ✓ Total: {len(all_roles)} jobs found on this URL")
+        print(f"  ℹ️  Early stop: {early_stop.report(WUZZUF_MAX_PAGES)}")
 
     except Exception as e:
         print(f"  ✗ Wuzzuf Error: An error occurred during scraping: {str(e)}")
     finally:
-        driver.quit()
+        pool.release("wuzzuf", driver)
+        if own_pool:
+            pool.shutdown()
 
     return all_roles
 
-def get_wuzzuf_roles(show_details=False):
-    """Main function to get Wuzzuf roles from all configured URLs"""
+def configured_searches():
+    """(url, check_keywords, label) for every configured search URL, in configuration order."""
+    unfiltered_urls = parse_multiline_urls(WUZZUF_URLS_UNFILTERED)
+    filtered_urls = parse_multiline_urls(WUZZUF_URLS_FILTERED)
+    return (
+        [(url, False, f"📋 Unfiltered Search {i}/{len(unfiltered_urls)}: {note or 'General'}")
+         for i, (url, note) in enumerate(unfiltered_urls, 1)] +
+        [(url, True, f"🔍 Filtered Search {i}/{len(filtered_urls)}: {note or 'Marketing Keywords'}")
+         for i, (url, note) in enumerate(filtered_urls, 1)]
+    )
+
+def get_wuzzuf_roles(show_details=False, pool=None, on_roles=None, sources=None):
+    """
+    Main function to get Wuzzuf roles from all configured URLs. Returns (all_roles, recent_job_ids_dict);
+    searches that returned no cards at all are missing from the dict.
+    If given, on_roles(roles) is called from the scraping threads as each page is parsed,
+    and only the search URLs in `sources` are scraped.
+    """
     all_roles = []
+    recent_ids = {}  # Map URL -> newest-first job IDs to remember
+    pages_saved = 0
+
+    # Browsers are reused across search URLs unless the caller shares its own pool
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool({"wuzzuf": init_wuzzuf_driver}, max_drivers=SCRAPE_CONCURRENCY)
+
     log_mode = "(Detailed Log Mode)" if show_details else ""
     print("\n" + "="*60)
     print(f"Wuzzuf Job Search {log_mode}")
     print("="*60)
 
-    # Scrape unfiltered URLs
-    unfiltered_urls = parse_multiline_urls(WUZZUF_URLS_UNFILTERED)
-    if unfiltered_urls:
-        for i, (url, note) in enumerate(unfiltered_urls, 1):
-            print(f"\n📋 Unfiltered Search {i}/{len(unfiltered_urls)}: {note or 'General'}")
-            roles = scrape_wuzzuf(url, check_keywords=False, show_details=show_details)
-            all_roles.extend(roles)
-            if i < len(unfiltered_urls):
-                time.sleep(5)
+    searches = [search for search in configured_searches() if sources is None or search[0] in sources]
 
-    # Scrape filtered URLs
-    filtered_urls = parse_multiline_urls(WUZZUF_URLS_FILTERED)
-    if filtered_urls:
-        for i, (url, note) in enumerate(filtered_urls, 1):
-            print(f"\n🔍 Filtered Search {i}/{len(filtered_urls)}: {note or 'Marketing Keywords'}")
-            roles = scrape_wuzzuf(url, check_keywords=True, show_details=show_details)
-            all_roles.extend(roles)
-            if i < len(filtered_urls):
-                time.sleep(5)
+    def run_search(search):
+        url, check_keywords, label = search
+        print(f"\n{label}")
+        with METRICS.timed("search_seconds", site="wuzzuf", source=url):
+            return scrape_wuzzuf(url, check_keywords=check_keywords, show_details=show_details, pool=pool, on_roles=on_roles)
+
+    # Searches run in parallel; pacing comes from the per-domain rate limiter
+    with ThreadPoolExecutor(max_workers=SCRAPE_CONCURRENCY) as executor:
+        results = list(executor.map(run_search, searches))
+
+    # Merge in configuration order so the result doesn't depend on which search finished first
+    for (url, _, label), (roles, early_stop) in zip(searches, results):
+        all_roles.extend(roles)
+        if not early_stop.seen_ids:
+            # No cards at all (authwall, error): left out, so its recent IDs and schedule aren't taken for a quiet search
+            print(f"⚠️  {label}: no job cards this time, it will be retried soon")
+            continue
+        recent_ids[url] = early_stop.recent_ids()
+        pages_saved += early_stop.pages_saved(WUZZUF_MAX_PAGES)
+
+    if own_pool:
+        pool.shutdown()
 
     print("\n" + "="*60)
-    print(f"✓ Search Complete: {len(all_roles)} total jobs found")
+    print(f"✓ Search Complete: {len(all_roles)} total jobs found, early stopping saved up to {pages_saved} pages")
     print("="*60 + "\n")
-    return all_roles
+    return all_roles, recent_ids
 
 if __name__ == '__main__':
     show_details_arg = os.getenv('SHOW_DETAILED_LOGS', 'False').lower() == 'true'